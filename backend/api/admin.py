@@ -8,7 +8,10 @@ from .models import (
     CategoryModel,
     EventModel,
     Meta,
-    MentorModel
+    MentorModel,
+    Job,
+    OutboxMessage,
+    StatCounter,
 )
 
 
@@ -55,4 +58,7 @@ admin.site.register(ContactModel)
 admin.site.register(MentorAppointmentModel)
 admin.site.register(ResultModel)
 admin.site.register(EventModel)
-admin.site.register(Meta)
\ No newline at end of file
+admin.site.register(Meta)
+admin.site.register(StatCounter)
+admin.site.register(OutboxMessage)
+admin.site.register(Job)
@@ -0,0 +1,144 @@
+import math
+
+from django.db.models import Avg, Count, F, Max, Min, Q
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .models import ResultModel
+
+
+TRACKS = ResultModel.TRACKS
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+PERIODS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+
+
+def track_stats(queryset):
+    # Один агрегирующий запрос на все направления; дисперсия — через среднее квадратов
+    aggregates = {}
+    for track in TRACKS:
+        aggregates[f'{track}__count'] = Count(track)
+        aggregates[f'{track}__mean'] = Avg(track)
+        aggregates[f'{track}__min'] = Min(track)
+        aggregates[f'{track}__max'] = Max(track)
+        aggregates[f'{track}__square'] = Avg(F(track) * F(track))
+
+    row = queryset.aggregate(**aggregates)
+
+    stats = {}
+    for track in TRACKS:
+        mean = row[f'{track}__mean']
+        square = row[f'{track}__square']
+        stats[track] = {
+            'count': row[f'{track}__count'],
+            'mean': mean,
+            'stddev': math.sqrt(max(0.0, square - mean * mean)) if mean is not None else None,
+            'min': row[f'{track}__min'],
+            'max': row[f'{track}__max'],
+        }
+    return stats
+
+
+def bin_edges(low, high, bins):
+    width = (high - low) / bins or 1.0
+    edges = [low + width * index for index in range(bins + 1)]
+    if high > low:
+        edges[-1] = high
+    return edges
+
+
+def histograms(queryset, stats, bins):
+    # Гистограммы всех направлений тоже одним запросом: COUNT с FILTER на каждый интервал
+    edges = {
+        track: bin_edges(stats[track]['min'], stats[track]['max'], bins)
+        for track in TRACKS if stats[track]['count']
+    }
+
+    aggregates = {}
+    for track, track_edges in edges.items():
+        for index in range(bins):
+            lower, upper = track_edges[index], track_edges[index + 1]
+            upper_bound = Q(**{f'{track}__lte': upper}) if index == bins - 1 else Q(**{f'{track}__lt': upper})
+            aggregates[f'{track}__{index}'] = Count('id', filter=Q(**{f'{track}__gte': lower}) & upper_bound)
+
+    row = queryset.aggregate(**aggregates) if aggregates else {}
+
+    return {
+        track: [
+            {'from': edges[track][index], 'to': edges[track][index + 1], 'count': row[f'{track}__{index}']}
+            for index in range(bins)
+        ] if track in edges else []
+        for track in TRACKS
+    }
+
+
+def interpolate(values, rank):
+    # Линейная интерполяция между соседними значениями, как numpy.percentile по умолчанию
+    position = (len(values) - 1) * rank / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def percentiles(queryset, ranks=PERCENTILES):
+    # Порядковые статистики переносимо в SQL не считаются, поэтому колонки выбираются
+    # одним values_list без создания экземпляров моделей
+    rows = list(queryset.values_list(*TRACKS))
+    names = [f'p{rank}' for rank in ranks]
+
+    if numpy is not None and rows:
+        matrix = numpy.array(rows, dtype=float)
+        result = {}
+        for column, track in enumerate(TRACKS):
+            values = matrix[:, column]
+            values = values[~numpy.isnan(values)]
+            result[track] = dict(zip(names, numpy.percentile(values, ranks).tolist())) if values.size else {}
+        return result
+
+    columns = zip(*rows) if rows else [()] * len(TRACKS)
+    result = {}
+    for track, column in zip(TRACKS, columns):
+        values = sorted(value for value in column if value is not None)
+        result[track] = {name: interpolate(values, rank) for name, rank in zip(names, ranks)} if values else {}
+    return result
+
+
+def cohorts(queryset, period):
+    rows = (
+        queryset
+        .annotate(period=PERIODS[period]('date'))
+        .values('period')
+        .annotate(count=Count('id'), **{track: Avg(track) for track in TRACKS})
+        .order_by('period')
+    )
+    return [
+        {'period': row['period'], 'count': row['count'], 'mean': {track: row[track] for track in TRACKS}}
+        for row in rows
+    ]
+
+
+def result_analytics(queryset, bins, period):
+    stats = track_stats(queryset)
+    track_cohorts = cohorts(queryset, period)
+    track_histograms = histograms(queryset, stats, bins)
+    track_percentiles = percentiles(queryset)
+
+    for track in TRACKS:
+        stats[track]['percentiles'] = track_percentiles[track]
+        stats[track]['histogram'] = track_histograms[track]
+
+    return {
+        'count': sum(cohort['count'] for cohort in track_cohorts),
+        'tracks': stats,
+        'cohorts': track_cohorts,
+    }
@@ -0,0 +1,186 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import (
+    ArticleListSerializer,
+    CategoryListSerializer,
+    EventListSerializer,
+    MentorListSerializer,
+    MetaListSerializer,
+)
+
+from .models import (
+    ArticleModel,
+    CategoryModel,
+    EventModel,
+    Meta,
+    MentorModel,
+)
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+def requested_fields(request):
+    fields = request.GET.get('fields')
+    exclude = request.GET.get('exclude')
+
+    fields = [name for name in fields.split(',') if name] if fields else None
+    exclude = [name for name in exclude.split(',') if name] if exclude else None
+    return fields, exclude
+
+
+def page_link(request, **params):
+    query = request.GET.copy()
+    for name in ('after', 'before'):
+        query.pop(name, None)
+    query.update(params)
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+class AsyncReadView(View):
+    # Чтение через async ORM без пула потоков sync_to_async. Пагинация по id:
+    # ?after=<id> / ?before=<id>, размер страницы — ?page_size=
+    model = None
+    list_serializer_class = None
+
+    def get_queryset(self, request):
+        return self.model.objects.all()
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get('page_size', settings.REST_FRAMEWORK['PAGE_SIZE']))
+        except ValueError:
+            page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        return max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+
+    async def get(self, request, pk=None):
+        serializer_class = self.list_serializer_class
+        selected = serializer_class.select(*requested_fields(request))
+        queryset = self.get_queryset(request)
+
+        if pk is not None:
+            rows = [row async for row in serializer_class.prepare(queryset.filter(pk=pk), selected)]
+            if not rows:
+                return json_response({"detail": "Not found."}, status=404)
+
+            data = await serializer_class(rows, context={'request': request}, fields=selected).adata()
+            return json_response(data[0])
+
+        if request.GET.get('all') in ('1', 'true', 'True'):
+            rows = [row async for row in serializer_class.prepare(queryset.order_by('id'), selected)]
+            data = await serializer_class(rows, context={'request': request}, fields=selected).adata()
+            return json_response(data)
+
+        page_size = self.get_page_size(request)
+        try:
+            after = int(request.GET['after']) if request.GET.get('after') else None
+            before = int(request.GET['before']) if request.GET.get('before') else None
+        except ValueError:
+            return json_response({"detail": "Invalid cursor."}, status=400)
+
+        if before is not None:
+            queryset = queryset.filter(id__lt=before).order_by('-id')
+        else:
+            if after is not None:
+                queryset = queryset.filter(id__gt=after)
+            queryset = queryset.order_by('id')
+
+        rows = [row async for row in serializer_class.prepare(queryset, selected)[:page_size + 1]]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if before is not None:
+            rows.reverse()
+
+        data = await serializer_class(rows, context={'request': request}, fields=selected).adata()
+
+        next_link = previous_link = None
+        if rows:
+            if has_more or before is not None:
+                next_link = page_link(request, after=rows[-1]['id'])
+            if (has_more and before is not None) or after is not None:
+                previous_link = page_link(request, before=rows[0]['id'])
+
+        return json_response({"next": next_link, "previous": previous_link, "results": data})
+
+
+class AsyncArticleView(AsyncReadView):
+    model = ArticleModel
+    list_serializer_class = ArticleListSerializer
+
+    def get_queryset(self, request):
+        article_id = request.GET.get('article_id')
+        category_ids = request.GET.getlist('category_id')
+        title = request.GET.get('title')
+
+        queryset = ArticleModel.objects.all()
+
+        if article_id:
+            return queryset.filter(id=article_id)
+
+        if category_ids:
+            return queryset.filter(categories__id__in=category_ids).distinct()
+
+        if title:
+            return queryset.filter(title_en=title)
+
+        return queryset
+
+
+class AsyncEventView(AsyncReadView):
+    model = EventModel
+    list_serializer_class = EventListSerializer
+
+    def get_queryset(self, request):
+        event_id = request.GET.get('event_id')
+
+        if event_id:
+            return EventModel.objects.filter(id=event_id)
+
+        return EventModel.objects.all()
+
+
+class AsyncCategoryView(AsyncReadView):
+    model = CategoryModel
+    list_serializer_class = CategoryListSerializer
+
+    def get_queryset(self, request):
+        category_id = request.GET.get('category_id')
+
+        if category_id:
+            return CategoryModel.objects.filter(id=category_id)
+
+        return CategoryModel.objects.all()
+
+
+class AsyncMentorView(AsyncReadView):
+    model = MentorModel
+    list_serializer_class = MentorListSerializer
+
+    def get_queryset(self, request):
+        user_id = request.GET.get('user_id')
+        queryset = MentorModel.objects.all()
+
+        if user_id:
+            queryset = queryset.filter(id=user_id)
+
+        status = request.GET.get('status')
+
+        if status:
+            queryset = queryset.filter(status=status)
+
+        return queryset
+
+
+class AsyncMetaView(View):
+    async def get(self, request, key):
+        key = key.replace("$", "/")
+        rows = [row async for row in MetaListSerializer.prepare(Meta.objects.filter(key=key))]
+
+        if not rows:
+            return json_response(f"Couldn't load {key}")
+
+        return json_response({"data": rows[0]})
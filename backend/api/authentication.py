@@ -0,0 +1,42 @@
+from django.core import signing
+from rest_framework import authentication, exceptions
+
+from .tokens import read_access_token
+
+
+class TokenUser:
+    # Пользователь из подписанного токена; база не читается
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, payload):
+        self.id = self.pk = payload['uid']
+        self.kind = payload['kind']
+        self.is_staff = payload.get('staff', False)
+        self.is_superuser = payload.get('superuser', False)
+
+    def __str__(self):
+        return f"{self.kind}:{self.id}"
+
+
+class TokenAuthentication(authentication.BaseAuthentication):
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+
+        try:
+            payload = read_access_token(header[1].decode())
+        except (signing.BadSignature, UnicodeDecodeError):
+            raise exceptions.AuthenticationFailed("Invalid or expired token")
+
+        return TokenUser(payload), payload
+
+    def authenticate_header(self, request):
+        return self.keyword
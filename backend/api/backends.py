@@ -1,31 +1,50 @@
 from django.contrib.auth import get_user_model
-from .models import MentorModel
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.db.models import Value
 
-class CustomUserBackend(ModelBackend):
-    def authenticate(self, request, username=None, password=None):
-        user_model = get_user_model()
-        try:
-            user = user_model.objects.get(username=username)
-            if user.check_password(password):
-                return user
-        except user_model.DoesNotExist:
-            return None
+from .models import MentorModel
+
+
+class UserAndMentorBackend(ModelBackend):
+    # Один запрос по уникальному username сразу в обеих таблицах; при промахе —
+    # один холостой хэш, чтобы время ответа не выдавало существование логина
+    sources = ('user', 'mentor')
+    # Колонки, из которых собирается пользователь, в порядке полей модели (этого требует from_db);
+    # остальные Django догружает при обращении
+    loaded_fields = ('id', 'password', 'is_superuser', 'username', 'is_staff', 'is_active')
 
-    def get_user(self, user_id):
-        user_model = get_user_model()
-        try:           
-            return user_model.objects.get(id=user_id)
-        except user_model.DoesNotExist:
+    def get_models(self):
+        return {'user': get_user_model(), 'mentor': MentorModel}
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None or password is None:
             return None
 
+        models = self.get_models()
+        candidates = None
+        for source in self.sources:
+            queryset = models[source].objects.filter(username=username).order_by().values_list(
+                *self.loaded_fields, Value(source)
+            )
+            candidates = queryset if candidates is None else candidates.union(queryset, all=True)
 
-class MentorBackend(ModelBackend):
-    def authenticate(self, request, username=None, password=None):
-        try:
-            mentor = MentorModel.objects.get(username=username)
-            if mentor.check_password(password):
-                return mentor
-        except MentorModel.DoesNotExist:
+        db = candidates.db
+        candidates = sorted(candidates, key=lambda candidate: self.sources.index(candidate[-1]))
+        if not candidates:
+            make_password(password)
             return None
-    
\ No newline at end of file
+
+        for *values, source in candidates:
+            # Экземпляр из той же строки, без повторного SELECT по pk
+            user = models[source].from_db(db, self.loaded_fields, values)
+
+            def setter(raw_password, user=user):
+                # Пересчёт хэша, если изменились параметры хэшера
+                user.password = make_password(raw_password)
+                type(user).objects.filter(pk=user.pk).update(password=user.password)
+
+            if check_password(password, user.password, setter) and self.user_can_authenticate(user):
+                return user
+
+        return None
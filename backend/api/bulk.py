@@ -0,0 +1,307 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+from rest_framework.views import APIView
+
+from .parsers import BulkJSONParser, NDJSONParser
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def is_pk(value):
+    # bool — подкласс int, но true в теле запроса не должен находить запись с id 1
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # Связанные объекты загружаются одним запросом на пачку вместо .get() на каждую строку
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.objects = {}
+
+    def prefetch(self, values):
+        values = {value for value in values if isinstance(value, (int, str)) and str(value).isdigit()}
+        self.objects = self.get_queryset().in_bulk([int(value) for value in values])
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.objects[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class BulkAPIView(APIView):
+    # POST создаёт, PATCH обновляет по id, DELETE удаляет по id. Тело — JSON-массив или NDJSON.
+    # Всё пишется в одной транзакции; при ошибках в строках ничего не сохраняется,
+    # если не передан ?skip_invalid=true — тогда сохраняются только корректные строки.
+    # Только для администраторов: права приходят в access-токене
+    model = None
+    serializer_class = None
+    parser_classes = [BulkJSONParser, NDJSONParser]
+    permission_classes = [IsAdminUser]
+
+    def get_rows(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
+            return None, Response({"message": "Expected a JSON array or NDJSON"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(rows) > settings.API_BULK_MAX_ROWS:
+            return None, Response(
+                {"message": f"Too many rows, max is {settings.API_BULK_MAX_ROWS}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return rows, None
+
+    def skip_invalid(self):
+        return self.request.query_params.get('skip_invalid') in ('1', 'true', 'True')
+
+    def get_serializer(self, **kwargs):
+        serializer = self.serializer_class(context={'request': self.request, 'view': self}, **kwargs)
+
+        # Уникальность проверяется одним запросом на пачку в check_unique
+        for name in self.unique_fields(serializer):
+            field = serializer.fields[name]
+            field.validators = [validator for validator in field.validators if not isinstance(validator, UniqueValidator)]
+
+        for name, field in list(serializer.fields.items()):
+            if field.read_only:
+                continue
+            if isinstance(field, serializers.ManyRelatedField):
+                child = field.child_relation
+                field.child_relation = PrefetchedPrimaryKeyRelatedField(queryset=child.queryset)
+                field.child_relation.bind('', field)
+            elif type(field) is serializers.PrimaryKeyRelatedField:
+                serializer.fields[name] = PrefetchedPrimaryKeyRelatedField(*field._args, **field._kwargs)
+
+        return serializer
+
+    def unique_fields(self, serializer):
+        return [
+            field.name for field in self.model._meta.concrete_fields
+            if field.unique and not field.primary_key and field.name in serializer.fields
+        ]
+
+    def prefetch_related(self, serializer, batch):
+        for name, field in serializer.fields.items():
+            rows = [row for _, row in batch if isinstance(row, dict) and name in row]
+            if isinstance(field, serializers.ManyRelatedField) and isinstance(field.child_relation, PrefetchedPrimaryKeyRelatedField):
+                field.child_relation.prefetch(
+                    value for row in rows if isinstance(row[name], list) for value in row[name]
+                )
+            elif isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                field.prefetch(row[name] for row in rows)
+
+    def check_unique(self, serializer, validated, errors):
+        # validated: [(индекс, данные, pk обновляемой записи или None)]
+        for name in self.unique_fields(serializer):
+            seen = {}
+            for index, data, pk in validated:
+                value = data.get(name)
+                if value is None:
+                    continue
+                if value in seen:
+                    errors.setdefault(index, {}).setdefault(name, []).append("Duplicate value in this request")
+                else:
+                    seen[value] = pk
+
+            taken = self.model.objects.filter(**{f'{name}__in': list(seen)}).values_list(name, 'pk')
+            for value, pk in taken:
+                if seen[value] != pk:
+                    for index, data, row_pk in validated:
+                        if data.get(name) == value and row_pk != pk and name not in errors.get(index, {}):
+                            errors.setdefault(index, {})[name] = [
+                                f"{self.model._meta.verbose_name} with this {name} already exists."
+                            ]
+
+        return [item for item in validated if item[0] not in errors]
+
+    def validate_rows(self, rows, instances=None, partial=False):
+        serializer = self.get_serializer(partial=partial)
+        errors = {}
+        valid = []
+
+        for batch in chunks(list(enumerate(rows)), settings.API_BULK_BATCH_SIZE):
+            self.prefetch_related(serializer, batch)
+            validated = []
+
+            for index, row in batch:
+                if not isinstance(row, dict):
+                    errors[index] = {"non_field_errors": ["Expected an object"]}
+                    continue
+
+                instance = None
+                if instances is not None:
+                    pk = row.get('id')
+                    instance = instances.get(pk) if is_pk(pk) else None
+                    if instance is None:
+                        errors[index] = {"id": ["Not found"]}
+                        continue
+
+                serializer.instance = instance
+                try:
+                    validated.append((index, serializer.run_validation(row), instance and instance.pk))
+                except serializers.ValidationError as e:
+                    errors[index] = e.detail
+
+            valid.extend(self.check_unique(serializer, validated, errors))
+
+        serializer.instance = None
+        return valid, [{"index": index, "errors": detail} for index, detail in sorted(errors.items())]
+
+    def split_many_to_many(self, data):
+        many_to_many = {
+            field.name: data.pop(field.name)
+            for field in self.model._meta.many_to_many if field.name in data
+        }
+        return data, many_to_many
+
+    def set_many_to_many(self, items):
+        # Связи m2m пишутся в промежуточные таблицы одним bulk_create на поле
+        for field in self.model._meta.many_to_many:
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+
+            updated = [instance.pk for instance, many_to_many in items if field.name in many_to_many]
+            if not updated:
+                continue
+
+            through.objects.filter(**{f'{source}__in': updated}).delete()
+            through.objects.bulk_create([
+                through(**{f'{source}_id': instance.pk, f'{target}_id': related.pk})
+                for instance, many_to_many in items
+                for related in many_to_many.get(field.name, [])
+            ], batch_size=settings.API_BULK_BATCH_SIZE)
+
+    def prepare_data(self, rows, partial):
+        # Обработка проверенных данных до создания экземпляров, например хеширование паролей
+        pass
+
+    def prepare(self, instances, fields=None):
+        # Вместо save() и pre_save-сигналов; fields — изменяемые поля при обновлении
+        return fields
+
+    def after_write(self, instances):
+        # Вместо post_save-сигналов, которые bulk_create и bulk_update не отправляют
+        pass
+
+    def error_response(self, errors, **counts):
+        return Response({**counts, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    def conflict_response(self, valid, errors, **counts):
+        # Уникальность проверяется до транзакции, и параллельная запись могла занять значение.
+        # Транзакция уже откатилась; повторная проверка находит строки, которые теперь конфликтуют
+        conflicts = {}
+        self.check_unique(self.get_serializer(), valid, conflicts)
+        if not conflicts:
+            conflicts = {index: {"non_field_errors": ["Conflicts with a concurrent write"]} for index, _, _ in valid}
+
+        errors = errors + [{"index": index, "errors": detail} for index, detail in conflicts.items()]
+        return Response(
+            {**counts, "errors": sorted(errors, key=lambda error: error["index"])},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    def post(self, request, *args, **kwargs):
+        rows, response = self.get_rows(request)
+        if response is not None:
+            return response
+
+        valid, errors = self.validate_rows(rows)
+        if errors and not self.skip_invalid():
+            return self.error_response(errors, created=0, ids=[])
+
+        rows = [dict(data) for _, data, _ in valid]
+        self.prepare_data(rows, partial=False)
+
+        items = [self.split_many_to_many(data) for data in rows]
+        instances = [self.model(**data) for data, _ in items]
+        self.prepare(instances)
+
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(instances, batch_size=settings.API_BULK_BATCH_SIZE)
+                self.set_many_to_many([(instance, many_to_many) for instance, (_, many_to_many) in zip(instances, items)])
+                self.after_write(instances)
+        except IntegrityError:
+            return self.conflict_response(valid, errors, created=0, ids=[])
+
+        return Response(
+            {"created": len(instances), "ids": [instance.pk for instance in instances], "errors": errors},
+            status=status.HTTP_201_CREATED
+        )
+
+    def patch(self, request, *args, **kwargs):
+        rows, response = self.get_rows(request)
+        if response is not None:
+            return response
+
+        ids = [row.get('id') for row in rows if isinstance(row, dict)]
+        existing = self.model.objects.in_bulk([pk for pk in ids if is_pk(pk)])
+
+        valid, errors = self.validate_rows(rows, instances=existing, partial=True)
+        if errors and not self.skip_invalid():
+            return self.error_response(errors, updated=0)
+
+        rows = [dict(data) for _, data, _ in valid]
+        self.prepare_data(rows, partial=True)
+
+        # auto_now при bulk_update сам не обновляется
+        auto_now = [field.name for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        now = timezone.now()
+
+        fields = set(auto_now)
+        items = []
+        for (_, _, pk), data in zip(valid, rows):
+            data, many_to_many = self.split_many_to_many(data)
+            instance = existing[pk]
+            for name, value in data.items():
+                setattr(instance, name, value)
+            for name in auto_now:
+                setattr(instance, name, now)
+            fields.update(data)
+            items.append((instance, many_to_many))
+
+        instances = list(dict.fromkeys(instance for instance, _ in items))
+        fields = self.prepare(instances, fields)
+
+        try:
+            with transaction.atomic():
+                if instances and fields:
+                    self.model.objects.bulk_update(instances, list(fields), batch_size=settings.API_BULK_BATCH_SIZE)
+                self.set_many_to_many(items)
+                self.after_write(instances)
+        except IntegrityError:
+            return self.conflict_response(valid, errors, updated=0)
+
+        return Response({"updated": len(instances), "errors": errors}, status=status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        rows, response = self.get_rows(request)
+        if response is not None:
+            return response
+
+        ids = [row.get('id') if isinstance(row, dict) else row for row in rows]
+        ids = list(dict.fromkeys(pk for pk in ids if is_pk(pk)))
+
+        with transaction.atomic():
+            queryset = self.model.objects.filter(pk__in=ids)
+            found = set(queryset.values_list('pk', flat=True))
+            queryset.delete()
+
+        return Response(
+            {"deleted": len(found), "missing": [pk for pk in ids if pk not in found]},
+            status=status.HTTP_200_OK
+        )
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def version_key(resource):
+    return f'api:version:{resource}'
+
+
+def get_version(resource):
+    key = version_key(resource)
+    version = cache.get(key)
+
+    if version is None:
+        # Метка времени вместо 1, чтобы не подхватить ответы, пережившие вытесненную версию
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(resource):
+    key = version_key(resource)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def response_key(resource, request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'api:response:{resource}:{get_version(resource)}:{path}'
+
+
+def cached_response(resource):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = response_key(resource, request)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.API_RESPONSE_CACHE_TIMEOUT)
+
+            return response
+        return wrapper
+    return decorator
+
+
+class VersionedLRU:
+    # Кэш в памяти процесса; сбрасывается, когда сигналы поднимают версию ресурса в общем кэше
+    def __init__(self, resource, maxsize):
+        self.resource = resource
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_many(self, keys, loader):
+        version = get_version(self.resource)
+        found = {}
+
+        with self._lock:
+            if version != self._version:
+                self._items.clear()
+                self._version = version
+
+            for key in keys:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    found[key] = self._items[key]
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = loader(missing)
+            # Отсутствующие ключи тоже запоминаются как None
+            loaded = {key: loaded.get(key) for key in missing}
+            found.update(loaded)
+
+            with self._lock:
+                if version == self._version:
+                    self._items.update(loaded)
+                    while len(self._items) > self.maxsize:
+                        self._items.popitem(last=False)
+
+        return found
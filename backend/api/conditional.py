@@ -0,0 +1,43 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+
+def conditional(label, state_func):
+    # state_func возвращает {'last_modified': ..., 'count': ...} и вызывается один раз на запрос
+    def state(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_state'):
+            request._conditional_state = state_func(request, *args, **kwargs)
+
+        return request._conditional_state
+
+    def etag(request, *args, **kwargs):
+        current = state(request, *args, **kwargs)
+        if current['last_modified'] is None:
+            return None
+
+        value = f"{label}:{current['count']}:{current['last_modified'].isoformat()}"
+        return hashlib.md5(value.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return state(request, *args, **kwargs)['last_modified']
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
+
+
+def conditional_get(model, lookup='pk', field='pk'):
+    # Для списка — max(updated_at) и количество строк по всей таблице, для объекта — его updated_at
+    def aggregate(request, *args, **kwargs):
+        queryset = model.objects.all()
+
+        if lookup in kwargs:
+            queryset = queryset.filter(**{field: kwargs[lookup]})
+
+        return queryset.aggregate(
+            last_modified=Max('updated_at'),
+            count=Count('pk'),
+        )
+
+    return conditional(model._meta.label, aggregate)
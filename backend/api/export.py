@@ -0,0 +1,89 @@
+import csv
+import json
+import zlib
+from io import StringIO
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import ContactModel, MentorAppointmentModel, UserModel
+from .serializers import ContactListSerializer, MentorAppointmentListSerializer, UserListSerializer
+
+
+EXPORTS = {
+    'users': (UserModel, UserListSerializer),
+    'contacts': (ContactModel, ContactListSerializer),
+    'appointments': (MentorAppointmentModel, MentorAppointmentListSerializer),
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_fields(serializer_class, fields=None, exclude=None):
+    # Выгружаются колонки модели; ссылки на уменьшенные копии в выгрузку не входят
+    return tuple(name for name in serializer_class.select(fields, exclude) if name in serializer_class.fields)
+
+
+def export_rows(resource, fields, request=None, chunk_size=None):
+    # Строки читаются курсором пачками по chunk_size, в памяти одновременно одна пачка
+    model, serializer_class = EXPORTS[resource]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = serializer_class.prepare(model.objects.order_by('id'), fields)
+    serializer = serializer_class([], context={'request': request}, fields=fields)
+
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield serializer.format(chunk)
+            chunk = []
+
+    if chunk:
+        yield serializer.format(chunk)
+
+
+def encode_ndjson(chunks, fields):
+    encoder = JSONEncoder(ensure_ascii=False)
+    for chunk in chunks:
+        yield ''.join(encoder.encode(row) + '\n' for row in chunk)
+
+
+def encode_csv(chunks, fields):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    for chunk in chunks:
+        writer.writerows([['' if row[name] is None else row[name] for name in fields] for row in chunk])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(resource, fmt, fields, request=None, compress=False, chunk_size=None):
+    # Генератор байтов выгрузки; общий для эндпоинта и команды export_data
+    encoded = (text.encode() for text in ENCODERS[fmt](export_rows(resource, fields, request, chunk_size), fields))
+    if compress:
+        return gzip_stream(encoded)
+    return encoded
@@ -0,0 +1,8 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    # Тот же алгоритм pbkdf2_sha256, число итераций из настроек;
+    # старые хэши пересчитываются при успешном входе
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    thread_name_prefix='image-variants',
+)
+
+
+def variant_path(name, variant):
+    stem, _ = os.path.splitext(name)
+    return f'{settings.IMAGE_VARIANT_DIR}/{stem}_{variant}.webp'
+
+
+def variant_paths(name):
+    return {variant: variant_path(name, variant) for variant in settings.IMAGE_VARIANTS}
+
+
+def generate_variants(name, storage=default_storage, force=False):
+    paths = variant_paths(name)
+    if not force and all(storage.exists(path) for path in paths.values()):
+        return False
+
+    with storage.open(name) as file:
+        image = Image.open(file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.mode in ('LA', 'P', 'PA') else 'RGB')
+
+    for variant, size in settings.IMAGE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.LANCZOS)
+
+        buffer = BytesIO()
+        resized.save(buffer, 'WEBP', quality=settings.IMAGE_VARIANT_QUALITY, method=4)
+
+        path = paths[variant]
+        if storage.exists(path):
+            storage.delete(path)
+        storage.save(path, ContentFile(buffer.getvalue()))
+
+    return True
+
+
+# Файлы, для которых генерация уже стоит в пуле. Второй параллельный проход по тому же
+# файлу гонялся бы с первым за default_storage.save и оставлял копии с суффиксами
+pending = set()
+pending_lock = threading.Lock()
+
+
+def _generate_in_background(name):
+    try:
+        generate_variants(name)
+    except Exception:
+        logger.exception("Couldn't generate image variants for %s", name)
+    finally:
+        with pending_lock:
+            pending.discard(name)
+
+
+def submit_variants(name):
+    with pending_lock:
+        if name in pending:
+            return
+        pending.add(name)
+
+    executor.submit(_generate_in_background, name)
+
+
+def schedule_variants(name):
+    # Кодирование идёт в пуле потоков после коммита, запрос загрузки его не ждёт.
+    # С IMAGE_VARIANT_QUEUE = 'jobs' — задачей для manage.py runworker
+    if not name:
+        return
+
+    if settings.IMAGE_VARIANT_QUEUE == 'jobs':
+        # Импорт здесь: jobs зависит от models, а models — от этого модуля
+        from .jobs import enqueue
+        from .models import Job
+
+        if not Job.objects.filter(name='image_variants', status=Job.QUEUED, kwargs__name=name).exists():
+            enqueue('image_variants', {'name': name}, priority=Job.HIGH)
+        return
+
+    transaction.on_commit(lambda: submit_variants(name))
@@ -0,0 +1,113 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import storages
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+def owner_key(user):
+    # TokenUser не загружает модель из базы, а знает её имя из токена
+    return f"{getattr(user, 'kind', None) or user._meta.model_name}:{user.pk}"
+
+
+def enqueue(name, kwargs=None, priority=Job.NORMAL, max_attempts=None, delay=None, owner=''):
+    # Строка пишется в текущей транзакции: при откате задача пропадает вместе с данными
+    if name not in settings.JOB_TASKS:
+        raise ValueError(f"Unknown job {name}, expected one of {', '.join(settings.JOB_TASKS)}")
+
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs or {},
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        available_at=timezone.now() + (delay or timedelta()),
+        owner=owner,
+    )
+
+
+def get_task(name):
+    return import_string(settings.JOB_TASKS[name])
+
+
+def claim(batch_size, now=None):
+    # Та же схема, что у outbox: SKIP LOCKED в PostgreSQL и аренда на случай падения воркера.
+    # Попытка засчитывается при захвате, поэтому задача, роняющая воркер, не крутится вечно
+    now = now or timezone.now()
+    expired = Q(status=Job.RUNNING, locked_until__lt=now)
+
+    with transaction.atomic():
+        Job.objects.filter(expired, attempts__gte=F('max_attempts')).update(
+            status=Job.FAILED, locked_until=None, finished_at=now, error="Lease expired",
+        )
+
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Job.QUEUED, available_at__lte=now) | expired)
+            .order_by('-priority', 'available_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        Job.objects.filter(id__in=ids).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=now,
+            locked_until=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        )
+
+    return list(Job.objects.filter(id__in=ids).order_by('-priority', 'available_at', 'id'))
+
+
+def backoff(attempts):
+    delay = min(settings.JOB_BACKOFF_MAX_SECONDS, settings.JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def run(job):
+    # Фильтр по attempts отсекает запись результата, если аренда истекла и задачу уже взял другой воркер
+    current = Job.objects.filter(pk=job.pk, attempts=job.attempts)
+
+    try:
+        result = get_task(job.name)(**job.kwargs)
+    except Exception as e:
+        failed = job.attempts >= job.max_attempts
+        logger.warning("Job %s (%s) failed, attempt %s: %s", job.pk, job.name, job.attempts, e)
+
+        current.update(
+            status=Job.FAILED if failed else Job.QUEUED,
+            available_at=timezone.now() + backoff(job.attempts),
+            finished_at=timezone.now() if failed else None,
+            locked_until=None,
+            error=f"{type(e).__name__}: {e}",
+        )
+        return False
+
+    current.update(
+        status=Job.SUCCEEDED,
+        result=result,
+        locked_until=None,
+        finished_at=timezone.now(),
+        error="",
+    )
+    return True
+
+
+def purge(now=None):
+    # Выполненные задачи старше JOB_KEEP_DAYS удаляются вместе с файлами выгрузок;
+    # упавшие остаются для разбора
+    cutoff = (now or timezone.now()) - timedelta(days=settings.JOB_KEEP_DAYS)
+    jobs = Job.objects.filter(status=Job.SUCCEEDED, finished_at__lt=cutoff)
+
+    for result in jobs.filter(name='export').values_list('result', flat=True):
+        if result and result.get('file'):
+            storages['exports'].delete(result['file'])
+
+    return jobs.delete()[0]
@@ -0,0 +1,220 @@
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import override_settings
+
+
+# Пары "синхронное DRF-представление — async-версия" для одного и того же ответа.
+# Синхронное гоняется под WSGI и под ASGI, async — под ASGI
+PAIRS = {
+    'articles': ('/api/posts/', '/api/async/posts/'),
+    'events': ('/api/events', '/api/async/events'),
+    'categories': ('/api/categories', '/api/async/categories'),
+    'mentors': ('/api/mentors', '/api/async/mentors'),
+}
+
+
+async def asgi_get(application, host, path, query):
+    # Один GET прямо через ASGI-обработчик Django, как его вызвал бы uvicorn, но без сети
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': query.encode(),
+        'headers': [(b'host', host.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': (host, 80),
+    }
+    received = False
+    disconnected = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Клиент не отключается; обработчик отменит ожидание, когда ответ будет отправлен
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def load(application, host, path, query, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            status = await asgi_get(application, host, path, query)
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return summary(path, latencies, errors, time.perf_counter() - started)
+
+
+def wsgi_get(application, host, path, query):
+    # Один GET через WSGI-обработчик Django, как его вызвал бы поток gunicorn, но без сети
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': host,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    status = None
+
+    def start_response(status_line, headers, exc_info=None):
+        nonlocal status
+        status = int(status_line.split(' ', 1)[0])
+
+    response = application(environ, start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        # close() шлёт request_finished, как это делает WSGI-сервер
+        response.close()
+    return status
+
+
+def wsgi_load(application, host, path, query, requests, concurrency):
+    # Потоки — как воркер gunicorn с --threads=concurrency
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+
+    def worker():
+        nonlocal errors
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                started = time.perf_counter()
+                status = wsgi_get(application, host, path, query)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    errors += status != 200
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(min(concurrency, requests))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summary(path, latencies, errors, time.perf_counter() - started)
+
+
+def percentile(latencies, share):
+    return latencies[max(int(len(latencies) * share) - 1, 0)] * 1000
+
+
+def summary(path, latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'path': path,
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'errors': errors,
+    }
+
+
+def run_benchmark(names, requests=200, concurrency=200, query='', host='localhost', cache=False):
+    # Без --cache ответ не кладётся в кэш, и синхронная версия каждый раз идёт в базу, как async
+    wsgi, asgi = get_wsgi_application(), get_asgi_application()
+    timeout = {} if cache else {'API_RESPONSE_CACHE_TIMEOUT': 0}
+
+    def run_wsgi(path, count):
+        return wsgi_load(wsgi, host, path, query, count, concurrency)
+
+    def run_asgi(path, count):
+        return asyncio.run(load(asgi, host, path, query, count, concurrency))
+
+    results = []
+    with override_settings(**timeout):
+        for name in names:
+            sync_path, async_path = PAIRS[name]
+            for server, mode, path, run in (
+                ('WSGI', 'sync', sync_path, run_wsgi),
+                ('ASGI', 'sync', sync_path, run_asgi),
+                ('ASGI', 'async', async_path, run_asgi),
+            ):
+                # Прогрев: первые запросы открывают соединения и заполняют кэши Python
+                run(path, min(concurrency, requests))
+                results.append({'name': name, 'server': server, 'mode': mode, **run(path, requests)})
+    return results
+
+
+class Command(BaseCommand):
+    help = "Сравнивает синхронные DRF-представления под WSGI и ASGI и async-версии под ASGI: запросов в секунду и задержки"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=list(PAIRS), action='append', help="По умолчанию все")
+        parser.add_argument('--requests', type=int, default=200, help="Запросов на эндпоинт")
+        parser.add_argument('--concurrency', type=int, default=200, help="Одновременных запросов (потоков под WSGI)")
+        parser.add_argument('--query', default='', help="Строка запроса, например page_size=50")
+        parser.add_argument('--host', default='localhost', help="Заголовок Host, должен быть в ALLOWED_HOSTS")
+        parser.add_argument('--cache', action='store_true', help="Не отключать кэш ответов синхронных представлений")
+
+    def handle(self, *args, **options):
+        results = run_benchmark(
+            options['endpoint'] or list(PAIRS),
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            query=options['query'],
+            host=options['host'],
+            cache=options['cache'],
+        )
+
+        self.stdout.write(
+            f"{'endpoint':<26} {'server':<11} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for result in results:
+            server = f"{result['server']} {result['mode']}"
+            self.stdout.write(
+                f"{result['path']:<26} {server:<11} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+                f"{result['p95']:>8.1f} {result['p99']:>8.1f} {result['errors']:>7}"
+            )
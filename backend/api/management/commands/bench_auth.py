@@ -0,0 +1,104 @@
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.request import Request
+
+from api.authentication import TokenAuthentication
+from api.middleware import NonAPIAuthenticationMiddleware, NonAPIMessageMiddleware, NonAPISessionMiddleware
+from api.models import UserModel
+from api.tokens import issue_tokens
+
+
+PATH = '/api/categories'
+
+
+def chain(middleware, authentication):
+    # Та часть запроса, которой отличаются варианты: middleware и аутентификация DRF; сам ответ пустой
+    def view(request):
+        user, _ = authentication.authenticate(Request(request)) or (None, None)
+        return HttpResponse(str(user))
+
+    handler = view
+    for middleware_class in reversed(middleware):
+        handler = middleware_class(handler)
+    return handler
+
+
+def session_variant(user):
+    # Как до токенов: сессия из cookie, пользователь из базы, SessionAuthentication
+    client = Client()
+    client.force_login(user)
+    request = RequestFactory().get(PATH)
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = client.cookies[settings.SESSION_COOKIE_NAME].value
+    return request, chain((SessionMiddleware, AuthenticationMiddleware, MessageMiddleware), SessionAuthentication())
+
+
+def token_variant(user):
+    # Сейчас: middleware пропускают /api/, пользователь берётся из подписанного токена
+    request = RequestFactory().get(PATH, HTTP_AUTHORIZATION=f"Bearer {issue_tokens(user)['access']}")
+    return request, chain((NonAPISessionMiddleware, NonAPIAuthenticationMiddleware, NonAPIMessageMiddleware), TokenAuthentication())
+
+
+def measure(request, handler, requests):
+    def one():
+        # Свежая копия: middleware кладут в запрос session и user
+        fresh = RequestFactory().generic(request.method, request.path, **{
+            key: value for key, value in request.META.items() if key.startswith('HTTP_')
+        })
+        fresh.COOKIES = dict(request.COOKIES)
+        return handler(fresh)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = one()
+    if response.content == b'None':
+        raise RuntimeError("Request was not authenticated")
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        one()
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    return {
+        'us': statistics.median(latencies) * 1e6,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1e6,
+        'queries': len(queries),
+    }
+
+
+def run_benchmark(requests=5000):
+    # Сессия пишется в базу, поэтому пользователь и его сессия удаляются после замера
+    user = UserModel.objects.create(username='bench-auth', email='bench-auth@example.com')
+    variants = (('session', session_variant(user)), ('token', token_variant(user)))
+    try:
+        return [{'variant': name, **measure(request, handler, requests)} for name, (request, handler) in variants]
+    finally:
+        session_key = variants[0][1][0].COOKIES[settings.SESSION_COOKIE_NAME]
+        import_module(settings.SESSION_ENGINE).SessionStore(session_key).delete()
+        user.delete()
+
+
+class Command(BaseCommand):
+    help = "Сравнивает накладные расходы на запрос: сессия и пользователь из базы против подписанного токена"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help="Запросов на вариант")
+
+    def handle(self, *args, **options):
+        results = run_benchmark(options['requests'])
+
+        self.stdout.write(f"{'variant':<8} {'us/req':>8} {'p95 us':>8} {'queries':>8}")
+        for result in results:
+            self.stdout.write(f"{result['variant']:<8} {result['us']:>8.1f} {result['p95']:>8.1f} {result['queries']:>8}")
@@ -0,0 +1,86 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.authentication import TokenUser
+from api.serializers import UserSerializer
+from api.views import UserBulkView
+
+
+ADMIN = TokenUser({'uid': 0, 'kind': 'usermodel', 'staff': True, 'superuser': True})
+
+
+def user_rows(count, prefix='bench', password=None):
+    for index in range(count):
+        row = {
+            'username': f'{prefix}{index}',
+            'email': f'{prefix}{index}@example.com',
+            'first_name': 'Имя',
+            'last_name': 'Фамилия',
+            'status': 'studying',
+        }
+        if password:
+            row['password'] = password
+        yield row
+
+
+def import_bulk(rows):
+    # Тот же путь, что у POST /api/users/bulk: NDJSON-парсер, пакетная проверка, bulk_create
+    body = '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows).encode()
+    request = APIRequestFactory().post('/api/users/bulk', body, content_type='application/x-ndjson')
+    force_authenticate(request, user=ADMIN)
+    return UserBulkView.as_view()(request)
+
+
+def import_one_by_one(rows):
+    # Как раньше через POST /api/users: сериализатор и save() на каждую строку
+    for row in rows:
+        serializer = UserSerializer(data=row)
+        serializer.fields['password'].required = False
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        user.set_password(row.get('password'))
+        user.save()
+
+
+def timed(function, rows):
+    # Всё откатывается: база после замера остаётся прежней
+    started = time.perf_counter()
+    with transaction.atomic():
+        result = function(rows)
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return elapsed, result
+
+
+def run_benchmark(rows=50000, baseline=500, password=None):
+    bulk_elapsed, response = timed(import_bulk, list(user_rows(rows, password=password)))
+    if response.status_code != 201:
+        raise RuntimeError(f"Bulk import failed: {response.status_code} {response.data}")
+
+    results = [{'method': 'bulk', 'rows': rows, 'seconds': bulk_elapsed, 'rps': rows / bulk_elapsed}]
+    if baseline:
+        elapsed, _ = timed(import_one_by_one, list(user_rows(baseline, prefix='single', password=password)))
+        results.append({'method': 'one by one', 'rows': baseline, 'seconds': elapsed, 'rps': baseline / elapsed})
+    return results
+
+
+class Command(BaseCommand):
+    help = "Замеряет импорт пользователей через /api/users/bulk и по одному; изменения откатываются"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help="Пользователей в пакетном импорте")
+        parser.add_argument('--baseline', type=int, default=500, help="Пользователей для замера по одному, 0 — без него")
+        parser.add_argument('--password', help="Пароль для всех строк; по умолчанию без пароля, хеширование не замеряется")
+
+    def handle(self, *args, **options):
+        results = run_benchmark(options['rows'], options['baseline'], options['password'])
+
+        self.stdout.write(f"{'method':<12} {'rows':>8} {'seconds':>9} {'rows/s':>9}")
+        for result in results:
+            self.stdout.write(
+                f"{result['method']:<12} {result['rows']:>8} {result['seconds']:>9.2f} {result['rps']:>9.0f}"
+            )
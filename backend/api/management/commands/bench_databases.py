@@ -0,0 +1,165 @@
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+
+
+# Один и тот же набор GET на каждой базе; {article}, {user}, {event} — id существующих строк
+WORKLOAD = (
+    '/api/posts/?page_size=50',
+    '/api/posts/{article}',
+    '/api/users?page_size=50',
+    '/api/users/{user}',
+    '/api/events?page_size=50',
+    '/api/events/{event}',
+    '/api/categories',
+)
+
+BACKENDS = {
+    'sqlite': {'DB_ENGINE': 'sqlite', 'SQLITE_PROFILE': 'production'},
+    'postgres': {'DB_ENGINE': 'postgres'},
+}
+
+
+def seed(rows):
+    from api.models import ArticleModel, CategoryModel, EventModel, UserModel
+
+    # bulk_create не шлёт сигналов: HTML, поисковый индекс и счётчики для замера не нужны
+    categories = CategoryModel.objects.bulk_create([CategoryModel(title=f'Категория {index}') for index in range(10)])
+    articles = ArticleModel.objects.bulk_create([
+        ArticleModel(title=f'Статья {index}', title_en=f'article-{index}', author='Автор', text='<p>Текст</p>')
+        for index in range(rows)
+    ], batch_size=1000)
+    links = ArticleModel.categories.through
+    links.objects.bulk_create([
+        links(articlemodel_id=article.pk, categorymodel_id=categories[article.pk % len(categories)].pk)
+        for article in articles
+    ], batch_size=1000)
+    users = UserModel.objects.bulk_create([
+        UserModel(username=f'user{index}', email=f'user{index}@example.com', password='!', patronymic='')
+        for index in range(rows)
+    ], batch_size=1000)
+    events = EventModel.objects.bulk_create([
+        EventModel(date=datetime.date(2024, 1, 1) + datetime.timedelta(days=index % 365), title=f'Событие {index}', description='')
+        for index in range(rows)
+    ], batch_size=1000)
+
+    return {'article': articles[len(articles) // 2].pk, 'user': users[len(users) // 2].pk, 'event': events[len(events) // 2].pk}
+
+
+def run_workload(ids, requests, threads):
+    # Потоки имитируют воркеры gunicorn с общим пулом соединений процесса
+    paths = [path.format(**ids) for path in WORKLOAD]
+    latencies = {path: [] for path in paths}
+    errors = []
+
+    def worker():
+        client = Client()
+        try:
+            for index in range(requests):
+                path = paths[index % len(paths)]
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies[path].append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors.append((path, response.status_code))
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    every = sorted(latency for values in latencies.values() for latency in values)
+    return {
+        'rps': len(every) / elapsed,
+        'p50': statistics.median(every) * 1000,
+        'p95': every[int(len(every) * 0.95) - 1] * 1000,
+        'errors': len(errors),
+        'paths': {path: statistics.median(values) * 1000 for path, values in latencies.items()},
+    }
+
+
+def measure(rows, requests, threads):
+    # Выполняется в отдельном процессе с DB_ENGINE нужной базы: отдельная тестовая база,
+    # миграции, данные, замер и удаление базы
+    setup_test_environment()
+    creation = connection.creation
+
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == 'sqlite':
+            # Файл, а не память: как у рабочего профиля
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+
+        old_name = creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            ids = seed(rows)
+            with override_settings(API_RESPONSE_CACHE_TIMEOUT=0):
+                # Прогрев соединений и кэшей Python
+                run_workload(ids, len(WORKLOAD), threads)
+                result = run_workload(ids, requests, threads)
+        finally:
+            connection.close()
+            creation.destroy_test_db(old_name, verbosity=0)
+
+    return {'vendor': connection.vendor, **result}
+
+
+class Command(BaseCommand):
+    help = "Гоняет одинаковую нагрузку списков и карточек на SQLite и PostgreSQL во временных базах"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=list(BACKENDS), action='append', help="По умолчанию обе")
+        parser.add_argument('--rows', type=int, default=5000, help="Строк в каждой таблице")
+        parser.add_argument('--requests', type=int, default=200, help="Запросов на поток")
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--worker', action='store_true', help="Замер в текущем процессе с текущим DB_ENGINE")
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            result = measure(options['rows'], options['requests'], options['threads'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = []
+        for backend in options['backend'] or list(BACKENDS):
+            # DB_ENGINE читается при загрузке settings, поэтому каждая база — свой процесс
+            completed = subprocess.run(
+                [
+                    sys.executable, sys.argv[0], 'bench_databases', '--worker',
+                    '--rows', str(options['rows']),
+                    '--requests', str(options['requests']),
+                    '--threads', str(options['threads']),
+                ],
+                env={**os.environ, **BACKENDS[backend]},
+                capture_output=True,
+                text=True,
+            )
+            if completed.returncode:
+                raise CommandError(f"{backend} run failed:\n{completed.stderr}")
+            results.append({'backend': backend, **json.loads(completed.stdout.strip().splitlines()[-1])})
+
+        self.stdout.write(f"{'backend':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for result in results:
+            self.stdout.write(
+                f"{result['backend']:<10} {result['rps']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['errors']:>7}"
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f"{'path':<28}" + ''.join(f"{result['backend'] + ' p50':>14}" for result in results))
+        for path in results[0]['paths']:
+            self.stdout.write(f"{path:<28}" + ''.join(f"{result['paths'][path]:>14.2f}" for result in results))
@@ -0,0 +1,130 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import MentorModel, UserModel
+
+
+PASSWORD = 'Long-enough-passw0rd'
+
+
+def create_accounts(count):
+    # Хэш один на всех: стоимость входа от этого не меняется, а подготовка не хэширует count раз
+    encoded = make_password(PASSWORD)
+    UserModel.objects.bulk_create([
+        UserModel(username=f'bench{index}', email=f'bench{index}@example.com', password=encoded, patronymic='')
+        for index in range(count)
+    ], batch_size=1000)
+    MentorModel.objects.bulk_create([
+        MentorModel(username=f'mentor{index}', email=f'mentor{index}@example.com', password=encoded, patronymic='')
+        for index in range(count)
+    ], batch_size=1000)
+
+
+def credentials(kind, count):
+    # Попадания — вперемешку пользователи и менторы, промахи — несуществующие логины
+    for index in range(count):
+        if kind == 'hit':
+            yield {'username': f'{("bench", "mentor")[index % 2]}{index // 2}', 'password': PASSWORD}
+        else:
+            yield {'username': f'missing{index}', 'password': PASSWORD}
+
+
+def sign_in(client, body, expected):
+    response = client.post('/api/login', body, format='json')
+    return response.status_code == expected
+
+
+def queries_per_login(kind):
+    body = next(credentials(kind, 1))
+    with CaptureQueriesContext(connection) as queries:
+        sign_in(APIClient(), body, 200 if kind == 'hit' else 401)
+    return len(queries)
+
+
+def load(kind, logins, threads):
+    expected = 200 if kind == 'hit' else 401
+    bodies = list(credentials(kind, logins))
+    # Заодно прогрев: первый вход открывает соединение и заполняет кэши Python
+    queries = queries_per_login(kind)
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(share):
+        nonlocal errors
+        client = APIClient()
+        try:
+            for body in share:
+                started = time.perf_counter()
+                ok = sign_in(client, body, expected)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    errors += not ok
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker, args=(bodies[index::threads],)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'kind': kind,
+        'logins': logins,
+        'rps': logins / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+        'queries': queries,
+        'errors': errors,
+    }
+
+
+def delete_accounts():
+    UserModel.objects.filter(username__startswith='bench', email__endswith='@example.com').delete()
+    MentorModel.objects.filter(username__startswith='mentor', email__endswith='@example.com').delete()
+
+
+def run_benchmark(accounts=1000, logins=100, threads=4):
+    # Троттлинг входа отключён, иначе замер упрётся в лимит. Потоки ходят в базу своими
+    # соединениями и не видят незакоммиченного, поэтому учётки коммитятся и удаляются после замера
+    rates = {**settings.API_THROTTLE_RATES, 'sign_in': (10 ** 9, 1)}
+    with override_settings(API_THROTTLE_RATES=rates, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        create_accounts(accounts)
+        try:
+            return [load(kind, logins, threads) for kind in ('hit', 'miss')]
+        finally:
+            delete_accounts()
+
+
+class Command(BaseCommand):
+    help = "Замеряет пропускную способность POST /api/login для существующих и несуществующих логинов; тестовые учётки удаляются"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=1000, help="Пользователей и менторов в базе")
+        parser.add_argument('--logins', type=int, default=100, help="Входов на каждый вариант")
+        parser.add_argument('--threads', type=int, default=4)
+
+    def handle(self, *args, **options):
+        results = run_benchmark(options['accounts'], options['logins'], options['threads'])
+
+        self.stdout.write(f"PBKDF2 iterations: {settings.PASSWORD_PBKDF2_ITERATIONS}")
+        self.stdout.write(f"{'kind':<6} {'logins':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'errors':>7}")
+        for result in results:
+            self.stdout.write(
+                f"{result['kind']:<6} {result['logins']:>7} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+                f"{result['p95']:>8.1f} {result['queries']:>8} {result['errors']:>7}"
+            )
@@ -0,0 +1,110 @@
+import random
+import statistics
+import time
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api import search
+from api.models import ArticleModel, CategoryModel
+
+
+# Словарь текстов: частые слова дают тысячи совпадений, редкие — единицы
+WORDS = (
+    'python', 'django', 'postgres', 'frontend', 'backend', 'карьера', 'собеседование', 'резюме',
+    'алгоритмы', 'графы', 'очереди', 'кэш', 'тесты', 'docker', 'linux', 'сеть', 'данные', 'модели',
+)
+RARE_WORDS = ('кватернионы', 'тетраэдр', 'zeppelin')
+QUERIES = ('python', 'графы очереди', 'карьера резюме', 'кватернионы', 'отсутствует')
+
+
+def paragraph(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(40, 120))]
+    if rng.random() < 0.001:
+        words.append(rng.choice(RARE_WORDS))
+    return f"<p>{' '.join(words)}</p>"
+
+
+def create_articles(count, categories=10):
+    rng = random.Random(0)
+    created = CategoryModel.objects.bulk_create([CategoryModel(title=f'Категория {index}') for index in range(categories)])
+    # bulk_create не шлёт сигналов, индекс строится одним rebuild_index
+    articles = ArticleModel.objects.bulk_create([
+        ArticleModel(
+            title=f'{rng.choice(WORDS).title()} {index}', title_en=f'bench-{index}',
+            author=f'Автор {index % 50}', text=paragraph(rng),
+        )
+        for index in range(count)
+    ], batch_size=1000)
+    links = ArticleModel.categories.through
+    links.objects.bulk_create([
+        links(articlemodel_id=article.pk, categorymodel_id=created[article.pk % categories].pk)
+        for article in articles
+    ], batch_size=1000)
+    search.rebuild_index('article', ArticleModel.objects.all())
+    return created[0]
+
+
+def index_search(query, limit, within=None):
+    return search.search_ids('article', query, limit, within=within)
+
+
+def icontains_search(query, limit, within=None):
+    # Как без индекса: LIKE '%слово%' по HTML во всех полях, каждое слово обязательно
+    queryset = within if within is not None else ArticleModel.objects.all()
+    for word in search.WORD.findall(query):
+        queryset = queryset.filter(reduce(or_, [Q(**{f'{name}__icontains': word}) for name in ('title', 'text', 'author')]))
+    return list(queryset.order_by('id').values_list('id', flat=True)[:limit])
+
+
+def measure(function, query, limit, repeat, within=None):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ids = function(query, limit, within)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(ids)
+
+
+def run_benchmark(articles=100000, limit=20, repeat=5):
+    if not search.is_supported(connection):
+        raise CommandError(f"Full-text search is not available on {connection.vendor}")
+
+    results = []
+    # Всё откатывается: база после замера остаётся прежней
+    with transaction.atomic():
+        category = create_articles(articles)
+        in_category = ArticleModel.objects.filter(categories__id=category.pk)
+
+        for query in QUERIES:
+            for scope, within in (('all', None), ('category', in_category)):
+                index_ms, index_hits = measure(index_search, query, limit, repeat, within)
+                like_ms, like_hits = measure(icontains_search, query, limit, repeat, within)
+                results.append({
+                    'query': query, 'scope': scope, 'index_ms': index_ms, 'icontains_ms': like_ms,
+                    'index_hits': index_hits, 'icontains_hits': like_hits,
+                })
+        transaction.set_rollback(True)
+    return results
+
+
+class Command(BaseCommand):
+    help = "Сравнивает поиск по полнотекстовому индексу и icontains на сгенерированных статьях; изменения откатываются"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000)
+        parser.add_argument('--limit', type=int, default=20, help="Размер страницы")
+        parser.add_argument('--repeat', type=int, default=5, help="Повторов, берётся медиана")
+
+    def handle(self, *args, **options):
+        results = run_benchmark(options['articles'], options['limit'], options['repeat'])
+
+        self.stdout.write(f"{'query':<16} {'scope':<9} {'index ms':>9} {'icontains ms':>13} {'hits':>11}")
+        for result in results:
+            hits = f"{result['index_hits']}/{result['icontains_hits']}"
+            self.stdout.write(
+                f"{result['query']:<16} {result['scope']:<9} {result['index_ms']:>9.2f} {result['icontains_ms']:>13.2f} {hits:>11}"
+            )
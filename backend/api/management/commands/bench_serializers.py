@@ -0,0 +1,67 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import UserModel
+from api.serializers import UserListSerializer, UserSerializer
+
+
+def create_users(count):
+    # bulk_create без сигналов и хеширования: замеряется только сериализация
+    UserModel.objects.bulk_create([
+        UserModel(username=f'bench{index}', email=f'bench{index}@example.com', password='!', name='Имя', status='studying')
+        for index in range(count)
+    ], batch_size=1000)
+
+
+def model_serializer():
+    # Как раньше у GET /api/users: экземпляры моделей и ModelSerializer на каждую строку
+    return UserSerializer(UserModel.objects.all(), many=True).data
+
+
+def values_serializer():
+    # Текущий путь списков: .values() только публичных колонок
+    serializer = UserListSerializer
+    return serializer(UserModel.objects.values(*serializer.fields)).data
+
+
+def measure(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(json.dumps(data, ensure_ascii=False, default=str).encode())
+
+
+def run_benchmark(rows=10000, repeat=3):
+    results = []
+    # Всё откатывается: база после замера остаётся прежней
+    with transaction.atomic():
+        create_users(rows)
+        for name, function in (('UserSerializer', model_serializer), ('UserListSerializer', values_serializer)):
+            seconds, size = measure(function, repeat)
+            results.append({'serializer': name, 'rows': rows, 'seconds': seconds, 'per_row_us': seconds / rows * 1e6, 'bytes': size})
+        transaction.set_rollback(True)
+    return results
+
+
+class Command(BaseCommand):
+    help = "Сравнивает сериализацию списка пользователей через ModelSerializer и через .values(); изменения откатываются"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help="Пользователей в списке")
+        parser.add_argument('--repeat', type=int, default=3, help="Повторов, берётся лучший")
+
+    def handle(self, *args, **options):
+        results = run_benchmark(options['rows'], options['repeat'])
+
+        self.stdout.write(f"{'serializer':<20} {'rows':>8} {'seconds':>9} {'us/row':>8} {'JSON bytes':>11}")
+        for result in results:
+            self.stdout.write(
+                f"{result['serializer']:<20} {result['rows']:>8} {result['seconds']:>9.3f} "
+                f"{result['per_row_us']:>8.1f} {result['bytes']:>11}"
+            )
@@ -0,0 +1,70 @@
+import os
+import shutil
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import ArticleModel, EventModel, MentorModel, UserModel
+from api.storage import CONTENT_ADDRESSED_NAME, content_addressed_name, content_addressed_storage, content_hash
+
+
+class Command(BaseCommand):
+    help = "Переименовывает загруженные изображения по хэшу содержимого и удаляет дубликаты"
+
+    sources = [
+        (UserModel, 'photo'),
+        (MentorModel, 'photo'),
+        (EventModel, 'photo'),
+        (ArticleModel, 'image'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Только показать, что будет сделано")
+
+    def handle(self, *args, **options):
+        storage = content_addressed_storage
+        dry_run = options['dry_run']
+
+        directories = {model._meta.get_field(field).upload_to.rstrip('/') for model, field in self.sources}
+
+        renames = {}
+        for directory in sorted(directories):
+            if not storage.exists(directory):
+                continue
+
+            _, files = storage.listdir(directory)
+            for filename in sorted(files):
+                name = f'{directory}/{filename}'
+                if CONTENT_ADDRESSED_NAME.search(name):
+                    continue
+
+                with storage.open(name) as file:
+                    renames[name] = content_addressed_name(name, content_hash(File(file)))
+
+        targets = set(renames.values())
+        self.stdout.write(f"{len(renames)} files -> {len(targets)} unique blobs")
+        if dry_run:
+            for old, new in renames.items():
+                self.stdout.write(f"{old} -> {new}")
+            return
+
+        for old, new in renames.items():
+            if not storage.exists(new):
+                # Старый файл остаётся до обновления ссылок в базе
+                try:
+                    os.link(storage.path(old), storage.path(new))
+                except OSError:
+                    shutil.copyfile(storage.path(old), storage.path(new))
+
+        with transaction.atomic():
+            for model, field in self.sources:
+                for old, new in renames.items():
+                    updated = model.objects.filter(**{field: old}).update(**{field: new})
+                    if updated:
+                        self.stdout.write(f"{model.__name__}.{field}: {old} -> {new} ({updated})")
+
+        for old in renames:
+            storage.delete(old)
+
+        self.stdout.write("Done. Run generate_image_variants to rebuild variants for the new names")
@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORTS, FORMATS, export_fields, export_stream
+
+
+class Command(BaseCommand):
+    help = "Потоково выгружает пользователей, сообщения или записи к менторам в NDJSON или CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=list(EXPORTS))
+        parser.add_argument('--format', dest='fmt', choices=list(FORMATS), default='ndjson')
+        parser.add_argument('--gzip', action='store_true', help="Сжимать gzip на лету")
+        parser.add_argument('--fields', help="Колонки через запятую")
+        parser.add_argument('--chunk-size', type=int, help="Строк на пачку курсора")
+        parser.add_argument('--output', '-o', help="Файл; по умолчанию stdout")
+
+    def handle(self, *args, **options):
+        fields = [name for name in options['fields'].split(',') if name] if options['fields'] else None
+        fields = export_fields(EXPORTS[options['resource']][1], fields)
+        stream = export_stream(
+            options['resource'], options['fmt'], fields,
+            compress=options['gzip'], chunk_size=options['chunk_size'],
+        )
+
+        if options['output']:
+            with open(options['output'], 'wb') as file:
+                for data in stream:
+                    file.write(data)
+        else:
+            for data in stream:
+                sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
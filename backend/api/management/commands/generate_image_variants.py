@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.images import generate_variants
+from api.jobs import enqueue
+from api.models import ArticleModel, EventModel, Job, MentorModel, UserModel
+
+
+class Command(BaseCommand):
+    help = "Генерирует уменьшенные копии для уже загруженных изображений"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Пересоздать существующие копии")
+        parser.add_argument('--background', action='store_true', help="Поставить в фоновые задачи manage.py runworker")
+
+    def handle(self, *args, **options):
+        sources = [
+            (UserModel, 'photo'),
+            (MentorModel, 'photo'),
+            (EventModel, 'photo'),
+            (ArticleModel, 'image'),
+        ]
+
+        names = set()
+        for model, field in sources:
+            names.update(model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).values_list(field, flat=True))
+
+        if options['background']:
+            # Низкий приоритет: массовая догенерация не задерживает копии свежих загрузок
+            with transaction.atomic():
+                for name in sorted(names):
+                    enqueue('image_variants', {'name': name, 'force': options['force']}, priority=Job.LOW)
+            self.stdout.write(f"Queued {len(names)} images")
+            return
+
+        generated = 0
+        for name in sorted(names):
+            try:
+                generated += generate_variants(name, force=options['force'])
+            except Exception as e:
+                self.stderr.write(f"{name}: {e}")
+
+        self.stdout.write(f"Generated variants for {generated} of {len(names)} images")
@@ -0,0 +1,46 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.outbox import claim, deliver
+
+
+def deliver_in_thread(message):
+    try:
+        return deliver(message)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Отправляет уведомления из outbox: пул потоков, повторы с экспоненциальной задержкой"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.OUTBOX_WORKERS, help="Потоков отправки")
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE, help="Сообщений за один захват")
+        parser.add_argument('--poll-interval', type=float, default=settings.OUTBOX_POLL_INTERVAL, help="Пауза, когда очередь пуста, сек")
+        parser.add_argument('--once', action='store_true', help="Разобрать готовые сообщения и выйти")
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='outbox') as executor:
+            try:
+                while True:
+                    messages = claim(options['batch_size'])
+                    if not messages:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    for ok in executor.map(deliver_in_thread, messages):
+                        sent += ok
+                        failed += not ok
+            except KeyboardInterrupt:
+                pass
+
+        self.stdout.write(f"Sent {sent}, failed {failed}")
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from api import search
+from api.jobs import enqueue
+from api.models import Job
+
+
+class Command(BaseCommand):
+    help = "Пересобирает полнотекстовый индекс статей и мероприятий"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--background', action='store_true', help="Поставить в фоновые задачи manage.py runworker")
+
+    def handle(self, *args, **options):
+        if options['background']:
+            job = enqueue('search_index', priority=Job.LOW)
+            self.stdout.write(f"Queued job {job.pk}")
+            return
+
+        for kind, index in search.SEARCH_INDEXES.items():
+            model = apps.get_model(index['model'])
+            count = search.rebuild_index(kind, model.objects.all())
+            self.stdout.write(f"{kind}: indexed {count}")
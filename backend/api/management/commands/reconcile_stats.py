@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api import stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает счётчики дашборда с нуля и сообщает о расхождениях; запускается периодически (cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metric', dest='metrics', action='append', choices=[metric.name for metric in stats.METRICS],
+            help="Показатель для пересчёта, можно несколько раз; по умолчанию все",
+        )
+
+    def handle(self, *args, **options):
+        drift = stats.recompute(options['metrics'])
+
+        if not drift:
+            self.stdout.write("Counters are consistent")
+            return
+
+        for metric, changes in drift.items():
+            for key, (stored, actual) in sorted(changes.items()):
+                self.stdout.write(f"{metric}[{key}]: {stored} -> {actual}")
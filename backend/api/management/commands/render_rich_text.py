@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.models import ArticleModel, EventModel
+from api.rendering import render_queryset, schedule_embedded_variants
+
+
+class Command(BaseCommand):
+    help = "Заново готовит очищенный HTML, анонсы и время чтения статей и мероприятий"
+
+    def handle(self, *args, **options):
+        sources = [
+            (ArticleModel, 'text'),
+            (EventModel, 'description'),
+        ]
+
+        for model, field in sources:
+            count, images = render_queryset(model.objects.all(), field)
+            schedule_embedded_variants(images)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: rendered {count}")
@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from api.jobs import claim, purge, run
+
+
+PURGE_INTERVAL = 3600
+
+
+def run_in_thread(job):
+    try:
+        return run(job)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Выполняет фоновые задачи: процессы с пулом потоков, приоритеты, повторы с экспоненциальной задержкой"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.JOB_PROCESSES, help="Процессов воркера")
+        parser.add_argument('--threads', type=int, default=settings.JOB_THREADS, help="Потоков в каждом процессе")
+        parser.add_argument('--poll-interval', type=float, default=settings.JOB_POLL_INTERVAL, help="Пауза, когда очередь пуста, сек")
+        parser.add_argument('--once', action='store_true', help="Выполнить готовые задачи и выйти")
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            self.work(options)
+            return
+
+        # Соединения с базой не должны достаться дочерним процессам от родителя
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=self.work, args=(options,)) for _ in range(options['processes'])]
+        for process in processes:
+            process.start()
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Ctrl+C получает вся группа процессов, дочерние дорабатывают текущие задачи сами
+            for process in processes:
+                process.join()
+
+    def work(self, options):
+        done = failed = 0
+        next_purge = 0
+        running = set()
+
+        # Свободные потоки сразу получают новые задачи, долгая выгрузка не держит остальные
+        with ThreadPoolExecutor(max_workers=options['threads'], thread_name_prefix='jobs') as executor:
+            try:
+                while True:
+                    free = options['threads'] - len(running)
+                    for job in claim(free) if free else []:
+                        running.add(executor.submit(run_in_thread, job))
+
+                    if not running:
+                        if options['once']:
+                            break
+                        if time.monotonic() >= next_purge:
+                            purge()
+                            next_purge = time.monotonic() + PURGE_INTERVAL
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    finished, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        ok = future.result()
+                        done += ok
+                        failed += not ok
+            except KeyboardInterrupt:
+                pass
+
+        self.stdout.write(f"Worker {os.getpid()}: done {done}, failed {failed}")
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.test import override_settings
+
+
+PROFILES = ('default', 'production')
+
+
+def profile_settings(profile):
+    # (OPTIONS соединения, PRAGMA) для профиля из settings.py
+    if profile == 'production':
+        return dict(settings.SQLITE_PRODUCTION_OPTIONS), settings.SQLITE_PRODUCTION_PRAGMAS
+    return {}, {}
+
+
+def writer(alias, transactions, errors):
+    # Чтение и запись в одной транзакции: типичный случай, когда без IMMEDIATE
+    # повышение блокировки до записи падает с "database is locked"
+    connection = connections[alias]
+    try:
+        for index in range(transactions):
+            try:
+                with transaction.atomic(using=alias), connection.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM stress')
+                    cursor.execute('INSERT INTO stress (value) VALUES (%s)', [index])
+            except OperationalError:
+                errors.append(index)
+    finally:
+        connection.close()
+
+
+def run_stress(profile, threads=16, transactions=50):
+    # Отдельный файл базы и отдельный alias: рабочая база не затрагивается
+    options, pragmas = profile_settings(profile)
+    alias = f'sqlite_stress_{profile}'
+
+    with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PRAGMAS=pragmas):
+        connections.settings[alias] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(directory, 'stress.sqlite3'),
+            'OPTIONS': options,
+            'CONN_MAX_AGE': 0,
+        }
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('CREATE TABLE IF NOT EXISTS stress (id INTEGER PRIMARY KEY, value INTEGER)')
+                cursor.execute('DELETE FROM stress')
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+
+            errors = []
+            workers = [threading.Thread(target=writer, args=(alias, transactions, errors)) for _ in range(threads)]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM stress')
+                written = cursor.fetchone()[0]
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    return {
+        'profile': profile,
+        'journal_mode': journal_mode,
+        'transactions': threads * transactions,
+        'written': written,
+        'errors': len(errors),
+        'seconds': elapsed,
+    }
+
+
+class Command(BaseCommand):
+    help = "Нагружает SQLite параллельными транзакциями записи в профилях default и production"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=PROFILES, action='append', help="По умолчанию оба")
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--transactions', type=int, default=50, help="Транзакций на поток")
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError("The default database is not SQLite")
+
+        for profile in options['profile'] or PROFILES:
+            result = run_stress(profile, options['threads'], options['transactions'])
+            self.stdout.write(
+                f"{result['profile']:<10} journal_mode={result['journal_mode']:<7} "
+                f"written {result['written']}/{result['transactions']}, "
+                f"'database is locked' errors {result['errors']}, {result['seconds']:.2f}s"
+            )
@@ -0,0 +1,88 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.views.static import serve
+
+from .storage import CONTENT_ADDRESSED_NAME
+
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def read_range(fullpath, start, end):
+    with open(fullpath, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def partial_response(response, fullpath, header):
+    # Поддерживается один диапазон; для остальных форм Range отдаётся весь файл
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return response
+
+    size = os.path.getsize(fullpath)
+    start, end = match.groups()
+    # Диапазон вида bytes=5-3 синтаксически неверен: по RFC 9110 заголовок игнорируется
+    if start and end and int(start) > int(end):
+        return response
+
+    if start == '':
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    # 416 — только для невыполнимых: начало за концом файла или пустой суффикс bytes=-0
+    if start > end or start >= size:
+        response.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    ranged = StreamingHttpResponse(read_range(fullpath, start, end), status=206, content_type=response['Content-Type'])
+    ranged['Content-Range'] = f'bytes {start}-{end}/{size}'
+    ranged['Content-Length'] = str(end - start + 1)
+    if response.has_header('Last-Modified'):
+        ranged['Last-Modified'] = response['Last-Modified']
+
+    response.close()
+    return ranged
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = safe_join(document_root, path)
+
+    if settings.MEDIA_SERVING == 'x-accel':
+        # Файл отдаёт nginx из internal location, воркер только проверяет путь
+        if not os.path.isfile(fullpath):
+            raise Http404
+
+        content_type, _ = mimetypes.guess_type(fullpath)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+    else:
+        response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+
+        if response.status_code == 200 and os.path.isfile(fullpath):
+            response['Accept-Ranges'] = 'bytes'
+            if 'HTTP_RANGE' in request.META:
+                response = partial_response(response, fullpath, request.META['HTTP_RANGE'])
+
+    if response.status_code in (200, 206) and CONTENT_ADDRESSED_NAME.search(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+
+    return response
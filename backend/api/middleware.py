@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+
+
+class NonAPIMiddlewareMixin:
+    # Пропускает middleware для путей API: там аутентификация по токену,
+    # сессия и request.user из базы не нужны
+    def __call__(self, request):
+        if request.path_info.startswith(settings.STATELESS_API_PREFIX):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class NonAPISessionMiddleware(NonAPIMiddlewareMixin, SessionMiddleware):
+    pass
+
+
+class NonAPIAuthenticationMiddleware(NonAPIMiddlewareMixin, AuthenticationMiddleware):
+    pass
+
+
+class NonAPIMessageMiddleware(NonAPIMiddlewareMixin, MessageMiddleware):
+    pass
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_eventmodel_updated_at_meta_updated_at'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articlemodel',
+            name='title_en',
+            field=models.CharField(max_length=255, unique=True, verbose_name='Название (англ)'),
+        ),
+        migrations.AlterField(
+            model_name='eventmodel',
+            name='date',
+            field=models.DateField(db_index=True, verbose_name='Время мероприятия'),
+        ),
+        migrations.AddIndex(
+            model_name='mentormodel',
+            index=models.Index(fields=['status'], name='mentor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mentormodel',
+            index=models.Index(fields=['surname', 'name', 'patronymic'], name='mentor_full_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(fields=['status'], name='user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(fields=['surname', 'name', 'patronymic'], name='user_full_name_idx'),
+        ),
+    ]
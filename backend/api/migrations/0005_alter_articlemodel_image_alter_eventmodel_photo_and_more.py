@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:45
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_alter_articlemodel_title_en_alter_eventmodel_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articlemodel',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.ContentAddressedStorage(), upload_to='article_images/', verbose_name='Фотография'),
+        ),
+        migrations.AlterField(
+            model_name='eventmodel',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.ContentAddressedStorage(), upload_to='profile_photos/', verbose_name='Фотография'),
+        ),
+        migrations.AlterField(
+            model_name='mentormodel',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.ContentAddressedStorage(), upload_to='profile_photos/', verbose_name='Фотография'),
+        ),
+        migrations.AlterField(
+            model_name='usermodel',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.ContentAddressedStorage(), upload_to='profile_photos/', verbose_name='Фотография'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+import html
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+
+# Копия api.search на момент миграции: дальнейшие правки модуля не должны менять то,
+# что делает уже применённая миграция на новой базе
+SEARCH_INDEXES = {
+    'article': {
+        'table': 'api_articlesearch',
+        'source': 'api_articlemodel',
+        'model': 'api.ArticleModel',
+        'fields': ('title', 'text', 'author'),
+        'html_fields': ('text',),
+        'weights': ('A', 'C', 'B'),
+    },
+    'event': {
+        'table': 'api_eventsearch',
+        'source': 'api_eventmodel',
+        'model': 'api.EventModel',
+        'fields': ('title', 'description'),
+        'html_fields': ('description',),
+        'weights': ('A', 'C'),
+    },
+}
+
+SEARCH_CONFIG = 'simple'
+
+
+def strip_html(value):
+    if not value:
+        return ''
+    return ' '.join(html.unescape(strip_tags(value)).split())
+
+
+def insert_sql(index, vendor):
+    if vendor == 'sqlite':
+        return (
+            f"INSERT INTO {index['table']} (rowid, {', '.join(index['fields'])}) "
+            f"VALUES (%s, {', '.join(['%s'] * len(index['fields']))})"
+        )
+
+    document = ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), '{weight}')" for weight in index['weights']
+    )
+    return f"INSERT INTO {index['table']} (id, document) VALUES (%s, {document})"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        return
+
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {index['table']} "
+                    f"USING fts5({', '.join(index['fields'])}, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            else:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {index['table']} ("
+                    f"id bigint PRIMARY KEY REFERENCES {index['source']} (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                    f"document tsvector NOT NULL)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index['table']}_document ON {index['table']} USING GIN (document)"
+                )
+
+            sql = insert_sql(index, connection.vendor)
+            batch = []
+            for instance in apps.get_model(index['model']).objects.only('id', *index['fields']).iterator(chunk_size=1000):
+                batch.append([
+                    instance.pk,
+                    *(
+                        strip_html(getattr(instance, field)) if field in index['html_fields'] else (getattr(instance, field) or '')
+                        for field in index['fields']
+                    ),
+                ])
+                if len(batch) == 1000:
+                    cursor.executemany(sql, batch)
+                    batch = []
+
+            if batch:
+                cursor.executemany(sql, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        return
+
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {index['table']}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_alter_articlemodel_image_alter_eventmodel_photo_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,204 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:55
+
+import math
+import os
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+# Копия api.rendering на момент миграции: дальнейшие правки очистки HTML не должны
+# менять то, что делает уже применённая миграция на новой базе
+
+
+def variant_path(name, variant):
+    stem, _ = os.path.splitext(name)
+    return f'{settings.IMAGE_VARIANT_DIR}/{stem}_{variant}.webp'
+
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'em', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+    'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title', 'target', 'rel'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+URL_ATTRIBUTES = {'href', 'src'}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Содержимое этих тегов выбрасывается целиком, а не только разметка
+DROPPED_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript'}
+BLOCK_TAGS = {'p', 'br', 'li', 'tr', 'td', 'th', 'blockquote', 'pre', 'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+VARIANT_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def upload_name(url):
+    # Имя файла в хранилище для картинок, загруженных через ckeditor, иначе None
+    path = unquote(urlsplit(url).path)
+    prefix = settings.MEDIA_URL + settings.CKEDITOR_UPLOAD_PATH
+    if not path.startswith(prefix) or not path.lower().endswith(VARIANT_EXTENSIONS):
+        return None
+    return path[len(settings.MEDIA_URL):]
+
+
+def is_safe_url(url):
+    scheme = urlsplit(url.strip()).scheme.lower()
+    return scheme in ALLOWED_SCHEMES
+
+
+class RichTextRenderer(HTMLParser):
+    # Пропускает только разрешённые теги и атрибуты, попутно собирает текст и картинки
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.images = []
+        self.open_tags = []
+        self.dropped = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropped += 1
+            return
+        if self.dropped or tag not in ALLOWED_TAGS:
+            return
+
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        attrs = {name: value or '' for name, value in attrs if name in allowed}
+        for name in URL_ATTRIBUTES & attrs.keys():
+            if not is_safe_url(attrs[name]):
+                del attrs[name]
+
+        if tag == 'a' and attrs.get('target') == '_blank':
+            attrs['rel'] = 'noopener noreferrer'
+
+        if tag == 'img':
+            name = upload_name(attrs.get('src', ''))
+            if name:
+                self.images.append(name)
+                attrs['src'] = default_storage.url(variant_path(name, settings.RICH_TEXT_IMAGE_VARIANT))
+            attrs['loading'] = 'lazy'
+
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        self.html.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropped = max(0, self.dropped - 1)
+            return
+        if self.dropped or tag not in self.open_tags:
+            return
+
+        # Незакрытые вложенные теги закрываются, чтобы разметка осталась сбалансированной
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+    def handle_data(self, data):
+        if self.dropped:
+            return
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.html.append(f'</{self.open_tags.pop()}>')
+
+
+def render_rich_text(value):
+    renderer = RichTextRenderer()
+    renderer.feed(value or '')
+    renderer.close()
+
+    text = ' '.join(''.join(renderer.text).split())
+    words = len(text.split())
+
+    return {
+        'html': ''.join(renderer.html),
+        'excerpt': Truncator(text).words(settings.RICH_TEXT_EXCERPT_WORDS, truncate='…'),
+        'reading_time': math.ceil(words / settings.RICH_TEXT_WORDS_PER_MINUTE),
+        'images': renderer.images,
+    }
+
+
+def render_existing(apps, schema_editor):
+    # Уменьшенные копии встроенных картинок не заказываются: их догенерирует generate_image_variants
+    for model_name, source_field in (('ArticleModel', 'text'), ('EventModel', 'description')):
+        model = apps.get_model('api', model_name)
+        fields = [f'{source_field}_html', 'excerpt', 'reading_time']
+        batch = []
+
+        for instance in model.objects.only('id', source_field).iterator(chunk_size=500):
+            rendered = render_rich_text(getattr(instance, source_field))
+            setattr(instance, f'{source_field}_html', rendered['html'])
+            instance.excerpt = rendered['excerpt']
+            instance.reading_time = rendered['reading_time']
+            batch.append(instance)
+            if len(batch) == 500:
+                model.objects.bulk_update(batch, fields)
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlemodel',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='articlemodel',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.AddField(
+            model_name='articlemodel',
+            name='text_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Текст (очищенный HTML)'),
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Описание (очищенный HTML)'),
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+import re
+
+from django.db import migrations, models
+
+
+TRACKS = ("frontend", "backend", "ux_ui", "data_science", "mobile_development", "machine_learning")
+
+NUMBER = re.compile(r'-?\d+(?:[.,]\d+)?')
+
+
+def parse_score(value):
+    # "75", "75%", "7,5 из 10" -> первое число; нечисловые значения становятся NULL
+    match = NUMBER.search(value or '')
+    if match is None:
+        return None
+    return float(match.group().replace(',', '.'))
+
+
+def parse_scores(apps, schema_editor):
+    ResultModel = apps.get_model('api', 'ResultModel')
+
+    results = list(ResultModel.objects.only('id', *TRACKS))
+    for result in results:
+        for track in TRACKS:
+            setattr(result, f'{track}_score', parse_score(getattr(result, track)))
+
+    ResultModel.objects.bulk_update(results, [f'{track}_score' for track in TRACKS], batch_size=1000)
+
+
+def format_scores(apps, schema_editor):
+    ResultModel = apps.get_model('api', 'ResultModel')
+
+    results = list(ResultModel.objects.only('id', *[f'{track}_score' for track in TRACKS]))
+    for result in results:
+        for track in TRACKS:
+            value = getattr(result, f'{track}_score')
+            setattr(result, track, '' if value is None else f'{value:g}')
+
+    ResultModel.objects.bulk_update(results, list(TRACKS), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_rendered_rich_text'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name='resultmodel',
+                name=f'{track}_score',
+                field=models.FloatField(blank=True, null=True),
+            )
+            for track in TRACKS
+        ],
+        migrations.RunPython(parse_scores, format_scores),
+        # Значение по умолчанию нужно только для отката: без него старые колонки не вернуть
+        *[
+            migrations.AlterField(
+                model_name='resultmodel',
+                name=track,
+                field=models.CharField(max_length=255, default=''),
+            )
+            for track in TRACKS
+        ],
+        *[
+            migrations.RemoveField(
+                model_name='resultmodel',
+                name=track,
+            )
+            for track in TRACKS
+        ],
+        *[
+            migrations.RenameField(
+                model_name='resultmodel',
+                old_name=f'{track}_score',
+                new_name=track,
+            )
+            for track in TRACKS
+        ],
+    ]
@@ -0,0 +1,63 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate, TruncMonth
+
+
+# Копия показателей api.stats на момент миграции: (показатель, модель, выражение для GROUP BY)
+METRICS = [
+    ('users_by_status', 'UserModel', F('status')),
+    ('mentors_by_status', 'MentorModel', F('status')),
+    ('appointments_per_mentor', 'MentorAppointmentModel', F('mentor_id')),
+    ('contacts_per_day', 'ContactModel', TruncDate('created_at')),
+    ('events_per_month', 'EventModel', TruncMonth('date')),
+]
+
+
+def format_key(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def fill_counters(apps, schema_editor):
+    StatCounter = apps.get_model('api', 'StatCounter')
+
+    for metric, model_name, group in METRICS:
+        model = apps.get_model('api', model_name)
+        rows = model.objects.order_by().annotate(stat_key=group).values('stat_key').annotate(count=Count('pk'))
+        StatCounter.objects.bulk_create([
+            StatCounter(metric=metric, key=format_key(row['stat_key']), value=row['count']) for row in rows
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_resultmodel_numeric_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmodel',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Дата создания'),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=64, verbose_name='Показатель')),
+                ('key', models.CharField(blank=True, max_length=255, verbose_name='Ключ')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Значение')),
+            ],
+            options={
+                'verbose_name_plural': 'Статистика',
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='stat_counter_metric_key')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
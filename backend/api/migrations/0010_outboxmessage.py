@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_contactmodel_created_at_statcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=64, verbose_name='Событие')),
+                ('channel', models.CharField(max_length=32, verbose_name='Канал')),
+                ('payload', models.JSONField(verbose_name='Данные')),
+                ('status', models.CharField(choices=[('pending', 'ожидает отправки'), ('processing', 'отправляется'), ('sent', 'отправлено'), ('failed', 'не удалось отправить')], default='pending', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Попыток')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить не раньше')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занято воркером до')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+            ],
+            options={
+                'verbose_name_plural': 'Исходящие уведомления',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Владелец'),
+        ),
+    ]
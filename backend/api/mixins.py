@@ -0,0 +1,117 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .search import search_ids
+from .serializers import VariantsField
+
+
+class SparseFieldsMixin:
+    # ?fields=a,b и ?exclude=c сужают ответ GET и список колонок в SQL
+    def get_requested_fields(self):
+        fields = self.request.query_params.get('fields')
+        exclude = self.request.query_params.get('exclude')
+
+        fields = [name for name in fields.split(',') if name] if fields else None
+        exclude = [name for name in exclude.split(',') if name] if exclude else None
+        return fields, exclude
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            fields, exclude = self.get_requested_fields()
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('excluded_fields', exclude)
+
+        return super().get_serializer(*args, **kwargs)
+
+    def sparse_queryset(self, queryset):
+        fields, exclude = self.get_requested_fields()
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        # <поле>_variants считается из файла в колонке <поле>, её нельзя откладывать
+        sources = {
+            name: field.source_field
+            for name, field in self.get_serializer_class()._declared_fields.items()
+            if isinstance(field, VariantsField)
+        }
+
+        if fields:
+            selected = {sources.get(name, name) for name in fields}
+            return queryset.only('id', *[name for name in columns if name in selected])
+        if exclude:
+            kept = {source for name, source in sources.items() if name not in exclude}
+            return queryset.defer(*[name for name in exclude if name in columns and name != 'id' and name not in kept])
+        return queryset
+
+
+class ValuesListMixin(SparseFieldsMixin):
+    # Списки отдаются через лёгкий list_serializer_class, детальные запросы — через serializer_class
+    list_serializer_class = None
+    # ?q= ищет по индексу search_kind; search_fields — запасной icontains для других СУБД
+    search_kind = None
+    search_fields = ()
+
+    def search(self, queryset, query, offset, limit):
+        # Страница результатов по релевантности и признак, что за ней есть ещё.
+        # Берётся на одну строку больше, чтобы узнать о следующей странице без COUNT.
+        # Фильтры представления (category_id, title и т. п.) применяются внутри ранжирующего запроса
+        within = queryset if queryset.query.has_filters() else None
+        ids = search_ids(self.search_kind, query, limit + 1, offset, within=within)
+
+        if ids is None:
+            condition = reduce(or_, [Q(**{f'{name}__icontains': query}) for name in self.search_fields])
+            rows = list(queryset.filter(condition).order_by('id')[offset:offset + limit + 1])
+            return rows[:limit], len(rows) > limit
+
+        rows = {row['id']: row for row in queryset.filter(id__in=ids[:limit])}
+        return [rows[pk] for pk in ids[:limit] if pk in rows], len(ids) > limit
+
+    def search_links(self, offset, limit, has_next):
+        # Релевантность не монотонна по id, поэтому вместо курсора — ?offset=
+        url = self.request.build_absolute_uri()
+        next_link = replace_query_param(url, 'offset', offset + limit) if has_next else None
+
+        previous_link = None
+        if offset > 0:
+            previous_offset = max(offset - limit, 0)
+            previous_link = (
+                replace_query_param(url, 'offset', previous_offset) if previous_offset
+                else remove_query_param(url, 'offset')
+            )
+        return next_link, previous_link
+
+    def search_list(self, request, query, selected):
+        serializer_class = self.list_serializer_class
+        limit = self.paginator.get_page_size(request) if self.paginator else settings.API_MAX_PAGE_SIZE
+        try:
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+
+        queryset = serializer_class.prepare(self.filter_queryset(self.get_queryset()), selected)
+        rows, has_next = self.search(queryset, query, offset, limit)
+        data = serializer_class(rows, context=self.get_serializer_context(), fields=selected).data
+
+        next_link, previous_link = self.search_links(offset, limit, has_next)
+        return Response({"next": next_link, "previous": previous_link, "results": data})
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.list_serializer_class
+        selected = serializer_class.select(*self.get_requested_fields())
+        query = request.query_params.get('q', '').strip()
+
+        if self.search_kind and query:
+            return self.search_list(request, query, selected)
+
+        queryset = serializer_class.prepare(self.filter_queryset(self.get_queryset()), selected)
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = serializer_class(rows, context=self.get_serializer_context(), fields=selected).data
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -1,11 +1,19 @@
 import typing
-from django.db import models
+from django.db import connections, models, transaction
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group, Permission
+from django.core.serializers.json import DjangoJSONEncoder
 from ckeditor.fields import RichTextField
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from . import search
+from .cache import bump_version
+from .images import schedule_variants
+from .rendering import render_instance, schedule_embedded_variants
+from .storage import content_addressed_storage
+
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -24,15 +32,15 @@ class CustomUserManager(BaseUserManager):
 
 
 class ResultModel(models.Model):
-    max_length = 255
+    TRACKS: typing.Final = ("frontend", "backend", "ux_ui", "data_science", "mobile_development", "machine_learning")
 
     date = models.DateField(verbose_name='Время прохождения')
-    frontend = models.CharField(max_length=max_length)
-    backend = models.CharField(max_length=max_length)
-    ux_ui = models.CharField(max_length=max_length)
-    data_science = models.CharField(max_length=max_length)
-    mobile_development = models.CharField(max_length=max_length)
-    machine_learning = models.CharField(max_length=max_length) 
+    frontend = models.FloatField(null=True, blank=True)
+    backend = models.FloatField(null=True, blank=True)
+    ux_ui = models.FloatField(null=True, blank=True)
+    data_science = models.FloatField(null=True, blank=True)
+    mobile_development = models.FloatField(null=True, blank=True)
+    machine_learning = models.FloatField(null=True, blank=True)
 
     class Meta:
         verbose_name_plural = "Результаты"
@@ -52,7 +60,7 @@ class UserModel(AbstractUser):
     surname = models.CharField(max_length=max_length, verbose_name="Фамилия", null=True, blank=True)
     patronymic = models.CharField(max_length=max_length, verbose_name="Отчество", null=True, blank=True)
 
-    photo = models.ImageField(upload_to='profile_photos/', verbose_name='Фотография', null=True, blank=True)
+    photo = models.ImageField(upload_to='profile_photos/', storage=content_addressed_storage, verbose_name='Фотография', null=True, blank=True)
     telegram = models.CharField(max_length=max_length, verbose_name="Телеграм аккаунт", null=True, blank=True)
     status = models.CharField(max_length=max_length, verbose_name="Статус", choices=STATUS_VARIANTS, null=True, blank=True)
     about_me = models.TextField(verbose_name="Обо мне", null=True, blank=True)
@@ -70,6 +78,10 @@ class UserModel(AbstractUser):
     class Meta:
         ordering = ["surname", "name", "patronymic"]
         verbose_name_plural = "Пользователи"
+        indexes = [
+            models.Index(fields=["status"], name="user_status_idx"),
+            models.Index(fields=["surname", "name", "patronymic"], name="user_full_name_idx"),
+        ]
 
 
 class MentorModel(AbstractUser):
@@ -89,7 +101,7 @@ class MentorModel(AbstractUser):
     surname = models.CharField(max_length=max_length, verbose_name="Фамилия", null=True, blank=True)
     patronymic = models.CharField(max_length=max_length, verbose_name="Отчество", null=True, blank=True)
 
-    photo = models.ImageField(upload_to='profile_photos/', verbose_name='Фотография', null=True, blank=True)
+    photo = models.ImageField(upload_to='profile_photos/', storage=content_addressed_storage, verbose_name='Фотография', null=True, blank=True)
     telegram = models.CharField(max_length=max_length, verbose_name="Телеграм аккаунт", null=True, blank=True)
     status = models.CharField(max_length=max_length, verbose_name="Статус", choices=STATUS_VARIANTS, null=True, blank=True)
     about_me = models.TextField(verbose_name="Обо мне", null=True, blank=True)
@@ -105,6 +117,10 @@ class MentorModel(AbstractUser):
     class Meta:
         ordering = ["surname", "name", "patronymic"]
         verbose_name_plural = "Менторы"
+        indexes = [
+            models.Index(fields=["status"], name="mentor_status_idx"),
+            models.Index(fields=["surname", "name", "patronymic"], name="mentor_full_name_idx"),
+        ]
 
     groups = models.ManyToManyField(
         Group,
@@ -126,6 +142,7 @@ class Meta(models.Model):
     key = models.TextField(unique=True, verbose_name="Ключ (ссылка)")
     title = models.TextField(verbose_name="Заголовок")
     description = models.TextField(verbose_name="Описание")
+    updated_at = models.DateTimeField(verbose_name="Дата обновления", auto_now=True)
 
     class Meta:
         verbose_name = "Мета"
@@ -138,10 +155,14 @@ class Meta(models.Model):
 class EventModel(models.Model):
     max_length = 255
 
-    date = models.DateField(verbose_name='Время мероприятия')
+    date = models.DateField(verbose_name='Время мероприятия', db_index=True)
     title = models.CharField(verbose_name='Название', max_length=max_length)
     description = RichTextField(verbose_name='Описание')
-    photo = models.ImageField(upload_to='profile_photos/', verbose_name='Фотография', null=True, blank=True)
+    description_html = models.TextField(verbose_name='Описание (очищенный HTML)', blank=True, default='', editable=False)
+    excerpt = models.TextField(verbose_name='Анонс', blank=True, default='', editable=False)
+    reading_time = models.PositiveIntegerField(verbose_name='Время чтения, мин', default=0, editable=False)
+    photo = models.ImageField(upload_to='profile_photos/', storage=content_addressed_storage, verbose_name='Фотография', null=True, blank=True)
+    updated_at = models.DateTimeField(verbose_name="Дата обновления", auto_now=True)
     
     class Meta: 
         ordering = ["date"]
@@ -164,14 +185,17 @@ class ArticleModel(models.Model):
     max_length = 255
 
     title = models.CharField(max_length=max_length, verbose_name="Название")
-    title_en = models.CharField(max_length=max_length, verbose_name="Название (англ)")
+    title_en = models.CharField(max_length=max_length, verbose_name="Название (англ)", unique=True)
     text = RichTextField(verbose_name="Текст", null=True, blank=True)
+    text_html = models.TextField(verbose_name="Текст (очищенный HTML)", blank=True, default='', editable=False)
+    excerpt = models.TextField(verbose_name="Анонс", blank=True, default='', editable=False)
+    reading_time = models.PositiveIntegerField(verbose_name="Время чтения, мин", default=0, editable=False)
     author = models.CharField(max_length=max_length, verbose_name="Автор")
     created_at = models.DateTimeField(verbose_name="Дата создания", auto_now_add=True)
     updated_at = models.DateTimeField(verbose_name="Дата обновления", auto_now=True)
     categories = models.ManyToManyField(CategoryModel, verbose_name="Категории", blank=True)
 
-    image = models.ImageField(upload_to='article_images/', verbose_name='Фотография', null=True, blank=True)
+    image = models.ImageField(upload_to='article_images/', storage=content_addressed_storage, verbose_name='Фотография', null=True, blank=True)
 
     def __str__(self) -> str:
         return f"{self.title}"
@@ -186,6 +210,7 @@ class ContactModel(models.Model):
     mail = models.CharField(max_length=max_length, verbose_name='почта')
     telegram = models.CharField(max_length=max_length, verbose_name='telegram', null=True, blank=True)
     message = models.TextField(verbose_name="Сообщение")
+    created_at = models.DateTimeField(verbose_name="Дата создания", auto_now_add=True)
 
     def __str__(self) -> str:
         return f"{self.user}"
@@ -205,8 +230,211 @@ class MentorAppointmentModel(ContactModel):
         verbose_name_plural = "Записи к менторам"
 
 
+class StatCounter(models.Model):
+    # Счётчики для дашборда: поддерживаются сигналами, сверяются командой reconcile_stats
+    metric = models.CharField(max_length=64, verbose_name="Показатель")
+    key = models.CharField(max_length=255, verbose_name="Ключ", blank=True)
+    value = models.BigIntegerField(verbose_name="Значение", default=0)
+
+    class Meta:
+        verbose_name_plural = "Статистика"
+        constraints = [
+            models.UniqueConstraint(fields=["metric", "key"], name="stat_counter_metric_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}] = {self.value}"
+
+
+class OutboxMessage(models.Model):
+    # Уведомления пишутся в одной транзакции с заявкой и отправляются воркером process_outbox
+    PENDING = "pending"
+    PROCESSING = "processing"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_VARIANTS: typing.Final = (
+        (PENDING, "ожидает отправки"),
+        (PROCESSING, "отправляется"),
+        (SENT, "отправлено"),
+        (FAILED, "не удалось отправить"),
+    )
+
+    topic = models.CharField(max_length=64, verbose_name="Событие")
+    channel = models.CharField(max_length=32, verbose_name="Канал")
+    payload = models.JSONField(verbose_name="Данные")
+    status = models.CharField(max_length=16, choices=STATUS_VARIANTS, default=PENDING, verbose_name="Статус")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток")
+    available_at = models.DateTimeField(default=timezone.now, verbose_name="Отправить не раньше")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занято воркером до")
+    last_error = models.TextField(blank=True, default="", verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата отправки")
+
+    class Meta:
+        verbose_name_plural = "Исходящие уведомления"
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="outbox_status_available_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} via {self.channel} ({self.status})"
+
+
+class Job(models.Model):
+    # Фоновые задачи (уменьшенные копии, выгрузки, переиндексация) выполняет manage.py runworker
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    STATUS_VARIANTS: typing.Final = (
+        (QUEUED, "в очереди"),
+        (RUNNING, "выполняется"),
+        (SUCCEEDED, "выполнена"),
+        (FAILED, "не удалась"),
+    )
+
+    # Задачи с большим приоритетом забираются первыми
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+
+    name = models.CharField(max_length=64, verbose_name="Задача")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Аргументы")
+    priority = models.SmallIntegerField(default=NORMAL, verbose_name="Приоритет")
+    status = models.CharField(max_length=16, choices=STATUS_VARIANTS, default=QUEUED, verbose_name="Статус")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="Максимум попыток")
+    available_at = models.DateTimeField(default=timezone.now, verbose_name="Запустить не раньше")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занята воркером до")
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="Результат")
+    error = models.TextField(blank=True, default="", verbose_name="Последняя ошибка")
+    # "<модель>:<id>" поставившего задачу; токен бывает и у пользователя, и у ментора
+    owner = models.CharField(max_length=64, blank=True, default="", verbose_name="Владелец")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата запуска")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата завершения")
+
+    class Meta:
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            models.Index(fields=["status", "-priority", "available_at"], name="job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
 @receiver(post_save, sender=UserModel)
 def set_user_active(sender, instance, created, **kwargs):
     if created:
         instance.is_active = True
-        instance.save()
\ No newline at end of file
+        instance.save()
+
+
+@receiver([post_save, post_delete], sender=ArticleModel)
+@receiver(m2m_changed, sender=ArticleModel.categories.through)
+def invalidate_articles(sender, **kwargs):
+    # Версия поднимается после COMMIT: иначе GET между сигналом и коммитом закэширует
+    # старый ответ под новой версией, и он проживёт API_RESPONSE_CACHE_TIMEOUT
+    transaction.on_commit(lambda: bump_version('articles'))
+
+
+@receiver(m2m_changed, sender=ArticleModel.categories.through)
+def touch_articles_on_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Смена категорий не трогает auto_now, а от updated_at зависят ETag и Last-Modified
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        articles = ArticleModel.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        articles = ArticleModel.objects.filter(categories=instance)
+    else:
+        articles = ArticleModel.objects.filter(pk__in=pk_set)
+
+    articles.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=CategoryModel)
+def touch_articles_on_category_delete(sender, instance, **kwargs):
+    ArticleModel.objects.filter(categories=instance).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=EventModel)
+def invalidate_events(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('events'))
+
+
+@receiver([post_save, post_delete], sender=CategoryModel)
+def invalidate_categories(sender, **kwargs):
+    # Удаление категории каскадно убирает связи статей без m2m_changed
+    transaction.on_commit(lambda: (bump_version('categories'), bump_version('articles')))
+
+
+@receiver([post_save, post_delete], sender=ResultModel)
+def invalidate_results(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('results'))
+
+
+@receiver([post_save, post_delete], sender=Meta)
+def invalidate_meta(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version('meta'))
+
+
+def image_field_name(model):
+    return "image" if model is ArticleModel else "photo"
+
+
+@receiver(post_init, sender=UserModel)
+@receiver(post_init, sender=MentorModel)
+@receiver(post_init, sender=EventModel)
+@receiver(post_init, sender=ArticleModel)
+def remember_image_name(sender, instance, **kwargs):
+    # Имя файла на момент загрузки из базы. У новых объектов его нет, у отложенного через
+    # only()/defer() поля не читается, чтобы не делать лишний запрос
+    field_name = image_field_name(sender)
+    if instance.pk is not None and field_name not in instance.get_deferred_fields():
+        instance._saved_image_name = getattr(instance, field_name).name
+
+
+@receiver(post_save, sender=UserModel)
+@receiver(post_save, sender=MentorModel)
+@receiver(post_save, sender=EventModel)
+@receiver(post_save, sender=ArticleModel)
+def generate_image_variants(sender, instance, update_fields=None, **kwargs):
+    # Только когда файл действительно сменился: регистрация сохраняет пользователя трижды
+    field_name = image_field_name(sender)
+    if update_fields is not None and field_name not in update_fields:
+        return
+
+    name = getattr(instance, field_name).name
+    if hasattr(instance, '_saved_image_name') and instance._saved_image_name == name:
+        return
+
+    instance._saved_image_name = name
+    schedule_variants(name)
+
+
+@receiver(pre_save, sender=ArticleModel)
+@receiver(pre_save, sender=EventModel)
+def render_rich_text(sender, instance, update_fields=None, **kwargs):
+    # HTML очищается один раз при сохранении, а не на каждом показе
+    source_field = "text" if sender is ArticleModel else "description"
+    if update_fields is not None and source_field not in update_fields:
+        return
+
+    schedule_embedded_variants(render_instance(instance, source_field))
+
+
+@receiver(post_save, sender=ArticleModel)
+@receiver(post_save, sender=EventModel)
+def update_search_index(sender, instance, using, **kwargs):
+    search.update_index('article' if sender is ArticleModel else 'event', instance, connections[using])
+
+
+@receiver(post_delete, sender=ArticleModel)
+@receiver(post_delete, sender=EventModel)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    search.remove_from_index('article' if sender is ArticleModel else 'event', instance.pk, connections[using])
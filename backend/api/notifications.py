@@ -0,0 +1,71 @@
+import json
+import urllib.request
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+
+def describe(topic, payload):
+    if topic == 'appointment.created':
+        subject = "Новая запись к ментору"
+        lines = [payload['description'], payload['message']]
+    else:
+        subject = "Новое сообщение"
+        lines = [payload['message']]
+
+    contacts = [f"Почта: {payload['mail']}"]
+    if payload.get('telegram'):
+        contacts.append(f"Telegram: {payload['telegram']}")
+
+    return subject, "\n\n".join(line for line in lines + ["\n".join(contacts)] if line)
+
+
+class BaseNotifier:
+    # send() бросает исключение, если уведомление нужно повторить позже
+    def send(self, topic, payload):
+        raise NotImplementedError
+
+
+class EmailNotifier(BaseNotifier):
+    # Запись уходит ментору на почту, сообщения — на адреса из CONTACT_NOTIFY_EMAILS
+    def recipients(self, topic, payload):
+        if topic == 'appointment.created':
+            return [payload['mentor_email']] if payload.get('mentor_email') else []
+        return list(settings.CONTACT_NOTIFY_EMAILS)
+
+    def send(self, topic, payload):
+        recipients = self.recipients(topic, payload)
+        if not recipients:
+            return
+
+        subject, body = describe(topic, payload)
+        send_mail(subject, body, None, recipients, fail_silently=False)
+
+
+class TelegramNotifier(BaseNotifier):
+    # Бот не может написать пользователю по @username, пока тот сам не начал диалог,
+    # поэтому уведомления уходят в служебный чат TELEGRAM_CHAT_ID, с упоминанием ментора
+    def send(self, topic, payload):
+        subject, body = describe(topic, payload)
+        if payload.get('mentor_telegram'):
+            body = f"Ментор: {payload['mentor_telegram']}\n\n{body}"
+
+        request = urllib.request.Request(
+            f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage",
+            data=json.dumps({'chat_id': settings.TELEGRAM_CHAT_ID, 'text': f"{subject}\n\n{body}"}).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request, timeout=settings.TELEGRAM_TIMEOUT) as response:
+            result = json.load(response)
+
+        if not result.get('ok'):
+            raise RuntimeError(result.get('description', 'Telegram API error'))
+
+
+# Заглушка для тестов и локального запуска: складывает уведомления в список, как mail.outbox
+sent = []
+
+
+class LocMemNotifier(BaseNotifier):
+    def send(self, topic, payload):
+        sent.append((topic, payload))
@@ -0,0 +1,126 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ContactModel, MentorAppointmentModel, OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def submission_payload(instance):
+    payload = {
+        'id': instance.pk,
+        'user': instance.user_id,
+        'mail': instance.mail,
+        'telegram': instance.telegram,
+        'message': instance.message,
+    }
+
+    if isinstance(instance, MentorAppointmentModel):
+        mentor = instance.mentor
+        payload.update({
+            'description': instance.description,
+            'mentor': mentor.pk,
+            'mentor_email': mentor.email,
+            'mentor_telegram': mentor.telegram,
+        })
+
+    return payload
+
+
+def enqueue(topic, payload):
+    # По строке на канал: каналы повторяются и падают независимо друг от друга
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage(topic=topic, channel=channel, payload=payload)
+        for channel in settings.OUTBOX_NOTIFIERS
+    ])
+
+
+@receiver(post_save, sender=ContactModel)
+@receiver(post_save, sender=MentorAppointmentModel)
+def enqueue_submission(sender, instance, created, raw=False, **kwargs):
+    # Для записи к ментору post_save приходит только с дочерней моделью, так что событие одно
+    if not created or raw:
+        return
+
+    topic = 'appointment.created' if sender is MentorAppointmentModel else 'contact.created'
+    enqueue(topic, submission_payload(instance))
+
+
+def get_notifier(channel):
+    return import_string(settings.OUTBOX_NOTIFIERS[channel])()
+
+
+def claim(batch_size, now=None):
+    # Берём готовые к отправке сообщения и сообщения, чья аренда у упавшего воркера истекла.
+    # В PostgreSQL параллельные воркеры не мешают друг другу благодаря SKIP LOCKED,
+    # в SQLite транзакции записи и так выполняются по одной.
+    # Попытка засчитывается при захвате, как у фоновых задач: сообщение, на котором воркер
+    # зависает или падает, после OUTBOX_MAX_ATTEMPTS переходит в FAILED
+    now = now or timezone.now()
+    expired = Q(status=OutboxMessage.PROCESSING, locked_until__lt=now)
+
+    with transaction.atomic():
+        OutboxMessage.objects.filter(expired, attempts__gte=settings.OUTBOX_MAX_ATTEMPTS).update(
+            status=OutboxMessage.FAILED, locked_until=None, last_error="Lease expired",
+        )
+
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=OutboxMessage.PENDING, available_at__lte=now) | expired)
+            .order_by('available_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(
+            status=OutboxMessage.PROCESSING,
+            attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+        )
+
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('available_at', 'id'))
+
+
+def backoff(attempts):
+    # Экспоненциальная задержка с разбросом, чтобы повторы не приходили пачкой
+    delay = min(settings.OUTBOX_BACKOFF_MAX_SECONDS, settings.OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def deliver(message):
+    # Обновления ограничены номером попытки: если аренда истекла и сообщение захватил
+    # другой воркер, результат этого воркера уже не записывается
+    current = OutboxMessage.objects.filter(pk=message.pk, attempts=message.attempts)
+
+    try:
+        get_notifier(message.channel).send(message.topic, message.payload)
+    except Exception as e:
+        failed = message.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+        logger.warning(
+            "Outbox message %s (%s via %s) failed, attempt %s: %s",
+            message.pk, message.topic, message.channel, message.attempts, e,
+        )
+
+        current.update(
+            status=OutboxMessage.FAILED if failed else OutboxMessage.PENDING,
+            available_at=timezone.now() + backoff(message.attempts),
+            locked_until=None,
+            last_error=f"{type(e).__name__}: {e}",
+        )
+        return False
+
+    current.update(
+        status=OutboxMessage.SENT,
+        locked_until=None,
+        sent_at=timezone.now(),
+        last_error="",
+    )
+    return True
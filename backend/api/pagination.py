@@ -0,0 +1,16 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    # Курсор строится по первичному ключу: индекс есть всегда, порядок стабилен
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    unpaginated_query_param = 'all'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.unpaginated_query_param) in ('1', 'true', 'True'):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,49 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+# Пакетные парсеры читают поток сами: JSONParser из DRF идёт через request.body,
+# который ограничен DATA_UPLOAD_MAX_MEMORY_SIZE, а для импорта нужен свой лимит
+def read_limited(stream, limit):
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        raise ParseError(f"Request body is larger than {limit} bytes")
+    return data
+
+
+class BulkJSONParser(BaseParser):
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            return json.loads(read_limited(stream, settings.API_BULK_MAX_BODY_SIZE).decode(encoding))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ParseError(f"JSON parse error - {e}")
+
+
+class NDJSONParser(BaseParser):
+    # Один JSON-объект на строку; пустые строки пропускаются
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        data = read_limited(stream, settings.API_BULK_MAX_BODY_SIZE)
+
+        rows = []
+        for number, line in enumerate(data.splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line.decode(encoding)))
+            except (ValueError, UnicodeDecodeError) as e:
+                raise ParseError(f"NDJSON parse error on line {number} - {e}")
+
+        return rows
@@ -0,0 +1,181 @@
+import html
+import re
+
+from django.db import connection as default_connection, transaction
+from django.utils.html import strip_tags
+
+
+# Поисковые индексы живут в отдельных таблицах с тем же id, что и у записи:
+# в SQLite это виртуальные таблицы FTS5, в PostgreSQL — tsvector с GIN-индексом
+SEARCH_INDEXES = {
+    'article': {
+        'table': 'api_articlesearch',
+        'source': 'api_articlemodel',
+        'model': 'api.ArticleModel',
+        'fields': ('title', 'text', 'author'),
+        'html_fields': ('text',),
+        'weights': ('A', 'C', 'B'),
+        'bm25': (10.0, 1.0, 5.0),
+    },
+    'event': {
+        'table': 'api_eventsearch',
+        'source': 'api_eventmodel',
+        'model': 'api.EventModel',
+        'fields': ('title', 'description'),
+        'html_fields': ('description',),
+        'weights': ('A', 'C'),
+        'bm25': (10.0, 1.0),
+    },
+}
+
+SEARCH_CONFIG = 'simple'
+
+WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def strip_html(value):
+    if not value:
+        return ''
+    return ' '.join(html.unescape(strip_tags(value)).split())
+
+
+def is_supported(connection=default_connection):
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def create_index_tables(connection):
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {index['table']} "
+                    f"USING fts5({', '.join(index['fields'])}, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {index['table']} ("
+                    f"id bigint PRIMARY KEY REFERENCES {index['source']} (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                    f"document tsvector NOT NULL)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index['table']}_document ON {index['table']} USING GIN (document)"
+                )
+
+
+def drop_index_tables(connection):
+    if not is_supported(connection):
+        return
+
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {index['table']}")
+
+
+def index_values(kind, instance):
+    index = SEARCH_INDEXES[kind]
+    return [
+        strip_html(getattr(instance, field)) if field in index['html_fields'] else (getattr(instance, field) or '')
+        for field in index['fields']
+    ]
+
+
+def insert_sql(kind, connection):
+    index = SEARCH_INDEXES[kind]
+
+    if connection.vendor == 'sqlite':
+        return (
+            f"INSERT INTO {index['table']} (rowid, {', '.join(index['fields'])}) "
+            f"VALUES (%s, {', '.join(['%s'] * len(index['fields']))})"
+        )
+
+    document = ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), '{weight}')" for weight in index['weights']
+    )
+    return (
+        f"INSERT INTO {index['table']} (id, document) VALUES (%s, {document}) "
+        f"ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document"
+    )
+
+
+def update_index(kind, instance, connection=default_connection):
+    if not is_supported(connection):
+        return
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # FTS5 не поддерживает upsert
+            cursor.execute(f"DELETE FROM {SEARCH_INDEXES[kind]['table']} WHERE rowid = %s", [instance.pk])
+        cursor.execute(insert_sql(kind, connection), [instance.pk, *index_values(kind, instance)])
+
+
+def remove_from_index(kind, pk, connection=default_connection):
+    if not is_supported(connection):
+        return
+
+    index = SEARCH_INDEXES[kind]
+    column = 'rowid' if connection.vendor == 'sqlite' else 'id'
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {index['table']} WHERE {column} = %s", [pk])
+
+
+def rebuild_index(kind, queryset, connection=default_connection, batch_size=1000):
+    if not is_supported(connection):
+        return 0
+
+    sql = insert_sql(kind, connection)
+    fields = SEARCH_INDEXES[kind]['fields']
+    count = 0
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_INDEXES[kind]['table']}")
+
+        batch = []
+        for instance in queryset.only('id', *fields).iterator(chunk_size=batch_size):
+            batch.append([instance.pk, *index_values(kind, instance)])
+            if len(batch) == batch_size:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            cursor.executemany(sql, batch)
+            count += len(batch)
+
+    return count
+
+
+def search_ids(kind, query, limit, offset=0, connection=default_connection, within=None):
+    # id по убыванию релевантности; None — если база не поддерживает полнотекстовый поиск.
+    # within — queryset с фильтрами представления: ранжирование и OFFSET/LIMIT идут уже по отфильтрованным
+    if not is_supported(connection):
+        return None
+
+    words = WORD.findall(query)
+    if not words:
+        return []
+
+    index = SEARCH_INDEXES[kind]
+    where, where_params = '', []
+    if within is not None:
+        subquery, where_params = within.order_by().values('id').query.sql_with_params()
+        # В SQLite "+rowid": иначе IN передаётся в FTS5 и MATCH выполняется заново на каждый id списка
+        where = f" AND {'+rowid' if connection.vendor == 'sqlite' else 'id'} IN ({subquery})"
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # Каждое слово в кавычках, чтобы ввод пользователя не разбирался как синтаксис FTS5
+            match = ' '.join(f'"{word}"*' for word in words)
+            weights = ', '.join(str(weight) for weight in index['bm25'])
+            cursor.execute(
+                f"SELECT rowid FROM {index['table']} WHERE {index['table']} MATCH %s{where} "
+                f"ORDER BY bm25({index['table']}, {weights}), rowid LIMIT %s OFFSET %s",
+                [match, *where_params, limit, offset],
+            )
+        else:
+            tsquery = ' & '.join(f"{word}:*" for word in words)
+            cursor.execute(
+                f"SELECT id FROM {index['table']} WHERE document @@ to_tsquery('{SEARCH_CONFIG}', %s){where} "
+                f"ORDER BY ts_rank(document, to_tsquery('{SEARCH_CONFIG}', %s)) DESC, id LIMIT %s OFFSET %s",
+                [tsquery, *where_params, tsquery, limit, offset],
+            )
+        return [row[0] for row in cursor.fetchall()]
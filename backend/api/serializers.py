@@ -8,11 +8,59 @@ from .models import (
     CategoryModel,
     EventModel,
     Meta,
-    MentorModel
+    MentorModel,
+    Job,
 )
 from django.contrib.auth.password_validation import validate_password
+from django.core.files.storage import default_storage
+from django.urls import reverse
 from rest_framework.exceptions import ValidationError
 
+from .images import variant_paths
+
+
+def media_url(name, request=None):
+    if not name:
+        return None
+
+    url = default_storage.url(name)
+    if request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
+def variant_urls(name, request=None):
+    if not name:
+        return None
+
+    return {variant: media_url(path, request) for variant, path in variant_paths(name).items()}
+
+
+class VariantsField(serializers.SerializerMethodField):
+    # URL уменьшенных копий изображения из поля source_field
+    def __init__(self, source_field, **kwargs):
+        self.source_field = source_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        file = getattr(instance, self.source_field)
+        return variant_urls(file.name, self.context.get('request'))
+
+
+class SparseFieldsSerializerMixin:
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        excluded_fields = kwargs.pop('excluded_fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for field_name in set(self.fields) - set(fields) - {'id'}:
+                self.fields.pop(field_name)
+
+        if excluded_fields:
+            for field_name in excluded_fields:
+                self.fields.pop(field_name, None)
+
 
 class MetaSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,10 +68,34 @@ class MetaSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class UserSerializer(serializers.ModelSerializer):
+class JobSerializer(serializers.ModelSerializer):
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        exclude = ('locked_until', 'owner')
+
+    def get_download(self, job):
+        # Ссылка на файл выгрузки; сам файл лежит в закрытом хранилище
+        if job.status != Job.SUCCEEDED or not (job.result or {}).get('file'):
+            return None
+
+        url = reverse('jobs-file', kwargs={'pk': job.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+PRIVILEGE_FIELDS = ('is_superuser', 'is_staff', 'groups', 'user_permissions')
+
+
+class UserSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    photo_variants = VariantsField('photo')
+
     class Meta:
         model = UserModel
-        fields = '__all__'
+        # Регистрация открыта всем: права выдаются только через админку и в ответах не показываются
+        exclude = PRIVILEGE_FIELDS
+        extra_kwargs = {'password': {'write_only': True}}
 
     def validate_password(self, value):
         try:
@@ -33,19 +105,15 @@ class UserSerializer(serializers.ModelSerializer):
 
         return value
 
-    def __init__(self, *args, **kwargs):
-        excluded_fields = kwargs.pop('excluded_fields', None)
-        super(UserSerializer, self).__init__(*args, **kwargs)
-
-        if excluded_fields:
-            for field_name in excluded_fields:
-                self.fields.pop(field_name)
 
+class MentorSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    photo_variants = VariantsField('photo')
 
-class MentorSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserModel
-        fields = '__all__'
+        # Регистрация открыта всем: права выдаются только через админку и в ответах не показываются
+        exclude = PRIVILEGE_FIELDS
+        extra_kwargs = {'password': {'write_only': True}}
 
     def validate_password(self, value):
         try:
@@ -55,63 +123,193 @@ class MentorSerializer(serializers.ModelSerializer):
 
         return value
 
-    def __init__(self, *args, **kwargs):
-        excluded_fields = kwargs.pop('excluded_fields', None)
-        super(MentorSerializer, self).__init__(*args, **kwargs)
 
-        if excluded_fields:
-            for field_name in excluded_fields:
-                self.fields.pop(field_name)
-
-
-class ResultSerializer(serializers.ModelSerializer):
+class ResultSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ResultModel
         fields = '__all__'
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = CategoryModel
         fields = '__all__'
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    image_variants = VariantsField('image')
+
     class Meta:
         model = ArticleModel
         fields = '__all__'
 
-    def __init__(self, *args, **kwargs):
-        excluded_fields = kwargs.pop('excluded_fields', None)
-        super(ArticleSerializer, self).__init__(*args, **kwargs)
-
-        if excluded_fields:
-            for field_name in excluded_fields:
-                self.fields.pop(field_name)
-
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ContactModel
         fields = '__all__'
 
 
-class MentorAppointmentSerializer(serializers.ModelSerializer):
+class MentorAppointmentSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = MentorAppointmentModel
         fields = '__all__'
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     date = serializers.DateField(format="%d-%m-%y")
+    photo_variants = VariantsField('photo')
+
     class Meta:
         model = EventModel
         fields = '__all__'
 
-    def __init__(self, *args, **kwargs):
-        excluded_fields = kwargs.pop('excluded_fields', None)
-        super(EventSerializer, self).__init__(*args, **kwargs)
 
-        if excluded_fields:
-            for field_name in excluded_fields:
-                self.fields.pop(field_name)
\ No newline at end of file
+class ValuesSerializer:
+    # Сериализация списков из .values(): без экземпляров моделей и полей DRF на каждую строку
+    fields = ()
+    extra_fields = ()
+    media_fields = ()
+    # Тяжёлые колонки, которые выбираются только по явному ?fields=
+    optional_fields = ()
+    formatters = {}
+
+    def __init__(self, rows, context=None, fields=None):
+        self.rows = rows
+        self.context = context or {}
+        self.selected = fields if fields is not None else self.all_fields()
+
+    @classmethod
+    def all_fields(cls):
+        # Для каждого файла добавляется <поле>_variants с уменьшенными копиями
+        return cls.fields + cls.extra_fields + tuple(f'{name}_variants' for name in cls.media_fields)
+
+    @classmethod
+    def select(cls, fields=None, exclude=None):
+        # id нужен курсорной пагинации, поэтому остаётся всегда
+        selected = cls.all_fields()
+        if fields:
+            selected = tuple(name for name in selected + cls.optional_fields if name in fields or name == 'id')
+        if exclude:
+            selected = tuple(name for name in selected if name not in exclude or name == 'id')
+        return selected
+
+    @classmethod
+    def prepare(cls, queryset, selected=None):
+        selected = selected if selected is not None else cls.all_fields()
+        columns = [
+            name for name in cls.fields + cls.optional_fields
+            if name in selected or (name in cls.media_fields and f'{name}_variants' in selected)
+        ]
+        return queryset.prefetch_related(None).values(*columns)
+
+    def media_url(self, name):
+        return media_url(name, self.context.get('request'))
+
+    def extend(self, rows):
+        pass
+
+    async def aextend(self, rows):
+        pass
+
+    @property
+    def data(self):
+        rows = self.format(list(self.rows))
+        self.extend(rows)
+        return rows
+
+    async def adata(self):
+        # Для async-представлений: строки уже выбраны, дополнительные запросы идут через async ORM
+        rows = self.format(list(self.rows))
+        await self.aextend(rows)
+        return rows
+
+    def format(self, rows):
+        media_fields = [
+            (name, name in self.selected, f'{name}_variants' in self.selected)
+            for name in self.media_fields
+        ]
+        formatters = [(name, formatter) for name, formatter in self.formatters.items() if name in self.selected]
+
+        for row in rows:
+            for field_name, with_url, with_variants in media_fields:
+                if not (with_url or with_variants):
+                    continue
+
+                name = row.pop(field_name)
+                if with_url:
+                    row[field_name] = self.media_url(name)
+                if with_variants:
+                    row[f'{field_name}_variants'] = variant_urls(name, self.context.get('request'))
+            for field_name, formatter in formatters:
+                if row[field_name] is not None:
+                    row[field_name] = formatter(row[field_name])
+
+        return rows
+
+
+class UserListSerializer(ValuesSerializer):
+    fields = ('id', 'username', 'email', 'name', 'surname', 'patronymic', 'photo', 'telegram', 'status', 'about_me', 'result')
+    media_fields = ('photo',)
+
+
+class MentorListSerializer(ValuesSerializer):
+    fields = ('id', 'username', 'email', 'name', 'surname', 'patronymic', 'photo', 'telegram', 'status', 'about_me')
+    media_fields = ('photo',)
+
+
+class ResultListSerializer(ValuesSerializer):
+    fields = ('id', 'date', 'frontend', 'backend', 'ux_ui', 'data_science', 'mobile_development', 'machine_learning')
+
+
+class ArticleListSerializer(ValuesSerializer):
+    fields = ('id', 'title', 'title_en', 'excerpt', 'reading_time', 'author', 'created_at', 'updated_at', 'image')
+    extra_fields = ('categories',)
+    media_fields = ('image',)
+    optional_fields = ('text', 'text_html')
+
+    def category_links(self, rows):
+        return ArticleModel.categories.through.objects.filter(
+            articlemodel_id__in=[row['id'] for row in rows]
+        ).values_list('articlemodel_id', 'categorymodel_id')
+
+    def attach_categories(self, rows, links):
+        categories = {row['id']: [] for row in rows}
+        for article_id, category_id in links:
+            categories[article_id].append(category_id)
+
+        for row in rows:
+            row['categories'] = categories[row['id']]
+
+    def extend(self, rows):
+        if 'categories' in self.selected:
+            self.attach_categories(rows, self.category_links(rows))
+
+    async def aextend(self, rows):
+        if 'categories' in self.selected:
+            self.attach_categories(rows, [link async for link in self.category_links(rows)])
+
+
+class CategoryListSerializer(ValuesSerializer):
+    fields = ('id', 'title')
+
+
+class MetaListSerializer(ValuesSerializer):
+    fields = ('id', 'key', 'title', 'description', 'updated_at')
+
+
+class ContactListSerializer(ValuesSerializer):
+    fields = ('id', 'user', 'mail', 'telegram', 'message')
+
+
+class MentorAppointmentListSerializer(ValuesSerializer):
+    fields = ('id', 'user', 'mail', 'telegram', 'message', 'mentor', 'description')
+
+
+class EventListSerializer(ValuesSerializer):
+    fields = ('id', 'date', 'title', 'excerpt', 'reading_time', 'photo', 'updated_at')
+    media_fields = ('photo',)
+    optional_fields = ('description', 'description_html')
+    formatters = {
+        'date': lambda value: value.strftime("%d-%m-%y"),
+    }
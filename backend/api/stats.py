@@ -0,0 +1,208 @@
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate, TruncMonth
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ContactModel, EventModel, MentorAppointmentModel, MentorModel, StatCounter, UserModel
+
+
+class Metric:
+    # key — ключ счётчика для экземпляра, group — выражение для пересчёта через GROUP BY,
+    # fields — поля (attname), от которых зависит ключ.
+    # delete_models — модели, по сигналам удаления которых счётчик уменьшается
+    def __init__(self, name, models, key, group, fields, delete_models=None):
+        self.name = name
+        self.models = models
+        self.delete_models = delete_models or models
+        self.key = key
+        self.group = group
+        self.fields = set(fields)
+
+    def recompute(self, apps=global_apps):
+        # Источник — первая модель; через apps пересчёт работает и в миграциях
+        model = apps.get_model(self.models[0]._meta.label)
+        rows = model.objects.order_by().annotate(stat_key=self.group).values('stat_key').annotate(count=Count('pk'))
+        return {format_key(row['stat_key']): row['count'] for row in rows}
+
+
+def format_key(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def contact_day(contact):
+    # До сохранения и перечитывания поле может быть строкой из create(created_at='...')
+    created_at = contact.created_at
+    if isinstance(created_at, str):
+        created_at = parse_datetime(created_at)
+        if created_at and timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+    return format_key(timezone.localdate(created_at) if created_at else None)
+
+
+def event_month(event):
+    date = event.date
+    if isinstance(date, str):
+        date = parse_date(date)
+    return format_key(date.replace(day=1) if date else None)
+
+
+METRICS = [
+    Metric(
+        'users_by_status', [UserModel],
+        lambda user: user.status or '', F('status'), ['status'],
+    ),
+    Metric(
+        'mentors_by_status', [MentorModel],
+        lambda mentor: mentor.status or '', F('status'), ['status'],
+    ),
+    Metric(
+        'appointments_per_mentor', [MentorAppointmentModel],
+        lambda appointment: format_key(appointment.mentor_id), F('mentor_id'), ['mentor_id'],
+    ),
+    # Запись к ментору — наследник ContactModel, поэтому тоже считается сообщением. post_save
+    # приходит только для дочерней модели, а post_delete — для обеих, поэтому при удалении
+    # учитывается только родительская
+    Metric(
+        'contacts_per_day', [ContactModel, MentorAppointmentModel],
+        contact_day, TruncDate('created_at'), ['created_at'],
+        delete_models=[ContactModel],
+    ),
+    Metric(
+        'events_per_month', [EventModel],
+        event_month, TruncMonth('date'), ['date'],
+    ),
+]
+
+
+def add(metric, key, delta):
+    if not delta:
+        return
+
+    updated = StatCounter.objects.filter(metric=metric, key=key).update(value=F('value') + delta)
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            StatCounter.objects.create(metric=metric, key=key, value=delta)
+    except IntegrityError:
+        # Строку успел создать параллельный запрос
+        StatCounter.objects.filter(metric=metric, key=key).update(value=F('value') + delta)
+
+
+def metrics_for(model):
+    return [metric for metric in METRICS if model in metric.models]
+
+
+def saved_metrics(sender, update_fields):
+    # save(update_fields=...) без полей ключа счётчики не трогает
+    metrics = metrics_for(sender)
+    if update_fields is None:
+        return metrics
+
+    attnames = {sender._meta.get_field(name).attname for name in update_fields}
+    return [metric for metric in metrics if metric.fields & attnames]
+
+
+def remember_loaded_keys(sender, instance, **kwargs):
+    # Старые ключи нужны, чтобы при смене статуса перенести единицу между счётчиками.
+    # Запоминаются при загрузке из базы, чтобы pre_save не перечитывал строку.
+    # Отложенные поля пропускаются: их чтение стоило бы запроса на каждый экземпляр
+    if instance.pk is None:
+        return
+
+    deferred = instance.get_deferred_fields()
+    instance._stat_keys = {
+        metric.name: metric.key(instance) for metric in metrics_for(sender) if not metric.fields & deferred
+    }
+
+
+def remember_keys(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    # Экземпляр, созданный с pk, а не загруженный, ключей из базы не знает
+    known = {} if instance._state.adding else getattr(instance, '_stat_keys', {})
+    missing = [metric for metric in saved_metrics(sender, update_fields) if metric.name not in known]
+    if not missing:
+        return
+
+    old = sender.objects.filter(pk=instance.pk).first()
+    instance._stat_keys = {
+        **known, **({metric.name: metric.key(old) for metric in missing} if old is not None else {}),
+    }
+
+
+def count_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    old_keys = getattr(instance, '_stat_keys', {})
+    new_keys = dict(old_keys)
+    for metric in saved_metrics(sender, None if created else update_fields):
+        key = metric.key(instance)
+        old_key = old_keys.get(metric.name)
+        new_keys[metric.name] = key
+
+        if created or old_key is None:
+            add(metric.name, key, 1)
+        elif old_key != key:
+            add(metric.name, old_key, -1)
+            add(metric.name, key, 1)
+
+    # Следующее сохранение того же экземпляра (например, в set_user_active) сравнивает с этими ключами
+    instance._stat_keys = new_keys
+
+
+def count_deleted(sender, instance, **kwargs):
+    for metric in METRICS:
+        if sender in metric.delete_models:
+            add(metric.name, metric.key(instance), -1)
+
+
+for tracked_model in {model for metric in METRICS for model in metric.models + metric.delete_models}:
+    post_init.connect(remember_loaded_keys, sender=tracked_model, dispatch_uid=f'stats-post-init-{tracked_model.__name__}')
+    pre_save.connect(remember_keys, sender=tracked_model, dispatch_uid=f'stats-pre-save-{tracked_model.__name__}')
+    post_save.connect(count_saved, sender=tracked_model, dispatch_uid=f'stats-post-save-{tracked_model.__name__}')
+    post_delete.connect(count_deleted, sender=tracked_model, dispatch_uid=f'stats-post-delete-{tracked_model.__name__}')
+
+
+def recompute(metrics=None, apps=global_apps):
+    # Полный пересчёт; возвращает расхождения {показатель: {ключ: (было, стало)}}
+    metrics = [metric for metric in METRICS if metrics is None or metric.name in metrics]
+    StatCounter = apps.get_model('api', 'StatCounter')
+    drift = {}
+
+    with transaction.atomic():
+        for metric in metrics:
+            actual = metric.recompute(apps)
+            stored = dict(StatCounter.objects.filter(metric=metric.name).values_list('key', 'value'))
+
+            changes = {
+                key: (stored.get(key, 0), actual.get(key, 0))
+                for key in stored.keys() | actual.keys()
+                if stored.get(key, 0) != actual.get(key, 0)
+            }
+            if changes:
+                drift[metric.name] = changes
+
+            StatCounter.objects.filter(metric=metric.name).delete()
+            StatCounter.objects.bulk_create([
+                StatCounter(metric=metric.name, key=key, value=value) for key, value in actual.items()
+            ])
+
+    return drift
+
+
+def snapshot():
+    data = {metric.name: {} for metric in METRICS}
+    for metric, key, value in StatCounter.objects.filter(value__gt=0).values_list('metric', 'key', 'value'):
+        data.setdefault(metric, {})[key] = value
+    return data
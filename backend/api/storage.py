@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import os
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Только оригиналы: уменьшенные копии (<sha>_card.webp) перезаписываются под тем же
+# именем при смене IMAGE_VARIANTS или generate_image_variants --force
+CONTENT_ADDRESSED_NAME = re.compile(r'(^|/)[0-9a-f]{64}\.[A-Za-z0-9]+$')
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+
+    return digest.hexdigest()
+
+
+def content_addressed_name(name, digest):
+    directory, filename = os.path.split(name)
+    extension = os.path.splitext(filename)[1].lower()
+    return os.path.join(directory, digest + extension)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    # Имя файла — sha256 содержимого: одинаковые загрузки ссылаются на один файл
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = content_addressed_name(name, content_hash(content))
+        if self.exists(name):
+            return name
+
+        return super().save(name, content, max_length=max_length)
+
+    def get_available_name(self, name, max_length=None):
+        # Файл с таким именем уже содержит те же байты, суффикс не нужен
+        return name
+
+    def _save(self, name, content):
+        try:
+            return super()._save(name, content)
+        except FileExistsError:
+            return name
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # collectstatic кладёт рядом с хэшированными файлами .gz и .br (если установлен brotli),
+    # их отдаёт фронтовой прокси через gzip_static/brotli_static
+    manifest_strict = False
+    compress_extensions = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml')
+    min_compress_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and hashed_name and not isinstance(processed, Exception):
+                self.compress(hashed_name)
+            yield name, hashed_name, processed
+
+    def compress(self, name):
+        if not name.endswith(self.compress_extensions):
+            return
+
+        path = self.path(name)
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < self.min_compress_size:
+            return
+
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data, quality=11)))
+
+        for extension, compressed in variants:
+            if len(compressed) < len(data):
+                with open(path + extension, 'wb') as file:
+                    file.write(compressed)
@@ -0,0 +1,47 @@
+import secrets
+import tempfile
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.utils import timezone
+
+from . import search
+from .export import EXPORTS, export_fields, export_stream
+from .images import generate_variants
+
+
+# Задачи для manage.py runworker; регистрируются в settings.JOB_TASKS.
+# Аргументы и результат хранятся в Job как JSON
+
+
+def image_variants(name, force=False):
+    return {'generated': generate_variants(name, force=force)}
+
+
+def export(resource, fmt='ndjson', fields=None, compress=False):
+    # Выгрузка пишется во временный файл и целиком сохраняется в закрытое хранилище;
+    # скачать её можно только через /api/jobs/<id>/file
+    fields = export_fields(EXPORTS[resource][1], fields)
+    name = (
+        f"{settings.JOB_EXPORT_DIR}/{resource}-{timezone.now():%Y%m%d-%H%M%S}-{secrets.token_hex(16)}"
+        f".{fmt}{'.gz' if compress else ''}"
+    )
+
+    with tempfile.TemporaryFile() as file:
+        for data in export_stream(resource, fmt, fields, compress=compress):
+            file.write(data)
+        size = file.tell()
+        file.seek(0)
+        name = storages['exports'].save(name, File(file))
+
+    return {'file': name, 'size': size}
+
+
+def rebuild_search_index(kinds=None):
+    counts = {}
+    for kind in kinds or search.SEARCH_INDEXES:
+        model = apps.get_model(search.SEARCH_INDEXES[kind]['model'])
+        counts[kind] = search.rebuild_index(kind, model.objects.all())
+    return counts
@@ -0,0 +1,39 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from api.management.commands.bench_async import PAIRS, run_benchmark
+from api.models import ArticleModel, CategoryModel, EventModel
+
+
+class AsyncViewsTests(TransactionTestCase):
+    # Транзакционный тест: async ORM ходит в базу из другого потока и должен видеть данные
+    def setUp(self):
+        cache.clear()
+        category = CategoryModel.objects.create(title='Категория')
+        for index in range(3):
+            article = ArticleModel.objects.create(title=f'Статья {index}', title_en=f'article-{index}', author='Автор')
+            article.categories.add(category)
+        EventModel.objects.create(date=datetime.date(2024, 1, 1), title='Событие', description='<p>Описание</p>')
+
+    def test_async_lists_match_sync(self):
+        client = APIClient()
+        for name, (sync_path, async_path) in PAIRS.items():
+            with self.subTest(endpoint=name):
+                sync_data = client.get(f'{sync_path}?all=1').json()
+                async_data = client.get(f'{async_path}?all=1').json()
+                self.assertEqual(async_data, sync_data)
+
+    def test_benchmark_harness(self):
+        # Прогон bench_async в миниатюре, чтобы сравнение не сломалось незаметно
+        results = run_benchmark(list(PAIRS), requests=10, concurrency=5, host='testserver')
+
+        self.assertEqual(
+            [(result['server'], result['path']) for result in results],
+            [(server, path) for sync_path, async_path in PAIRS.values()
+             for server, path in (('WSGI', sync_path), ('ASGI', sync_path), ('ASGI', async_path))],
+        )
+        for result in results:
+            self.assertEqual(result['errors'], 0, result['path'])
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase
+
+from api import backends
+from api.hashers import ConfigurablePBKDF2PasswordHasher
+from api.models import MentorModel, UserModel
+
+
+PASSWORD = 'Long-enough-passw0rd'
+
+
+class UserAndMentorBackendTests(TestCase):
+    def test_user_is_loaded_with_one_query(self):
+        user = UserModel.objects.create_user(username='user', email='user@example.com', password=PASSWORD)
+
+        with self.assertNumQueries(1):
+            authenticated = authenticate(username='user', password=PASSWORD)
+
+        self.assertEqual((type(authenticated), authenticated.pk), (UserModel, user.pk))
+        self.assertFalse(authenticated.is_staff)
+
+    def test_unknown_user_still_hashes(self):
+        with mock.patch.object(backends, 'make_password', wraps=backends.make_password) as make_password, \
+                self.assertNumQueries(1):
+            self.assertIsNone(authenticate(username='nobody', password=PASSWORD))
+
+        make_password.assert_called_once_with(PASSWORD)
+
+    def test_user_and_mentor_share_username(self):
+        user = UserModel.objects.create_user(username='same', email='user@example.com', password=PASSWORD)
+        mentor = MentorModel.objects.create_user(username='same', email='mentor@example.com', password='Mentor-passw0rd')
+
+        self.assertEqual(authenticate(username='same', password=PASSWORD), user)
+        authenticated = authenticate(username='same', password='Mentor-passw0rd')
+        self.assertEqual((type(authenticated), authenticated.pk), (MentorModel, mentor.pk))
+        self.assertIsNone(authenticate(username='same', password='wrong'))
+
+    def test_hash_is_upgraded_on_login(self):
+        # Хэш со старым числом итераций пересчитывается с текущими настройками
+        hasher = ConfigurablePBKDF2PasswordHasher()
+        user = UserModel.objects.create(
+            username='old', email='old@example.com',
+            password=hasher.encode(PASSWORD, hasher.salt(), iterations=1000),
+        )
+
+        authenticated = authenticate(username='old', password=PASSWORD)
+
+        user.refresh_from_db()
+        self.assertEqual(authenticated.password, user.password)
+        self.assertFalse(identify_hasher(user.password).must_update(user.password))
+        self.assertTrue(user.check_password(PASSWORD))
+
+    def test_inactive_accounts_are_rejected(self):
+        # Новых пользователей сигнал делает активными, поэтому отключение — отдельным UPDATE
+        user = UserModel.objects.create_user(username='gone', email='gone@example.com', password=PASSWORD)
+        UserModel.objects.filter(pk=user.pk).update(is_active=False)
+        self.assertIsNone(authenticate(username='gone', password=PASSWORD))
+
+        # Неактивный пользователь не закрывает вход ментору с тем же логином
+        mentor = MentorModel.objects.create_user(username='gone', email='mentor@example.com', password=PASSWORD)
+        self.assertEqual(authenticate(username='gone', password=PASSWORD).pk, mentor.pk)
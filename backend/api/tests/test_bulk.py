@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.management.commands import bench_bulk_users
+from api.models import CategoryModel, UserModel
+from api.tests.utils import client_for
+from api.tokens import issue_tokens
+from api.views import UserBulkView
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BulkPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = UserModel.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.member = UserModel.objects.create(username='member', email='member@example.com')
+
+    def test_anonymous_is_rejected(self):
+        category = CategoryModel.objects.create(title='Python')
+
+        for path in ('/api/users/bulk', '/api/results/bulk', '/api/events/bulk', '/api/categories/bulk'):
+            with self.subTest(path=path):
+                self.assertEqual(client_for().post(path, [], format='json').status_code, 401)
+
+        response = client_for().delete('/api/categories/bulk', [category.pk], format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(CategoryModel.objects.filter(pk=category.pk).exists())
+
+    def test_non_staff_is_forbidden(self):
+        response = client_for(self.member).post('/api/users/bulk', [], format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_privilege_fields_are_not_writable(self):
+        response = client_for(self.admin).post('/api/users/bulk', [{
+            'username': 'intruder', 'email': 'intruder@example.com', 'is_superuser': True, 'is_staff': True,
+        }], format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        user = UserModel.objects.get(username='intruder')
+        self.assertFalse(user.is_superuser or user.is_staff)
+
+    def test_sign_up_cannot_grant_staff(self):
+        response = APIClient().post('/api/register/user', {
+            'username': 'newcomer', 'email': 'newcomer@example.com',
+            'password': 'Long-enough-passw0rd', 'is_staff': True, 'is_superuser': True,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        user = UserModel.objects.get(username='newcomer')
+        self.assertFalse(user.is_superuser or user.is_staff)
+
+    def test_refresh_rereads_staff_flag(self):
+        refresh = issue_tokens(self.admin)['refresh']
+        UserModel.objects.filter(pk=self.admin.pk).update(is_staff=False)
+
+        access = APIClient().post('/api/token/refresh', {'refresh': refresh}, format='json').data['access']
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(client.post('/api/users/bulk', [], format='json').status_code, 403)
+
+
+class BulkConflictTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = UserModel.objects.create(username='admin', email='admin@example.com', is_staff=True)
+
+    def test_concurrent_insert_is_reported_per_row(self):
+        # Параллельный запрос занимает имя между проверкой уникальности и записью
+        prepare = UserBulkView.prepare
+
+        def insert_concurrently(view, instances, fields=None):
+            UserModel.objects.create(username='taken', email='taken@example.com')
+            return prepare(view, instances, fields)
+
+        rows = [
+            {'username': 'free', 'email': 'free@example.com'},
+            {'username': 'taken', 'email': 'other@example.com'},
+        ]
+        with mock.patch.object(UserBulkView, 'prepare', insert_concurrently):
+            response = client_for(self.admin).post('/api/users/bulk', rows, format='json')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertIn('username', response.data['errors'][0]['errors'])
+        self.assertFalse(UserModel.objects.filter(username='free').exists())
+
+    def test_boolean_ids_do_not_match_records(self):
+        # true == 1 в Python, но в JSON это не id
+        target = UserModel.objects.filter(pk=1).first() or UserModel.objects.create(id=1, username='one', email='one@example.com')
+        client = client_for(self.admin)
+
+        response = client.patch('/api/users/bulk', [{'id': True, 'about_me': 'изменено'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [{'index': 0, 'errors': {'id': ['Not found']}}])
+
+        response = client.delete('/api/users/bulk', [True, {'id': True}], format='json')
+        self.assertEqual(response.data, {'deleted': 0, 'missing': []})
+
+        target.refresh_from_db()
+        self.assertNotEqual(target.about_me, 'изменено')
+
+
+class BulkBenchmarkTests(TestCase):
+    def test_benchmark_rolls_back(self):
+        results = bench_bulk_users.run_benchmark(rows=200, baseline=10)
+
+        self.assertEqual([result['method'] for result in results], ['bulk', 'one by one'])
+        self.assertFalse(UserModel.objects.filter(username__startswith='bench').exists())
+        self.assertFalse(UserModel.objects.filter(username__startswith='single').exists())
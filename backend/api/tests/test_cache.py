@@ -0,0 +1,167 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.cache import get_version
+from api.models import ArticleModel, CategoryModel, EventModel, Meta
+from api.views import meta_cache
+
+
+def article_selects(queries):
+    return [query['sql'] for query in queries if query['sql'].startswith('SELECT "api_articlemodel"."id"')]
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.article = ArticleModel.objects.create(title='Первая', title_en='first', text='Текст', author='a')
+
+    def test_second_get_is_served_from_cache(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get('/api/posts/?all=1')
+        self.assertTrue(article_selects(queries.captured_queries))
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/posts/?all=1')
+
+        self.assertEqual(second.data, first.data)
+        # Остаётся только запрос состояния для ETag, сам список не читается
+        self.assertEqual(article_selects(queries.captured_queries), [])
+
+    def test_version_is_bumped_only_after_commit(self):
+        for resource, save in (
+            ('articles', lambda: ArticleModel.objects.create(title='Вторая', title_en='second', author='a')),
+            ('events', lambda: EventModel.objects.create(date='2024-01-01', title='Событие', description='')),
+            ('categories', lambda: CategoryModel.objects.create(title='Python')),
+            ('meta', lambda: Meta.objects.create(key='about', title='О нас', description='')),
+        ):
+            with self.subTest(resource=resource):
+                version = get_version(resource)
+                with self.captureOnCommitCallbacks(execute=True):
+                    save()
+                    # До коммита параллельный GET кэширует старый ответ под старой версией
+                    self.assertEqual(get_version(resource), version)
+                self.assertNotEqual(get_version(resource), version)
+
+    def test_committed_change_is_visible(self):
+        self.client.get('/api/posts/?all=1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Исправленная'
+            self.article.save()
+
+        titles = [row['title'] for row in self.client.get('/api/posts/?all=1').data]
+        self.assertEqual(titles, ['Исправленная'])
+
+    def test_category_delete_invalidates_articles(self):
+        category = CategoryModel.objects.create(title='Python')
+        self.article.categories.add(category)
+        version = get_version('articles')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+        self.assertNotEqual(get_version('articles'), version)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.article = ArticleModel.objects.create(title='Первая', title_en='first', text='Текст', author='a')
+
+    def test_list_and_detail_return_304_for_matching_etag(self):
+        for path in ('/api/posts/', f'/api/posts/{self.article.pk}'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Last-Modified', response)
+
+                repeated = self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(repeated.status_code, 304)
+                self.assertEqual(repeated.content, b'')
+
+                since = self.client.get(path, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(since.status_code, 304)
+
+    def test_change_produces_new_etag(self):
+        etag = self.client.get('/api/posts/')['ETag']
+
+        ArticleModel.objects.create(title='Вторая', title_en='second', author='a')
+        response = self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_category_change_produces_new_etag(self):
+        # Смена категорий не трогает auto_now, поэтому updated_at обновляется сигналом
+        etag = self.client.get(f'/api/posts/{self.article.pk}')['ETag']
+
+        self.article.categories.add(CategoryModel.objects.create(title='Python'))
+        self.assertNotEqual(self.client.get(f'/api/posts/{self.article.pk}')['ETag'], etag)
+
+    def test_meta_etag(self):
+        Meta.objects.create(key='about', title='О нас', description='')
+
+        response = self.client.get('/api/meta/about')
+        self.assertEqual(self.client.get('/api/meta/about', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class MetaLookupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        meta_cache._items.clear()
+        self.client = APIClient()
+        Meta.objects.create(key='about', title='О нас', description='')
+        Meta.objects.create(key='blog/intro', title='Блог', description='')
+
+    def meta_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries if 'api_meta' in query['sql']]
+
+    def test_batch_lookup(self):
+        response, queries = self.meta_queries('/api/meta?key=about&key=blog$intro&key=missing')
+
+        self.assertEqual(set(response.data['data']), {'about', 'blog/intro'})
+        self.assertEqual(len(queries), 1)
+
+    def test_repeated_lookups_are_served_from_memory(self):
+        self.meta_queries('/api/meta?key=about&key=missing')
+
+        # Отсутствующий ключ тоже запомнен и в базу не ходит
+        _, queries = self.meta_queries('/api/meta?key=about&key=missing')
+        self.assertEqual(queries, [])
+
+        _, queries = self.meta_queries('/api/meta/blog$intro')
+        self.assertEqual(len(queries), 1)
+
+    def test_lru_is_reset_after_commit(self):
+        self.meta_queries('/api/meta/about')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Meta.objects.filter(key='about').update(title='Обновлено')
+            Meta.objects.get(key='about').save()
+
+        response, queries = self.meta_queries('/api/meta/about')
+        self.assertEqual(response.data['data']['title'], 'Обновлено')
+        self.assertEqual(len(queries), 1)
+
+    def test_lru_evicts_least_recently_used(self):
+        maxsize = meta_cache.maxsize
+        self.addCleanup(setattr, meta_cache, 'maxsize', maxsize)
+        meta_cache.maxsize = 1
+
+        self.meta_queries('/api/meta/about')
+        self.meta_queries('/api/meta/blog$intro')
+        self.assertEqual(list(meta_cache._items), ['blog/intro'])
+
+        _, queries = self.meta_queries('/api/meta/about')
+        self.assertEqual(len(queries), 1)
+
+    def test_too_many_keys(self):
+        with self.settings(META_BATCH_MAX_KEYS=1):
+            response = self.client.get('/api/meta?key=about&key=blog$intro')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,26 @@
+import json
+
+from django.test import TestCase
+
+from api.models import Job, UserModel
+from api.tests.utils import client_for
+
+
+class ExportPermissionTests(TestCase):
+    def setUp(self):
+        self.admin = UserModel.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.member = UserModel.objects.create(username='member', email='member@example.com')
+
+    def test_anonymous_and_members_are_rejected(self):
+        for client, code in ((client_for(), 401), (client_for(self.member), 403)):
+            with self.subTest(code=code):
+                self.assertEqual(client.get('/api/export/users.csv').status_code, code)
+                self.assertEqual(client.post('/api/export/users.csv').status_code, code)
+        self.assertFalse(Job.objects.exists())
+
+    def test_admin_downloads_export(self):
+        response = client_for(self.admin).get('/api/export/users.ndjson?fields=id,username')
+
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertIn({'id': self.member.pk, 'username': 'member'}, rows)
@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api import images
+from api.models import Job, UserModel
+
+
+def png(color='red'):
+    buffer = BytesIO()
+    Image.new('RGB', (8, 8), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(f'{color}.png', buffer.getvalue(), content_type='image/png')
+
+
+class VariantSchedulingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.schedule = self.enterContext(mock.patch('api.models.schedule_variants'))
+
+    def test_sign_up_schedules_once(self):
+        # Регистрация сохраняет пользователя три раза, копии нужны один раз
+        response = APIClient().post('/api/register/user', {
+            'username': 'newcomer',
+            'email': 'newcomer@example.com',
+            'password': 'Long-enough-passw0rd',
+            'photo': png(),
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        user = UserModel.objects.get(username='newcomer')
+        self.schedule.assert_called_once_with(user.photo.name)
+
+    def test_resave_without_new_photo_is_skipped(self):
+        UserModel.objects.create(username='u', email='u@example.com', photo=png())
+        self.schedule.reset_mock()
+
+        user = UserModel.objects.get(username='u')
+        user.about_me = 'Обновил описание'
+        user.save()
+        self.schedule.assert_not_called()
+
+        user.photo = png('blue')
+        user.save()
+        self.schedule.assert_called_once_with(user.photo.name)
+
+    def test_deferred_photo_is_not_loaded(self):
+        UserModel.objects.create(username='u', email='u@example.com', photo=png())
+
+        with self.assertNumQueries(1):
+            user = UserModel.objects.only('id', 'username').get(username='u')
+        self.assertFalse(hasattr(user, '_saved_image_name'))
+
+
+class VariantPoolTests(TestCase):
+    def test_pool_dedupes_by_file_name(self):
+        with mock.patch.object(images, 'executor') as executor, mock.patch.object(images, 'generate_variants'):
+            images.submit_variants('profile_photos/a.png')
+            images.submit_variants('profile_photos/a.png')
+            images.submit_variants('profile_photos/b.png')
+            self.assertEqual([call.args[1] for call in executor.submit.call_args_list], ['profile_photos/a.png', 'profile_photos/b.png'])
+
+            # После окончания генерации тот же файл снова можно поставить в пул
+            for call in executor.submit.call_args_list:
+                call.args[0](call.args[1])
+            images.submit_variants('profile_photos/a.png')
+            self.assertEqual(executor.submit.call_count, 3)
+
+    @override_settings(IMAGE_VARIANT_QUEUE='jobs')
+    def test_job_queue_dedupes_by_file_name(self):
+        images.schedule_variants('profile_photos/a.png')
+        images.schedule_variants('profile_photos/a.png')
+        self.assertEqual(Job.objects.filter(name='image_variants').count(), 1)
@@ -0,0 +1,74 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import ArticleModel, EventModel, MentorModel, UserModel
+
+
+# Планы проверяются на SQLite: он выбирает индекс по схеме, без статистики по данным,
+# поэтому результат не зависит от числа строк в тестовой базе
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN is SQLite syntax")
+class IndexUsageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def plan(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+
+    def queryset_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return self.plan(sql, params)
+
+    def endpoint_plan(self, url, table):
+        # План того запроса, который представление на самом деле выполнило к table
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        statements = [query['sql'] for query in queries if f'FROM "{table}"' in query['sql']]
+        self.assertTrue(statements, f"GET {url} ran no query against {table}")
+        return self.plan(statements[-1])
+
+    def test_users_by_status(self):
+        plan = self.endpoint_plan('/api/users?status=working', 'api_usermodel')
+        self.assertIn('USING INDEX user_status_idx', plan)
+
+    def test_mentors_by_status(self):
+        plan = self.endpoint_plan('/api/mentors?status=resume', 'api_mentormodel')
+        self.assertIn('USING INDEX mentor_status_idx', plan)
+
+    def test_article_by_title_en(self):
+        plan = self.endpoint_plan('/api/posts/?title=some-article', 'api_articlemodel')
+        self.assertRegex(plan, r'SEARCH api_articlemodel USING INDEX \w+ \(title_en=\?\)')
+
+    def test_default_orderings_need_no_sort(self):
+        # Meta.ordering (админка, выборки без order_by) читается по индексу, без TEMP B-TREE
+        for queryset, index in (
+            (UserModel.objects.all(), 'user_full_name_idx'),
+            (MentorModel.objects.all(), 'mentor_full_name_idx'),
+            (EventModel.objects.all(), 'api_eventmodel_date'),
+        ):
+            with self.subTest(model=queryset.model.__name__):
+                plan = self.queryset_plan(queryset)
+                self.assertIn(f'USING INDEX {index}', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_keyset_pages_need_no_sort(self):
+        for url, table in (
+            ('/api/users?status=working', 'api_usermodel'),
+            ('/api/events', 'api_eventmodel'),
+            ('/api/posts/', 'api_articlemodel'),
+        ):
+            with self.subTest(url=url):
+                self.assertNotIn('TEMP B-TREE', self.endpoint_plan(url, table))
+
+    def test_article_slug_lookup_is_not_a_scan(self):
+        plan = self.queryset_plan(ArticleModel.objects.filter(title_en='some-article'))
+        self.assertNotIn('SCAN api_articlemodel', plan)
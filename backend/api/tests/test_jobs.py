@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import jobs
+from api.models import Job, UserModel
+from api.tests.utils import client_for
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.enterContext(override_settings(STORAGES={
+            **settings.STORAGES,
+            'exports': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.root}},
+        }))
+
+        self.admin = UserModel.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.other = UserModel.objects.create(username='other', email='other@example.com', is_staff=True)
+
+    def export(self):
+        response = client_for(self.admin).post('/api/export/users.ndjson?fields=id,username')
+        self.assertEqual(response.status_code, 202, response.data)
+        return Job.objects.get(pk=response.data['id'])
+
+    def run_jobs(self):
+        for job in jobs.claim(10):
+            self.assertTrue(jobs.run(job))
+
+    def test_job_is_visible_only_to_its_owner(self):
+        job = self.export()
+        self.assertEqual(job.owner, f'usermodel:{self.admin.pk}')
+
+        self.assertEqual(client_for().get(f'/api/jobs/{job.pk}').status_code, 401)
+        self.assertEqual(client_for(self.other).get(f'/api/jobs/{job.pk}').status_code, 404)
+
+        response = client_for(self.admin).get(f'/api/jobs/{job.pk}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['download'])
+        self.assertNotIn('owner', response.data)
+
+    def test_export_is_downloaded_through_the_api(self):
+        job = self.export()
+        self.run_jobs()
+        job.refresh_from_db()
+
+        # Файл лежит в закрытом хранилище, публичной ссылки в результате нет
+        self.assertNotIn('url', job.result)
+        self.assertTrue(os.path.exists(os.path.join(self.root, job.result['file'])))
+
+        download = client_for(self.admin).get(f'/api/jobs/{job.pk}').data['download']
+        self.assertTrue(download.endswith(f'/api/jobs/{job.pk}/file'))
+
+        response = client_for(self.admin).get(f'/api/jobs/{job.pk}/file')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertIn({'id': self.other.pk, 'username': 'other'}, rows)
+
+        self.assertEqual(client_for(self.other).get(f'/api/jobs/{job.pk}/file').status_code, 404)
+        self.assertEqual(client_for().get(f'/api/jobs/{job.pk}/file').status_code, 401)
+
+    def test_purge_deletes_export_file(self):
+        job = self.export()
+        self.run_jobs()
+        job.refresh_from_db()
+
+        self.assertEqual(jobs.purge(now=timezone.now() + timedelta(days=settings.JOB_KEEP_DAYS + 1)), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.root, job.result['file'])))
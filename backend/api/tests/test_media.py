@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api.media import serve_media
+
+
+SHA = 'a' * 64
+
+
+@override_settings(MEDIA_SERVING='debug')
+class MediaServingTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.factory = RequestFactory()
+
+    def write(self, name, data=b'0123456789'):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    def get(self, name, **headers):
+        response = serve_media(self.factory.get(f'/media/{name}', **headers), name, document_root=self.root)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_original_is_immutable(self):
+        self.write(f'profile_photos/{SHA}.png')
+
+        response, _ = self.get(f'profile_photos/{SHA}.png')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_variant_is_not_immutable(self):
+        # Копии перегенерируются под тем же именем, вечный кэш оставил бы у клиентов старые
+        self.write(f'variants/profile_photos/{SHA}_card.webp')
+
+        response, _ = self.get(f'variants/profile_photos/{SHA}_card.webp')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response.get('Cache-Control', ''))
+
+    def test_range(self):
+        self.write('file.txt')
+
+        response, body = self.get('file.txt', HTTP_RANGE='bytes=2-4')
+        self.assertEqual((response.status_code, body, response['Content-Range']), (206, b'234', 'bytes 2-4/10'))
+
+        response, body = self.get('file.txt', HTTP_RANGE='bytes=-3')
+        self.assertEqual((response.status_code, body), (206, b'789'))
+
+        response, body = self.get('file.txt', HTTP_RANGE='bytes=8-100')
+        self.assertEqual((response.status_code, body), (206, b'89'))
+
+    def test_invalid_range_is_ignored(self):
+        # RFC 9110 14.2: неверный Range игнорируется, отдаётся весь файл
+        self.write('file.txt')
+
+        for header in ('bytes=5-3', 'bytes=abc', 'items=0-1', 'bytes=-'):
+            with self.subTest(header=header):
+                response, body = self.get('file.txt', HTTP_RANGE=header)
+                self.assertEqual((response.status_code, body), (200, b'0123456789'))
+
+    def test_unsatisfiable_range(self):
+        self.write('file.txt')
+
+        for header in ('bytes=10-', 'bytes=20-30', 'bytes=-0'):
+            with self.subTest(header=header):
+                response, _ = self.get('file.txt', HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */10')
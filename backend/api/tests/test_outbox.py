@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import notifications, outbox
+from api.models import OutboxMessage, UserModel
+
+
+class FailingNotifier(notifications.BaseNotifier):
+    def send(self, topic, payload):
+        raise ConnectionError("SMTP is down")
+
+
+@override_settings(
+    OUTBOX_NOTIFIERS={'test': 'api.notifications.LocMemNotifier'},
+    OUTBOX_MAX_ATTEMPTS=3,
+    OUTBOX_BACKOFF_BASE_SECONDS=10,
+    OUTBOX_LEASE_SECONDS=300,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        notifications.sent.clear()
+        self.addCleanup(notifications.sent.clear)
+        self.user = UserModel.objects.create(username='u', email='u@example.com')
+
+    def submit(self):
+        response = APIClient().post('/api/contacts', {
+            'user': self.user.pk, 'mail': 'u@example.com', 'message': 'Здравствуйте',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return OutboxMessage.objects.get()
+
+    @contextmanager
+    def failing(self):
+        with mock.patch.object(outbox, 'get_notifier', return_value=FailingNotifier()), \
+                self.assertLogs('api.outbox', 'WARNING'):
+            yield
+
+    def test_post_returns_before_delivery(self):
+        message = self.submit()
+
+        self.assertEqual(notifications.sent, [])
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.PENDING, 0))
+
+        for claimed in outbox.claim(10):
+            self.assertTrue(outbox.deliver(claimed))
+
+        self.assertEqual([topic for topic, _ in notifications.sent], ['contact.created'])
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.SENT, 1))
+
+    def test_failure_is_retried_after_backoff(self):
+        self.submit()
+        now = timezone.now()
+
+        with self.failing():
+            [claimed] = outbox.claim(10, now=now)
+            self.assertFalse(outbox.deliver(claimed))
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.PENDING, 1))
+        self.assertIn('SMTP is down', message.last_error)
+        # Первая задержка — от половины до полной базы
+        self.assertGreaterEqual(message.available_at, now + timedelta(seconds=5))
+
+        self.assertEqual(outbox.claim(10, now=now), [])
+        [claimed] = outbox.claim(10, now=message.available_at)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertTrue(outbox.deliver(claimed))
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxMessage.SENT)
+
+    def test_repeated_failures_end_in_failed(self):
+        self.submit()
+        later = timezone.now()
+
+        with self.failing():
+            for _ in range(3):
+                later += timedelta(hours=2)
+                [claimed] = outbox.claim(10, now=later)
+                outbox.deliver(claimed)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.FAILED, 3))
+        self.assertEqual(outbox.claim(10, now=later + timedelta(days=1)), [])
+
+    def test_hung_worker_counts_attempts_until_failed(self):
+        # Воркер захватывает сообщение и пропадает, не вызвав deliver
+        self.submit()
+        later = timezone.now()
+
+        for attempt in range(1, 4):
+            [claimed] = outbox.claim(10, now=later)
+            self.assertEqual(claimed.attempts, attempt)
+            later += timedelta(seconds=301)
+
+        self.assertEqual(outbox.claim(10, now=later), [])
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.last_error), (OutboxMessage.FAILED, "Lease expired"))
+
+    def test_stale_worker_does_not_overwrite(self):
+        self.submit()
+        now = timezone.now()
+
+        [stale] = outbox.claim(10, now=now)
+        [fresh] = outbox.claim(10, now=now + timedelta(seconds=301))
+
+        with self.failing():
+            outbox.deliver(stale)
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.PROCESSING, 2))
+
+        self.assertTrue(outbox.deliver(fresh))
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxMessage.SENT)
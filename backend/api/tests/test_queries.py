@@ -0,0 +1,225 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import (
+    ArticleModel,
+    CategoryModel,
+    ContactModel,
+    EventModel,
+    MentorAppointmentModel,
+    MentorModel,
+    ResultModel,
+    UserModel,
+)
+
+
+# Верхние границы числа запросов на один GET списка. Число не должно расти вместе с числом
+# строк: если растёт — в сериализатор или представление вернулся N+1
+MAX_QUERIES = {
+    '/api/posts/': 3,
+    '/api/events': 2,
+    '/api/categories': 1,
+    '/api/users': 1,
+    '/api/mentors': 1,
+    '/api/results': 1,
+    '/api/contacts': 1,
+    '/api/appointments': 1,
+}
+
+SIZES = (1, 100, 10000)
+
+
+def create_articles(count, categories, start=0):
+    # bulk_create не шлёт сигналов, поэтому HTML и поисковый индекс не строятся — здесь они не нужны
+    articles = ArticleModel.objects.bulk_create([
+        ArticleModel(title=f'Статья {index}', title_en=f'article-{index}', author='Автор', text='<p>Текст</p>')
+        for index in range(start, start + count)
+    ])
+    links = ArticleModel.categories.through
+    links.objects.bulk_create([
+        links(articlemodel_id=article.pk, categorymodel_id=category.pk)
+        for article in articles for category in categories
+    ])
+    return articles
+
+
+def create_users(count):
+    return UserModel.objects.bulk_create([
+        UserModel(username=f'user{index}', email=f'user{index}@example.com', password='!', patronymic='')
+        for index in range(count)
+    ])
+
+
+class ListQueryCountTests(TestCase):
+    def setUp(self):
+        # Ответы кэшируются по версии ресурса; здесь считаются запросы без кэша
+        cache.clear()
+        self.client = APIClient()
+        self.categories = CategoryModel.objects.bulk_create([CategoryModel(title=f'Категория {index}') for index in range(3)])
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def assertListQueries(self, path, query=''):
+        url = f'{path}?all=1{query}'
+        count, response = self.count_queries(url)
+        self.assertLessEqual(
+            count, MAX_QUERIES[path],
+            f"GET {url} ran {count} queries, at most {MAX_QUERIES[path]} expected",
+        )
+        return response
+
+    def test_articles(self):
+        created = 0
+        for size in SIZES:
+            with self.subTest(articles=size):
+                create_articles(size - created, self.categories, start=created)
+                created = size
+
+                response = self.assertListQueries('/api/posts/')
+                self.assertEqual(len(response.data), size)
+                self.assertEqual(len(response.data[0]['categories']), len(self.categories))
+
+    def test_articles_by_category(self):
+        create_articles(100, self.categories)
+
+        query = ''.join(f'&category_id={category.pk}' for category in self.categories)
+        response = self.assertListQueries('/api/posts/', query)
+        # Статья во всех категориях сразу попадает в ответ один раз
+        self.assertEqual(len(response.data), 100)
+
+    def test_articles_paginated(self):
+        create_articles(500, self.categories)
+
+        count, response = self.count_queries('/api/posts/?page_size=200')
+        self.assertLessEqual(count, MAX_QUERIES['/api/posts/'])
+        self.assertEqual(len(response.data['results']), 200)
+
+    def test_events(self):
+        for size in (1, 100):
+            with self.subTest(events=size):
+                EventModel.objects.all().delete()
+                EventModel.objects.bulk_create([
+                    EventModel(date=datetime.date(2024, 1, 1) + datetime.timedelta(days=index), title=f'Событие {index}', description='<p>Описание</p>')
+                    for index in range(size)
+                ])
+                response = self.assertListQueries('/api/events')
+                self.assertEqual(len(response.data), size)
+
+    def test_categories(self):
+        CategoryModel.objects.bulk_create([CategoryModel(title=f'Ещё {index}') for index in range(100)])
+        response = self.assertListQueries('/api/categories')
+        self.assertEqual(len(response.data), 103)
+
+    def test_users(self):
+        for size in (1, 100):
+            with self.subTest(users=size):
+                UserModel.objects.all().delete()
+                create_users(size)
+                response = self.assertListQueries('/api/users')
+                self.assertEqual(len(response.data), size)
+
+    def test_mentors(self):
+        MentorModel.objects.bulk_create([
+            MentorModel(username=f'mentor{index}', email=f'mentor{index}@example.com', password='!', patronymic='')
+            for index in range(100)
+        ])
+        response = self.assertListQueries('/api/mentors')
+        self.assertEqual(len(response.data), 100)
+
+    def test_results(self):
+        ResultModel.objects.bulk_create([
+            ResultModel(date=datetime.date(2024, 1, 1), frontend=index, backend=index / 2)
+            for index in range(100)
+        ])
+        response = self.assertListQueries('/api/results')
+        self.assertEqual(len(response.data), 100)
+
+    def test_contacts_and_appointments(self):
+        user, mentor = create_users(2)
+        for index in range(50):
+            ContactModel.objects.create(user=user, mail='a@example.com', message=f'Сообщение {index}')
+            MentorAppointmentModel.objects.create(
+                user=user, mentor=mentor, mail='a@example.com', message=f'Запись {index}', description='Описание',
+            )
+
+        response = self.assertListQueries('/api/contacts')
+        self.assertEqual(len(response.data), 100)
+        response = self.assertListQueries('/api/appointments')
+        self.assertEqual(len(response.data), 50)
+
+
+class DetailQueryTests(TestCase):
+    # Группы и права в ответ не попадают, поэтому и подгружать их незачем
+    def test_delete_does_not_prefetch_permissions(self):
+        for path, model in (('/api/users', UserModel), ('/api/mentors', MentorModel)):
+            with self.subTest(path=path):
+                instance = model.objects.create(username='gone', email='gone@example.com')
+                with CaptureQueriesContext(connection) as queries:
+                    response = APIClient().delete(f'{path}/{instance.pk}')
+
+                self.assertEqual(response.status_code, 204)
+                selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+                self.assertFalse([sql for sql in selects if 'auth_group' in sql or 'auth_permission' in sql], selects)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.article = create_articles(1, CategoryModel.objects.bulk_create([CategoryModel(title='Python')]))[0]
+        ArticleModel.objects.filter(pk=self.article.pk).update(image='articles/cover.jpg')
+        self.user = create_users(1)[0]
+        UserModel.objects.filter(pk=self.user.pk).update(photo='profile_photos/me.jpg')
+
+    def get(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries]
+
+    def test_list_fields_and_exclude(self):
+        response, _ = self.get('/api/posts/?all=1&fields=title,image_variants')
+        self.assertEqual(set(response.data[0]), {'id', 'title', 'image_variants'})
+        self.assertIsNotNone(response.data[0]['image_variants'])
+
+        response, _ = self.get('/api/users?all=1&exclude=email,photo')
+        self.assertNotIn('email', response.data[0])
+        self.assertNotIn('photo', response.data[0])
+        self.assertIn('photo_variants', response.data[0])
+
+    def test_detail_fields_and_exclude(self):
+        response, queries = self.get(f'/api/posts/{self.article.pk}?fields=title')
+        self.assertEqual(set(response.data), {'id', 'title'})
+        [select] = [sql for sql in queries if sql.startswith('SELECT "api_articlemodel"."id"')]
+        self.assertNotIn('"text"', select)
+
+        response, _ = self.get(f'/api/users/{self.user.pk}?exclude=email,about_me')
+        self.assertNotIn('email', response.data)
+        self.assertNotIn('about_me', response.data)
+        self.assertIn('username', response.data)
+
+    def test_variants_read_their_column(self):
+        # Без колонки файла сериализатор дочитывал бы её отдельным запросом на каждый объект
+        for url, table, field in (
+            (f'/api/posts/{self.article.pk}?fields=image_variants', 'api_articlemodel', 'image_variants'),
+            (f'/api/users/{self.user.pk}?fields=photo_variants', 'api_usermodel', 'photo_variants'),
+            (f'/api/users/{self.user.pk}?exclude=photo', 'api_usermodel', 'photo_variants'),
+        ):
+            with self.subTest(url=url):
+                response, queries = self.get(url)
+                self.assertIsNotNone(response.data[field])
+                selects = [sql for sql in queries if sql.startswith(f'SELECT "{table}"."id"')]
+                self.assertEqual(len(selects), 1, selects)
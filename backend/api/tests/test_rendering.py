@@ -0,0 +1,123 @@
+from django.test import SimpleTestCase, override_settings
+
+from api.rendering import render_rich_text
+
+
+def render(value):
+    return render_rich_text(value)['html']
+
+
+class SanitizerTests(SimpleTestCase):
+    def test_script_and_style_bodies_are_dropped(self):
+        html = render(
+            '<p>До<script>alert("x")</script><style>p { color: red }</style>'
+            '<iframe src="https://example.com">рамка</iframe>после</p>'
+        )
+
+        self.assertEqual(html, '<p>Допосле</p>')
+
+    def test_nested_dropped_tags(self):
+        self.assertEqual(render('<noscript><script>a</script>скрыто</noscript><p>видно</p>'), '<p>видно</p>')
+        # Незакрытый script съедает остаток документа, а не выпускает его наружу
+        self.assertEqual(render('<p>текст</p><script>alert(1)'), '<p>текст</p>')
+
+    def test_event_handler_attributes_are_removed(self):
+        html = render(
+            '<p onclick="alert(1)" class="x">a</p>'
+            '<img src="https://example.com/a.png" onerror="alert(1)" ONLOAD="alert(2)">'
+            '<a href="https://example.com" onmouseover="alert(3)">b</a>'
+        )
+
+        self.assertNotIn('on', html.replace('loading', ''))
+        self.assertIn('<p>a</p>', html)
+        self.assertIn('<a href="https://example.com">b</a>', html)
+
+    def test_unknown_tags_keep_their_text(self):
+        self.assertEqual(render('<div><font color="red">текст</font></div>'), 'текст')
+
+    def test_dangerous_urls_are_removed(self):
+        for url in (
+            'javascript:alert(1)',
+            'JavaScript:alert(1)',
+            '  javascript:alert(1)',
+            'java\tscript:alert(1)',
+            'java\nscript:alert(1)',
+            'java&#x09;script:alert(1)',
+            '\x01javascript:alert(1)',
+            'javascript&#58;alert(1)',
+            '&#106;avascript:alert(1)',
+            'data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==',
+            ' data:image/svg+xml,<svg onload=alert(1)>',
+            'vbscript:msgbox(1)',
+        ):
+            with self.subTest(url=url):
+                html = render(f'<a href="{url}">ссылка</a><img src="{url}">')
+                self.assertEqual(html, '<a>ссылка</a><img loading="lazy">')
+
+    def test_safe_urls_are_kept(self):
+        for url in ('https://example.com/a?b=1&c=2', '/media/file.pdf', 'mailto:hi@example.com', '#anchor'):
+            with self.subTest(url=url):
+                self.assertIn('href=', render(f'<a href="{url}">ссылка</a>'))
+
+    def test_attribute_values_are_escaped(self):
+        html = render('<a href="https://example.com/?q=&quot;&gt;&lt;script&gt;" title=\'"><b>\'>x</a>')
+
+        self.assertNotIn('<script', html)
+        self.assertNotIn('"><b>', html)
+        self.assertIn('&quot;&gt;&lt;b&gt;', html)
+
+    def test_target_blank_gets_rel(self):
+        html = render('<a href="https://example.com" target="_blank" rel="opener">x</a>')
+        self.assertIn('rel="noopener noreferrer"', html)
+
+    def test_unbalanced_tags_are_closed(self):
+        self.assertEqual(render('<p><b>жирный<i>курсив</p>'), '<p><b>жирный<i>курсив</i></b></p>')
+        html = render('<ul><li>один<li>два')
+        self.assertEqual((html.count('<li>'), html.count('</li>')), (2, 2))
+        self.assertTrue(html.endswith('</ul>'))
+        # Лишний закрывающий тег без открывающего пропускается
+        self.assertEqual(render('текст</b></p>'), 'текст')
+
+    def test_nested_tags(self):
+        html = '<blockquote><p>Цитата <a href="https://example.com"><strong>ссылка</strong></a></p></blockquote>'
+        self.assertEqual(render(html), html)
+
+
+class TextMetricsTests(SimpleTestCase):
+    def test_excerpt_is_plain_text(self):
+        rendered = render_rich_text('<h2>Заголовок</h2><p>Первый&nbsp;абзац <script>x</script>и <b>ещё</b></p><p>Второй</p>')
+
+        self.assertEqual(rendered['excerpt'], 'Заголовок Первый абзац и ещё Второй')
+
+    @override_settings(RICH_TEXT_EXCERPT_WORDS=3)
+    def test_excerpt_is_truncated(self):
+        self.assertEqual(render_rich_text('<p>один два три четыре пять</p>')['excerpt'], 'один два три…')
+
+    @override_settings(RICH_TEXT_WORDS_PER_MINUTE=10)
+    def test_reading_time(self):
+        self.assertEqual(render_rich_text('')['reading_time'], 0)
+        self.assertEqual(render_rich_text(None)['reading_time'], 0)
+        self.assertEqual(render_rich_text('<p>слово</p>')['reading_time'], 1)
+        self.assertEqual(render_rich_text('<p>' + 'слово ' * 10 + '</p>')['reading_time'], 1)
+        self.assertEqual(render_rich_text('<p>' + 'слово ' * 11 + '</p><script>' + 'скрыто ' * 100 + '</script>')['reading_time'], 2)
+
+
+@override_settings(MEDIA_URL='/media/', CKEDITOR_UPLOAD_PATH='uploads/', IMAGE_VARIANT_DIR='variants', RICH_TEXT_IMAGE_VARIANT='card')
+class EditorImageTests(SimpleTestCase):
+    def test_uploaded_images_point_to_variant(self):
+        rendered = render_rich_text(
+            '<p><img src="/media/uploads/2024/01/photo.JPG" alt="Фото"></p>'
+            '<p><img src="http://testserver/media/uploads/2024/01/%D1%84%D0%BE%D1%82%D0%BE.png"></p>'
+        )
+
+        self.assertEqual(rendered['images'], ['uploads/2024/01/photo.JPG', 'uploads/2024/01/фото.png'])
+        self.assertIn('src="/media/variants/uploads/2024/01/photo_card.webp"', rendered['html'])
+        self.assertIn('alt="Фото"', rendered['html'])
+        self.assertEqual(rendered['html'].count('loading="lazy"'), 2)
+
+    def test_other_images_are_left_alone(self):
+        for src in ('https://cdn.example.com/uploads/a.jpg', '/media/profile_photos/a.jpg', '/media/uploads/file.gif'):
+            with self.subTest(src=src):
+                rendered = render_rich_text(f'<img src="{src}">')
+                self.assertEqual(rendered['images'], [])
+                self.assertEqual(rendered['html'], f'<img src="{src}" loading="lazy">')
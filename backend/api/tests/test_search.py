@@ -0,0 +1,80 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import ArticleModel, CategoryModel, EventModel
+
+
+class SearchPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        # Заголовок весит больше текста: первые три статьи релевантнее остальных
+        for index in range(3):
+            ArticleModel.objects.create(title=f'Graphs {index}', title_en=f'graphs-{index}', text='Обзор', author='a')
+        for index in range(4):
+            ArticleModel.objects.create(title=f'Заметка {index}', title_en=f'note-{index}', text='graphs', author='a')
+        ArticleModel.objects.create(title='Другое', title_en='other', text='Без совпадений', author='a')
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_cover_all_hits_in_rank_order(self):
+        page = self.get('/api/posts/?q=graphs&page_size=3')
+        self.assertIsNone(page['previous'])
+
+        titles = []
+        pages = [page]
+        while True:
+            titles += [row['title'] for row in page['results']]
+            if not page['next']:
+                break
+            page = self.get(page['next'])
+            pages.append(page)
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len(titles), 7)
+        self.assertEqual(len(set(titles)), 7)
+        self.assertTrue(all(title.startswith('Graphs') for title in titles[:3]), titles)
+
+        # previous последней страницы ведёт на вторую
+        self.assertEqual(self.get(pages[2]['previous'])['results'], pages[1]['results'])
+        self.assertNotIn('offset', pages[1]['previous'])
+
+    def test_invalid_offset_starts_from_beginning(self):
+        first = self.get('/api/posts/?q=graphs&page_size=3')
+        self.assertEqual(self.get('/api/posts/?q=graphs&page_size=3&offset=abc')['results'], first['results'])
+
+    def test_filters_apply_before_ranking(self):
+        # Статьи категории ранжируются ниже остальных: фильтр после OFFSET/LIMIT дал бы пустые страницы
+        category = CategoryModel.objects.create(title='Python')
+        in_category = []
+        for index in range(4):
+            article = ArticleModel.objects.create(title=f'Разбор {index}', title_en=f'review-{index}', text='graphs', author='a')
+            article.categories.add(category)
+            in_category.append(article.title)
+
+        first = self.get(f'/api/posts/?q=graphs&page_size=3&category_id={category.pk}')
+        self.assertEqual(len(first['results']), 3)
+        self.assertIsNotNone(first['next'])
+
+        second = self.get(first['next'])
+        self.assertIsNone(second['next'])
+        titles = [row['title'] for row in first['results'] + second['results']]
+        self.assertEqual(sorted(titles), in_category)
+
+        self.assertEqual([row['title'] for row in self.get('/api/posts/?q=graphs&title=graphs-1')['results']], ['Graphs 1'])
+
+    def test_event_filter_applies_before_ranking(self):
+        events = [
+            EventModel.objects.create(date=datetime.date(2024, 1, index + 1), title=f'Graphs {index}', description='')
+            for index in range(3)
+        ]
+
+        page = self.get(f'/api/events?q=graphs&page_size=1&event_id={events[2].pk}')
+        self.assertEqual([row['id'] for row in page['results']], [events[2].pk])
+        self.assertIsNone(page['next'])
@@ -0,0 +1,26 @@
+from unittest import TestCase, skipUnless
+
+from django.db import connection
+
+from api.management.commands.sqlite_stress import run_stress
+
+
+@skipUnless(connection.vendor == 'sqlite', "SQLite profiles only")
+class SQLiteConcurrencyTests(TestCase):
+    # Параллельные транзакции "прочитать и записать" на отдельном файле базы со своим alias;
+    # SimpleTestCase запретил бы такие соединения, поэтому здесь unittest.TestCase
+    threads = 16
+    transactions = 50
+
+    def test_production_profile_has_no_lock_errors(self):
+        result = run_stress('production', self.threads, self.transactions)
+
+        self.assertEqual(result['journal_mode'], 'wal')
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['written'], self.threads * self.transactions)
+
+    def test_default_profile_loses_no_committed_writes(self):
+        # Без WAL и IMMEDIATE часть транзакций падает, но каждая либо записана, либо отклонена
+        result = run_stress('default', self.threads, self.transactions)
+
+        self.assertEqual(result['written'] + result['errors'], self.threads * self.transactions)
@@ -0,0 +1,76 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api import stats
+from api.models import EventModel, UserModel
+from api.tests.utils import client_for
+
+
+def counters(metric):
+    return stats.snapshot()[metric]
+
+
+def user_selects(queries):
+    return [query['sql'] for query in queries if query['sql'].startswith('SELECT') and 'api_usermodel' in query['sql']]
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        UserModel.objects.create(username='u', email='u@example.com', status='studying')
+
+    def test_status_change_moves_counter_without_reading_row(self):
+        user = UserModel.objects.get(username='u')
+
+        user.status = 'working'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+
+        self.assertEqual(user_selects(queries.captured_queries), [])
+        self.assertEqual(counters('users_by_status'), {'working': 1})
+
+    def test_update_fields_without_key_fields_skip_counters(self):
+        user = UserModel.objects.get(username='u')
+
+        user.about_me = 'Обновил описание'
+        with CaptureQueriesContext(connection) as queries:
+            user.save(update_fields=['about_me'])
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(counters('users_by_status'), {'studying': 1})
+
+    def test_deferred_status_falls_back_to_reading_row(self):
+        user = UserModel.objects.only('id', 'username').get(username='u')
+
+        user.status = 'working'
+        user.save()
+        self.assertEqual(counters('users_by_status'), {'working': 1})
+
+    def test_repeated_saves_of_new_instance_count_once(self):
+        user = UserModel(username='v', email='v@example.com', status='working')
+        user.save()
+        user.save()
+
+        self.assertEqual(counters('users_by_status'), {'studying': 1, 'working': 1})
+
+    def test_string_date_is_counted_by_month(self):
+        EventModel.objects.create(date='2024-05-17', title='Митап', description='')
+        EventModel.objects.create(date=datetime.date(2024, 5, 2), title='Ещё митап', description='')
+
+        self.assertEqual(counters('events_per_month'), {'2024-05-01': 2})
+        self.assertEqual(stats.recompute(['events_per_month']), {})
+
+
+class StatsViewTests(TestCase):
+    def test_only_staff_can_read_stats(self):
+        user = UserModel.objects.create(username='u', email='u@example.com', status='studying')
+        staff = UserModel.objects.create(username='admin', email='admin@example.com', status='working', is_staff=True)
+
+        self.assertEqual(client_for().get('/api/stats').status_code, 401)
+        self.assertEqual(client_for(user).get('/api/stats').status_code, 403)
+
+        response = client_for(staff).get('/api/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['users_by_status'], {'studying': 1, 'working': 1})
@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import throttling
+
+
+RATES = {
+    'sign_in': (3, 60),
+    'sign_up': (3, 60),
+    'contact': (3, 60),
+    'appointment': (3, 60),
+}
+
+
+@override_settings(
+    API_THROTTLE_RATES=RATES,
+    API_THROTTLE_BACKEND='memory',
+    # Неудачный вход всё равно хеширует пароль; быстрый хешер, чтобы серии шли быстро
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class ThrottleBurstTests(TestCase):
+    # Серия запросов подряд: первые capacity проходят, дальше 429 с Retry-After
+    def setUp(self):
+        cache.clear()
+        throttling.memory_store._buckets.clear()
+        self.client = APIClient()
+
+    def sign_in(self, username='victim', ip='10.0.0.1'):
+        return self.client.post(
+            '/api/login', {'username': username, 'password': 'wrong'}, format='json', REMOTE_ADDR=ip,
+        )
+
+    def assertThrottled(self, response):
+        self.assertEqual(response.status_code, 429)
+        retry_after = int(response['Retry-After'])
+        # Токен возвращается раз в period / capacity секунд
+        self.assertTrue(0 < retry_after <= 20, retry_after)
+
+    def test_burst_from_one_ip(self):
+        for index in range(3):
+            self.assertEqual(self.sign_in(username=f'user{index}').status_code, 401)
+        self.assertThrottled(self.sign_in(username='user3'))
+
+    def test_burst_against_one_account_from_many_ips(self):
+        for index in range(3):
+            self.assertEqual(self.sign_in(ip=f'10.0.1.{index}').status_code, 401)
+        self.assertThrottled(self.sign_in(ip='10.0.1.200'))
+
+        # Другой аккаунт с нового IP не задет
+        self.assertEqual(self.sign_in(username='other', ip='10.0.1.201').status_code, 401)
+
+    def test_spoofed_forwarded_for_does_not_bypass_ip_limit(self):
+        # Без прокси X-Forwarded-For задаёт клиент, ключ — REMOTE_ADDR
+        for index in range(3):
+            response = self.client.post(
+                '/api/login', {'username': f'user{index}', 'password': 'wrong'}, format='json',
+                REMOTE_ADDR='10.0.3.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{index}',
+            )
+            self.assertEqual(response.status_code, 401)
+
+        self.assertThrottled(self.client.post(
+            '/api/login', {'username': 'user3', 'password': 'wrong'}, format='json',
+            REMOTE_ADDR='10.0.3.1', HTTP_X_FORWARDED_FOR='192.0.2.200',
+        ))
+
+    def test_forwarded_for_behind_proxy(self):
+        # За одним прокси берётся адрес, который дописал прокси, а не подставленные клиентом слева
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            for index in range(3):
+                response = self.client.post(
+                    '/api/login', {'username': f'user{index}', 'password': 'wrong'}, format='json',
+                    REMOTE_ADDR='10.0.0.254', HTTP_X_FORWARDED_FOR=f'192.0.2.{index}, 198.51.100.7',
+                )
+                self.assertEqual(response.status_code, 401)
+
+            self.assertThrottled(self.client.post(
+                '/api/login', {'username': 'user3', 'password': 'wrong'}, format='json',
+                REMOTE_ADDR='10.0.0.254', HTTP_X_FORWARDED_FOR='192.0.2.200, 198.51.100.7',
+            ))
+            # Другой клиент за тем же прокси не задет
+            response = self.client.post(
+                '/api/login', {'username': 'user4', 'password': 'wrong'}, format='json',
+                REMOTE_ADDR='10.0.0.254', HTTP_X_FORWARDED_FOR='198.51.100.8',
+            )
+            self.assertEqual(response.status_code, 401)
+
+    def test_tokens_refill_over_time(self):
+        with mock.patch('api.throttling.time.monotonic', return_value=1000.0):
+            for _ in range(3):
+                self.sign_in()
+            self.assertEqual(self.sign_in().status_code, 429)
+
+        # Через 20 секунд возвращается один токен
+        with mock.patch('api.throttling.time.monotonic', return_value=1020.0):
+            self.assertEqual(self.sign_in().status_code, 401)
+            self.assertEqual(self.sign_in().status_code, 429)
+
+    def test_non_object_body_is_rejected_not_crashed(self):
+        for body in ([1, 2], 'text', 42):
+            with self.subTest(body=body):
+                throttling.memory_store._buckets.clear()
+                response = self.client.post('/api/login', body, format='json')
+                self.assertEqual(response.status_code, 400)
+
+    def test_non_object_body_is_still_limited_by_ip(self):
+        for _ in range(3):
+            self.client.post('/api/login', [1, 2], format='json', REMOTE_ADDR='10.0.2.1')
+        self.assertThrottled(self.client.post('/api/login', [1, 2], format='json', REMOTE_ADDR='10.0.2.1'))
+
+    def test_get_is_not_throttled(self):
+        for _ in range(10):
+            self.assertEqual(self.client.get('/api/contacts').status_code, 200)
+
+
+@override_settings(API_THROTTLE_BACKEND='cache')
+class CacheThrottleBurstTests(ThrottleBurstTests):
+    # То же через кэш Django, общий для воркеров
+    def test_buckets_live_in_cache(self):
+        self.sign_in()
+        self.assertFalse(throttling.memory_store._buckets)
+        self.assertIsNotNone(cache.get('api:throttle:sign_in:ip:10.0.0.1'))
+
+    def test_tokens_refill_over_time(self):
+        with mock.patch('api.throttling.time.time', return_value=1000.0):
+            for _ in range(3):
+                self.sign_in()
+            self.assertEqual(self.sign_in().status_code, 429)
+
+        with mock.patch('api.throttling.time.time', return_value=1020.0):
+            self.assertEqual(self.sign_in().status_code, 401)
+            self.assertEqual(self.sign_in().status_code, 429)
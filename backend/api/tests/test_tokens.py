@@ -0,0 +1,143 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import MentorModel, UserModel
+from api.tokens import issue_tokens, read_access_token, read_refresh_token
+
+
+PASSWORD = 'Long-enough-passw0rd'
+
+
+def later(seconds):
+    # Часы signing сдвигаются вперёд, как если бы токен пролежал seconds секунд
+    return mock.patch('django.core.signing.time.time', return_value=time.time() + seconds)
+
+
+class TokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(username='user', email='user@example.com', password=PASSWORD)
+
+    def bearer(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def refresh(self, token):
+        return APIClient().post('/api/token/refresh', {'refresh': token}, format='json')
+
+    def test_issue_and_verify(self):
+        mentor = MentorModel.objects.create_user(username='mentor', email='mentor@example.com', password=PASSWORD)
+
+        for account in (self.user, mentor):
+            with self.subTest(kind=account._meta.model_name):
+                tokens = issue_tokens(account)
+                self.assertEqual(read_access_token(tokens['access']), {
+                    'uid': account.pk, 'kind': account._meta.model_name, 'staff': False, 'superuser': False,
+                })
+                self.assertEqual(read_refresh_token(tokens['refresh'])['uid'], account.pk)
+
+    def test_access_token_is_checked_without_queries(self):
+        client = self.bearer(issue_tokens(self.user)['access'])
+
+        # Задачи видит только владелец: 404, а не 401, значит токен принят; база читается только ради задачи
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get('/api/jobs/1').status_code, 404)
+        self.assertEqual([sql for sql in (query['sql'] for query in queries) if 'api_usermodel' in sql], [])
+
+    def test_sign_in_issues_tokens(self):
+        response = APIClient().post('/api/login', {'username': 'user', 'password': PASSWORD}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read_access_token(response.data['access'])['uid'], self.user.pk)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, 200)
+
+    def test_expired_tokens_are_rejected(self):
+        tokens = issue_tokens(self.user)
+
+        with later(settings.API_ACCESS_TOKEN_LIFETIME + 1):
+            self.assertEqual(self.bearer(tokens['access']).get('/api/jobs/1').status_code, 401)
+            self.assertEqual(self.refresh(tokens['refresh']).status_code, 200)
+
+        with later(settings.API_REFRESH_TOKEN_LIFETIME + 1):
+            self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+
+    def test_tampered_tokens_are_rejected(self):
+        tokens = issue_tokens(self.user)
+        payload, signature = tokens['access'].split(':', 1)
+        forged = signing.dumps({'uid': self.user.pk, 'kind': 'usermodel', 'staff': True, 'superuser': True})
+
+        for token in (
+            f'{payload[:-1]}{"A" if payload[-1] != "A" else "B"}:{signature}',
+            f'{payload}:{signature[:-1]}',
+            # Подпись без соли access-токенов и refresh-токен вместо access
+            forged,
+            tokens['refresh'],
+        ):
+            with self.subTest(token=token):
+                self.assertEqual(self.bearer(token).get('/api/jobs/1').status_code, 401)
+
+        self.assertEqual(self.refresh(tokens['access']).status_code, 401)
+
+    def test_refresh_rotates_tokens(self):
+        tokens = issue_tokens(self.user)
+
+        with later(60):
+            response = self.refresh(tokens['refresh'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['refresh'], tokens['refresh'])
+        self.assertEqual(read_refresh_token(response.data['refresh'])['uid'], self.user.pk)
+        self.assertEqual(read_access_token(response.data['access'])['uid'], self.user.pk)
+
+    def test_password_change_revokes_refresh_tokens(self):
+        tokens = issue_tokens(self.user)
+
+        self.user.set_password('Another-passw0rd')
+        self.user.save()
+
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+        self.assertEqual(self.refresh(issue_tokens(self.user)['refresh']).status_code, 200)
+
+    def test_inactive_user_cannot_refresh(self):
+        tokens = issue_tokens(self.user)
+        UserModel.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+
+
+class StatelessAPIMiddlewareTests(TestCase):
+    def session_queries(self, path):
+        client = APIClient()
+        client.cookies['sessionid'] = 'x' * 32
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path)
+        return response, [query['sql'] for query in queries if 'django_session' in query['sql']]
+
+    def test_api_requests_skip_sessions(self):
+        response, queries = self.session_queries('/api/categories')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_other_paths_keep_sessions(self):
+        # Админке нужен манифест статики, которого в тестах нет
+        self.enterContext(override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }))
+        response, queries = self.session_queries('/admin/login/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import MentorModel, UserModel
+
+
+HIDDEN_FIELDS = {'password', 'is_superuser', 'is_staff', 'groups', 'user_permissions'}
+
+
+class UserPayloadTests(TestCase):
+    def setUp(self):
+        # Регистрация ограничена троттлингом, счётчики живут в кэше
+        cache.clear()
+        self.client = APIClient()
+
+    def test_anonymous_detail_hides_password_and_privileges(self):
+        user = UserModel.objects.create_user(username='user', email='user@example.com', password='Long-enough-passw0rd')
+        mentor = MentorModel.objects.create_user(username='mentor', email='mentor@example.com', password='Long-enough-passw0rd')
+
+        for path in (f'/api/users/{user.pk}', f'/api/mentors/{mentor.pk}'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(HIDDEN_FIELDS & set(response.data), set())
+                self.assertIn('username', response.data)
+
+    def test_sign_up_response_hides_password_and_privileges(self):
+        for username, path in (('newuser', '/api/register/user'), ('newmentor', '/api/register/mentor')):
+            with self.subTest(path=path):
+                response = self.client.post(path, {
+                    'username': username, 'email': f'{username}@example.com',
+                    'password': 'Long-enough-passw0rd', 'is_staff': True,
+                }, format='json')
+                self.assertEqual(response.status_code, 201, response.data)
+                self.assertEqual(HIDDEN_FIELDS & set(response.data), set())
+                self.assertIn('access', response.data)
+
+                user = UserModel.objects.get(username=username)
+                self.assertFalse(user.is_staff)
+                self.assertTrue(user.check_password('Long-enough-passw0rd'))
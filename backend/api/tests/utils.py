@@ -0,0 +1,11 @@
+from rest_framework.test import APIClient
+
+from api.tokens import issue_tokens
+
+
+def client_for(user=None):
+    # Клиент с access-токеном пользователя; без пользователя — анонимный
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(user)['access']}")
+    return client
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+class MemoryBucketStore:
+    # Корзины в памяти процесса; самые давние ключи вытесняются при переполнении
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            allowed, tokens, wait = refill_and_take(tokens, updated_at, capacity, rate, now)
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return allowed, wait
+
+
+class CacheBucketStore:
+    # Общий для воркеров вариант через кэш Django; без блокировки, поэтому при
+    # одновременных запросах лимит соблюдается приблизительно
+    def take(self, key, capacity, rate, now):
+        key = f'api:throttle:{key}'
+        tokens, updated_at = cache.get(key) or (capacity, now)
+        allowed, tokens, wait = refill_and_take(tokens, updated_at, capacity, rate, now)
+
+        cache.set(key, (tokens, now), int(capacity / rate) + 1)
+        return allowed, wait
+
+
+def refill_and_take(tokens, updated_at, capacity, rate, now):
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, None
+    return False, tokens, (1 - tokens) / rate
+
+
+memory_store = MemoryBucketStore(settings.API_THROTTLE_MAX_KEYS)
+cache_store = CacheBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    # scope задаётся в подклассе, лимиты — в API_THROTTLE_RATES: (ёмкость корзины, период в секундах)
+    scope = None
+    methods = ('POST',)
+
+    def get_keys(self, request):
+        raise NotImplementedError
+
+    def get_store(self):
+        return cache_store if settings.API_THROTTLE_BACKEND == 'cache' else memory_store
+
+    def allow_request(self, request, view):
+        if request.method not in self.methods:
+            return True
+
+        capacity, period = settings.API_THROTTLE_RATES[self.scope]
+        rate = capacity / period
+        now = time.monotonic() if settings.API_THROTTLE_BACKEND != 'cache' else time.time()
+
+        self.wait_time = None
+        for key in self.get_keys(request):
+            allowed, wait = self.get_store().take(f'{self.scope}:{key}', capacity, rate, now)
+            if not allowed:
+                self.wait_time = wait
+                return False
+
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_keys(self, request):
+        return [f'ip:{self.get_ident(request)}']
+
+
+class IdentityThrottle(TokenBucketThrottle):
+    # Ключ по логину или почте из тела запроса: перебор одного аккаунта с разных IP
+    fields = ('username', 'email', 'mail')
+
+    def get_keys(self, request):
+        # Тело-массив или скаляр: ключей по аккаунту нет, остаётся лимит по IP
+        if not isinstance(request.data, Mapping):
+            return []
+
+        keys = []
+        for field in self.fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value:
+                keys.append(f'{field}:{value.strip().lower()}')
+        return keys
+
+
+def throttles(scope):
+    name = ''.join(part.title() for part in scope.split('_'))
+    return [
+        type(f'{name}IPThrottle', (IPThrottle,), {'scope': scope}),
+        type(f'{name}IdentityThrottle', (IdentityThrottle,), {'scope': scope}),
+    ]
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+
+
+ACCESS_SALT = 'api.tokens.access'
+REFRESH_SALT = 'api.tokens.refresh'
+
+
+def access_token(payload):
+    return signing.dumps(payload, salt=ACCESS_SALT)
+
+
+def access_payload(user):
+    # Флаги прав едут в access-токене, чтобы IsAdminUser не читал базу. Живут, пока жив токен;
+    # при обновлении токена перечитываются из базы
+    return {
+        'uid': user.pk,
+        'kind': user._meta.model_name,
+        'staff': user.is_staff,
+        'superuser': user.is_superuser,
+    }
+
+
+def password_fingerprint(user):
+    # HMAC от хэша пароля, как у сессий Django: смена пароля отзывает выданные refresh-токены
+    return user.get_session_auth_hash()
+
+
+def refresh_payload(user):
+    return {'uid': user.pk, 'kind': user._meta.model_name, 'pwd': password_fingerprint(user)}
+
+
+def refresh_matches(user, payload):
+    return constant_time_compare(payload.get('pwd', ''), password_fingerprint(user))
+
+
+def issue_tokens(user):
+    # При каждом обновлении выдаётся и новый refresh-токен, срок жизни отсчитывается заново
+    return {
+        'access': access_token(access_payload(user)),
+        'refresh': signing.dumps(refresh_payload(user), salt=REFRESH_SALT),
+    }
+
+
+def read_access_token(token):
+    return signing.loads(token, salt=ACCESS_SALT, max_age=settings.API_ACCESS_TOKEN_LIFETIME)
+
+
+def read_refresh_token(token):
+    return signing.loads(token, salt=REFRESH_SALT, max_age=settings.API_REFRESH_TOKEN_LIFETIME)
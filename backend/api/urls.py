@@ -1,13 +1,16 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 
 urlpatterns = [
     path('login', views.sign_in, name="sign in"),
+    path('token/refresh', views.refresh_token, name="token refresh"),
     path('meta', views.MetaAPIView.as_view(), name="meta"),
+    path('meta/<str:key>', views.MetaAPIView.as_view(), name="meta-by-key"),
     path('register/user', views.sign_up, name="sign up"),
     path('register/mentor', views.sign_up_mentor, name="sign up mentor"),
     path('users', views.UserView.as_view(), name="users"),
+    path('users/bulk', views.UserBulkView.as_view(), name="users-bulk"),
     path('users/<int:pk>', views.UserView.as_view(), name="users-by-id"),
     path('mentors', views.MentorView.as_view(), name="mentors"),
     path('mentors/<int:pk>', views.MentorView.as_view(), name="mentors-by-id"),
@@ -18,9 +21,28 @@ urlpatterns = [
     path('appointments', views.MentorAppointmentView.as_view(), name="appointments"),
     path('appointments/<int:pk>', views.MentorAppointmentView.as_view(), name="appointments-by-id"),
     path('categories', views.CategoryView.as_view(), name="categories"),
+    path('categories/bulk', views.CategoryBulkView.as_view(), name="categories-bulk"),
     path('categories/<int:pk>', views.CategoryView.as_view(), name="categories-by-id"),
     path('results', views.ResultView.as_view(), name="results"),
+    path('results/analytics', views.ResultAnalyticsView.as_view(), name="results-analytics"),
+    path('results/bulk', views.ResultBulkView.as_view(), name="results-bulk"),
     path('results/<int:pk>', views.ResultView.as_view(), name="results-by-id"),
     path('events', views.EventView.as_view(), name="events"),
+    path('events/bulk', views.EventBulkView.as_view(), name="events-bulk"),
     path('events/<int:pk>', views.EventView.as_view(), name="events-by-id"),
-]
+    path('stats', views.StatsView.as_view(), name="stats"),
+    path('export/<str:filename>', views.ExportView.as_view(), name="export"),
+    path('jobs/<int:pk>', views.JobView.as_view(), name="jobs-by-id"),
+    path('jobs/<int:pk>/file', views.JobFileView.as_view(), name="jobs-file"),
+
+    # Async-версии читающих эндпоинтов для запуска под ASGI (uvicorn)
+    path('async/posts/', async_views.AsyncArticleView.as_view(), name="async-articles"),
+    path('async/posts/<int:pk>', async_views.AsyncArticleView.as_view(), name="async-articles-by-id"),
+    path('async/events', async_views.AsyncEventView.as_view(), name="async-events"),
+    path('async/events/<int:pk>', async_views.AsyncEventView.as_view(), name="async-events-by-id"),
+    path('async/categories', async_views.AsyncCategoryView.as_view(), name="async-categories"),
+    path('async/categories/<int:pk>', async_views.AsyncCategoryView.as_view(), name="async-categories-by-id"),
+    path('async/mentors', async_views.AsyncMentorView.as_view(), name="async-mentors"),
+    path('async/mentors/<int:pk>', async_views.AsyncMentorView.as_view(), name="async-mentors-by-id"),
+    path('async/meta/<str:key>', async_views.AsyncMetaView.as_view(), name="async-meta-by-key"),
+]
\ No newline at end of file
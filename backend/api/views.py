@@ -1,14 +1,37 @@
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.core import signing
+from django.core.files.storage import storages
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 
+from . import search, stats
+from .analytics import PERIODS, result_analytics
+from .bulk import BulkAPIView
+from .cache import VersionedLRU, bump_version, cached_response
+from .export import EXPORTS, FORMATS, export_fields, export_stream
+from .jobs import enqueue, owner_key
+from .conditional import conditional, conditional_get
+from .mixins import SparseFieldsMixin, ValuesListMixin
+from .rendering import render_instance, schedule_embedded_variants
+from .throttling import throttles
+from .tokens import issue_tokens, read_refresh_token, refresh_matches
 from .serializers import (
     ResultSerializer,
     UserSerializer, 
@@ -16,9 +39,17 @@ from .serializers import (
     MentorAppointmentSerializer,
     ContactSerializer, 
     MetaSerializer,
+    JobSerializer,
     CategorySerializer,
     EventSerializer,
     MentorSerializer,
+    UserListSerializer,
+    MentorListSerializer,
+    ResultListSerializer,
+    ArticleListSerializer,
+    ContactListSerializer,
+    MentorAppointmentListSerializer,
+    EventListSerializer,
 )
 
 from .models import (
@@ -30,21 +61,62 @@ from .models import (
     CategoryModel,
     EventModel,
     Meta,
-    MentorModel
+    MentorModel,
+    Job,
 )
 
 
+meta_cache = VersionedLRU('meta', settings.META_CACHE_SIZE)
+
+
+def load_meta(keys):
+    return {obj.key: obj for obj in Meta.objects.filter(key__in=keys)}
+
+
+def get_meta(keys):
+    return meta_cache.get_many(keys, load_meta)
+
+
+def meta_keys(request, key=None):
+    if key is not None:
+        return [key.replace("$", "/")]
+
+    return list(dict.fromkeys(item.replace("$", "/") for item in request.query_params.getlist('key')))
+
+
+def meta_state(request, key=None):
+    found = [obj for obj in get_meta(meta_keys(request, key)).values() if obj is not None]
+    return {
+        'last_modified': max((obj.updated_at for obj in found), default=None),
+        'count': len(found),
+    }
+
+
 class MetaAPIView(APIView):
-    def get(self, request, key):
-        try:
-            obj: Meta = Meta.objects.get(key=key.replace("$", "/"))
-            return Response({"data": MetaSerializer(obj).data})
-        except:
-            return Response(f"Couldn't load {key.replace('$', '/')}")
+    @conditional('api.Meta', meta_state)
+    def get(self, request, key=None):
+        keys = meta_keys(request, key)
+
+        if key is None:
+            if len(keys) > settings.META_BATCH_MAX_KEYS:
+                return Response(
+                    {"message": f"Too many keys, max is {settings.META_BATCH_MAX_KEYS}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
+            found = get_meta(keys)
+            return Response({"data": {meta_key: MetaSerializer(obj).data for meta_key, obj in found.items() if obj is not None}})
 
-class MentorView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+        obj = get_meta(keys)[keys[0]]
+        if obj is None:
+            return Response(f"Couldn't load {keys[0]}")
+
+        return Response({"data": MetaSerializer(obj).data})
+
+
+class MentorView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = MentorSerializer
+    list_serializer_class = MentorListSerializer
     parser_classes = [MultiPartParser, FormParser]
     
     def get_queryset(self):
@@ -63,13 +135,11 @@ class MentorView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            user = get_object_or_404(MentorModel, id=kwargs['pk'])
+            user = get_object_or_404(self.sparse_queryset(MentorModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -110,8 +180,9 @@ class MentorView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "user was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class UserView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class UserView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
+    list_serializer_class = UserListSerializer
     parser_classes = [MultiPartParser, FormParser]
     
     def get_queryset(self):
@@ -130,13 +201,11 @@ class UserView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            user = get_object_or_404(UserModel, id=kwargs['pk'])
+            user = get_object_or_404(self.sparse_queryset(UserModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -177,7 +246,7 @@ class UserView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "user was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class CategoryView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class CategoryView(SparseFieldsMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = CategorySerializer
 
     def get_queryset(self):
@@ -188,9 +257,10 @@ class CategoryView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
 
         return CategoryModel.objects.all()
     
+    @cached_response('categories')
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            article = get_object_or_404(CategoryModel, id=kwargs['pk'])
+            article = get_object_or_404(self.sparse_queryset(CategoryModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(article)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
@@ -225,36 +295,39 @@ class CategoryView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "category was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class ArticleView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class ArticleView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = ArticleSerializer
+    list_serializer_class = ArticleListSerializer
+    search_kind = 'article'
+    search_fields = ('title', 'text', 'author')
 
     def get_queryset(self):
         article_id = self.request.query_params.get('article_id')
         category_ids = self.request.query_params.getlist('category_id')
         title = self.request.query_params.get('title')
 
-        queryset = ArticleModel.objects.all()
+        queryset = ArticleModel.objects.prefetch_related('categories')
 
         if article_id:
             return queryset.filter(id=article_id)
         
         if category_ids:
-            return queryset.filter(categories__id__in=category_ids)
+            return queryset.filter(categories__id__in=category_ids).distinct()
         
         if title:
             return queryset.filter(title_en=title)
 
         return queryset
     
+    @conditional_get(ArticleModel)
+    @cached_response('articles')
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            article = get_object_or_404(ArticleModel, id=kwargs['pk'])
+            article = get_object_or_404(self.sparse_queryset(ArticleModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(article)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -287,8 +360,10 @@ class ArticleView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "article was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class ContactView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class ContactView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = ContactSerializer
+    list_serializer_class = ContactListSerializer
+    throttle_classes = throttles('contact')
 
     def get_queryset(self):
         contact_id = self.request.query_params.get('contact_id')
@@ -300,18 +375,18 @@ class ContactView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            contact = get_object_or_404(ContactModel, id=kwargs['pk'])
+            contact = get_object_or_404(self.sparse_queryset(ContactModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(contact)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # Заявка и уведомления о ней в outbox фиксируются вместе; отправляет их process_outbox
+        with transaction.atomic():
+            serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def put(self, request, *args, **kwargs):
@@ -334,8 +409,10 @@ class ContactView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "contact was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class MentorAppointmentView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class MentorAppointmentView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = MentorAppointmentSerializer
+    list_serializer_class = MentorAppointmentListSerializer
+    throttle_classes = throttles('appointment')
 
     def get_queryset(self):
         appointment_id = self.request.query_params.get('appointment_id')
@@ -347,18 +424,18 @@ class MentorAppointmentView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            appointment = get_object_or_404(MentorAppointmentModel, id=kwargs['pk'])
+            appointment = get_object_or_404(self.sparse_queryset(MentorAppointmentModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(appointment)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # Заявка и уведомления о ней в outbox фиксируются вместе; отправляет их process_outbox
+        with transaction.atomic():
+            serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def put(self, request, *args, **kwargs):
@@ -380,8 +457,9 @@ class MentorAppointmentView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "Employee deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class ResultView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class ResultView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = ResultSerializer
+    list_serializer_class = ResultListSerializer
 
     def get_queryset(self):
         result_id = self.request.query_params.get('result_id')
@@ -398,13 +476,11 @@ class ResultView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            result = get_object_or_404(ResultModel, id=kwargs['pk'])
+            result = get_object_or_404(self.sparse_queryset(ResultModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(result)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -433,8 +509,38 @@ class ResultView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "result was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class EventView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
+class ResultAnalyticsView(APIView):
+    # Распределения, перцентили и когорты по датам; ?bins=, ?period=day|week|month|year, ?date_from=, ?date_to=
+    @cached_response('results')
+    def get(self, request, *args, **kwargs):
+        period = request.query_params.get('period', 'month')
+        if period not in PERIODS:
+            return Response({"message": f"Unknown period, expected one of {', '.join(PERIODS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            bins = int(request.query_params.get('bins', settings.RESULT_HISTOGRAM_BINS))
+        except ValueError:
+            bins = 0
+        if not 1 <= bins <= settings.RESULT_HISTOGRAM_MAX_BINS:
+            return Response({"message": f"bins must be between 1 and {settings.RESULT_HISTOGRAM_MAX_BINS}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = ResultModel.objects.order_by()
+        for param, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lte')):
+            value = request.query_params.get(param)
+            if value:
+                date = parse_date(value)
+                if date is None:
+                    return Response({"message": f"Invalid {param}, expected YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+                queryset = queryset.filter(**{lookup: date})
+
+        return Response(result_analytics(queryset, bins, period), status=status.HTTP_200_OK)
+
+
+class EventView(ValuesListMixin, ListCreateAPIView, RetrieveUpdateDestroyAPIView):
     serializer_class = EventSerializer
+    list_serializer_class = EventListSerializer
+    search_kind = 'event'
+    search_fields = ('title', 'description')
 
     def get_queryset(self):
         event_id = self.request.query_params.get('event_id')
@@ -444,15 +550,15 @@ class EventView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
 
         return EventModel.objects.all()
     
+    @conditional_get(EventModel)
+    @cached_response('events')
     def get(self, request, *args, **kwargs):
         if 'pk' in kwargs:
-            result = get_object_or_404(EventModel, id=kwargs['pk'])
+            result = get_object_or_404(self.sparse_queryset(EventModel.objects.all()), id=kwargs['pk'])
             serializer = self.get_serializer(result)
             return Response(serializer.data, status=status.HTTP_200_OK) 
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -485,17 +591,180 @@ class EventView(ListCreateAPIView, RetrieveUpdateDestroyAPIView):
         return Response({"message": "event was deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
+class UserBulkView(BulkAPIView):
+    model = UserModel
+    serializer_class = UserSerializer
+
+    def get_serializer(self, **kwargs):
+        serializer = super().get_serializer(**kwargs)
+        # Без пароля пользователь создаётся с неиспользуемым паролем и задаёт его сам
+        serializer.fields['password'].required = False
+        return serializer
+
+    def prepare_data(self, rows, partial):
+        with_password = []
+        for row in rows:
+            if row.get('password'):
+                with_password.append(row)
+            elif not partial:
+                row['password'] = make_password(None)
+
+        # PBKDF2 отпускает GIL, поэтому пароли хешируются параллельно
+        with ThreadPoolExecutor(max_workers=settings.API_BULK_HASH_WORKERS) as executor:
+            passwords = executor.map(make_password, [row['password'] for row in with_password])
+
+            for row, password in zip(with_password, passwords):
+                row['password'] = password
+
+    def prepare(self, instances, fields=None):
+        # То, что для одной записи делают UserModel.save() и сигнал set_user_active
+        for instance in instances:
+            if not instance.patronymic:
+                instance.patronymic = ""
+            if fields is None:
+                instance.is_active = True
+
+        return fields
+
+    def after_write(self, instances):
+        # bulk_create и bulk_update не шлют сигналов, поэтому счётчик пересчитывается целиком
+        stats.recompute(['users_by_status'])
+
+
+class ResultBulkView(BulkAPIView):
+    model = ResultModel
+    serializer_class = ResultSerializer
+
+    def after_write(self, instances):
+        transaction.on_commit(lambda: bump_version('results'))
+
+
+class EventBulkView(BulkAPIView):
+    model = EventModel
+    serializer_class = EventSerializer
+
+    def prepare(self, instances, fields=None):
+        if fields is None or 'description' in fields:
+            images = []
+            for instance in instances:
+                images.extend(render_instance(instance, 'description'))
+            schedule_embedded_variants(images)
+
+            if fields is not None:
+                fields = fields | {'description_html', 'excerpt', 'reading_time'}
+
+        return fields
+
+    def after_write(self, instances):
+        for instance in instances:
+            search.update_index('event', instance)
+        stats.recompute(['events_per_month'])
+        transaction.on_commit(lambda: bump_version('events'))
+
+
+class CategoryBulkView(BulkAPIView):
+    model = CategoryModel
+    serializer_class = CategorySerializer
+
+    def after_write(self, instances):
+        transaction.on_commit(lambda: (bump_version('categories'), bump_version('articles')))
+
+
+class JobView(APIView):
+    # Задача видна только тому, кто её поставил; для остальных её нет
+    permission_classes = [IsAuthenticated]
+
+    def get_job(self, request, pk):
+        return get_object_or_404(Job, pk=pk, owner=owner_key(request.user))
+
+    def get(self, request, pk, *args, **kwargs):
+        job = self.get_job(request, pk)
+        return Response(JobSerializer(job, context={'request': request}).data, status=status.HTTP_200_OK)
+
+
+class JobFileView(JobView):
+    def get(self, request, pk, *args, **kwargs):
+        job = self.get_job(request, pk)
+        name = (job.result or {}).get('file') if job.status == Job.SUCCEEDED else None
+        if not name or not storages['exports'].exists(name):
+            raise Http404
+
+        return FileResponse(storages['exports'].open(name), as_attachment=True, filename=os.path.basename(name))
+
+
+class StatsView(APIView):
+    # Счётчики дашборда читаются из StatCounter одним запросом, без обхода исходных таблиц
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(stats.snapshot(), status=status.HTTP_200_OK)
+
+
+class ExportView(SparseFieldsMixin, APIView):
+    # /api/export/users.csv, /api/export/contacts.ndjson.gz: файл собирается по мере отправки.
+    # POST ставит ту же выгрузку в фоновые задачи, ссылка на файл появится в /api/jobs/<id>.
+    # Выгрузки с персональными данными — только для администраторов
+    permission_classes = [IsAdminUser]
+
+    def parse_filename(self, filename):
+        resource, _, extension = filename.partition('.')
+        fmt, _, compression = extension.partition('.')
+
+        if resource not in EXPORTS or fmt not in FORMATS or compression not in ('', 'gz'):
+            return None
+        return resource, fmt, bool(compression)
+
+    def unknown_export(self, filename):
+        return Response(
+            {"message": f"Unknown export {filename}, expected <{'|'.join(EXPORTS)}>.<{'|'.join(FORMATS)}>[.gz]"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    def post(self, request, filename):
+        parsed = self.parse_filename(filename)
+        if parsed is None:
+            return self.unknown_export(filename)
+
+        resource, fmt, compress = parsed
+        fields = export_fields(EXPORTS[resource][1], *self.get_requested_fields())
+        job = enqueue(
+            'export', {'resource': resource, 'fmt': fmt, 'fields': list(fields), 'compress': compress},
+            owner=owner_key(request.user),
+        )
+
+        return Response(JobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request, filename):
+        parsed = self.parse_filename(filename)
+        if parsed is None:
+            return self.unknown_export(filename)
+
+        resource, fmt, compress = parsed
+        fields = export_fields(EXPORTS[resource][1], *self.get_requested_fields())
+        stream = export_stream(resource, fmt, fields, request=request, compress=compress)
+
+        response = StreamingHttpResponse(stream, content_type='application/gzip' if compress else FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(throttles('sign_in'))
 def sign_in(request, *args, **kwargs):
+    if not isinstance(request.data, Mapping):
+        return Response({"message": "Expected a JSON object"}, status=status.HTTP_400_BAD_REQUEST)
+
     username = request.data.get('username')
     password = request.data.get('password')
 
     try:
-        user = UserModel.objects.filter(username=username)
         user = authenticate(request, username=username, password=password)
         if user is not None:
-            return Response({"message": "Authentication successful", "user_id": user.id}, status=status.HTTP_200_OK)
+            return Response(
+                {"message": "Authentication successful", "user_id": user.id, **issue_tokens(user)},
+                status=status.HTTP_200_OK
+            )
         else:
             return Response({"message": "Authentication failed"}, status=status.HTTP_401_UNAUTHORIZED)
     except Exception as e:
@@ -504,6 +773,7 @@ def sign_in(request, *args, **kwargs):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(throttles('sign_up'))
 def sign_up(request, *args, **kwargs):
     serializer = UserSerializer(data=request.data)
     
@@ -514,13 +784,14 @@ def sign_up(request, *args, **kwargs):
         user.set_password(password)
         user.save()
         
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response({**serializer.data, **issue_tokens(user)}, status=status.HTTP_201_CREATED)
     else:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(throttles('sign_up'))
 def sign_up_mentor(request, *args, **kwargs):
     serializer = MentorSerializer(data=request.data)
     
@@ -531,6 +802,26 @@ def sign_up_mentor(request, *args, **kwargs):
         user.set_password(password)
         user.save()
         
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response({**serializer.data, **issue_tokens(user)}, status=status.HTTP_201_CREATED)
     else:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def refresh_token(request, *args, **kwargs):
+    if not isinstance(request.data, Mapping):
+        return Response({"message": "Expected a JSON object"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        payload = read_refresh_token(request.data.get('refresh', ''))
+        model = apps.get_model('api', payload['kind'])
+    except (signing.BadSignature, LookupError):
+        return Response({"message": "Invalid or expired refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    # Один запрос: снятые права, отключённые пользователи и сменённый пароль не получают новых токенов
+    user = model.objects.filter(pk=payload['uid'], is_active=True).only('password', 'is_staff', 'is_superuser').first()
+    if user is None or not refresh_matches(user, payload):
+        return Response({"message": "Invalid or expired refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    return Response(issue_tokens(user), status=status.HTTP_200_OK)
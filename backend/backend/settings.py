@@ -51,12 +51,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.NonAPISessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'api.middleware.NonAPIAuthenticationMiddleware',
+    'api.middleware.NonAPIMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -84,18 +84,109 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgres переключает на PostgreSQL с параметрами из окружения,
+# по умолчанию используется SQLite
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+SQLITE_PRAGMAS = {}
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'timetracker'),
+            'USER': os.environ.get('POSTGRES_USER', 'timetracker'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'timetracker'),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+            # Пул psycopg (psycopg[pool]) общий на процесс; с пулом CONN_MAX_AGE должен быть 0
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 10)),
+                    'timeout': 10,
+                },
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
+    # Профиль SQLite: "default" — как есть, "production" — WAL, постоянные соединения
+    # и ожидание блокировки вместо "database is locked"
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+
+    # Параметры профиля "production"; их же сравнивает с профилем по умолчанию manage.py sqlite_stress
+    SQLITE_PRODUCTION_OPTIONS = {
+        'timeout': 20,
+        # Запись сразу берёт RESERVED-блокировку и ждёт по busy_timeout,
+        # а не падает при повышении блокировки посреди транзакции
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+    SQLITE_PRODUCTION_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 20000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    }
+
+    if SQLITE_PROFILE == 'production':
+        DATABASES['default'].update({
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': dict(SQLITE_PRODUCTION_OPTIONS),
+        })
+        SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Локальная память годится для разработки и тестов; при нескольких воркерах
+# нужен общий бэкенд, иначе инвалидация не дойдёт до других процессов
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
     }
-}
+
+API_RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Размер LRU мета-данных в памяти каждого воркера и лимит ключей в пакетном запросе
+META_CACHE_SIZE = 2048
+META_BATCH_MAX_KEYS = 1000
 
 
 AUTHENTICATION_BACKENDS = [
-    'api.backends.CustomUserBackend',
-    'api.backends.MentorBackend',
-    'django.contrib.auth.backends.ModelBackend',  # По умолчанию используется для аутентификации обычных пользователей
+    'api.backends.UserAndMentorBackend',  # Пользователи и менторы одним запросом
+]
+
+# Число итераций PBKDF2; при изменении хэши пересчитываются при следующем входе
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 720000))
+
+PASSWORD_HASHERS = [
+    'api.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
 ]
 
 
@@ -136,15 +227,147 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_DIR = os.path.join(BASE_DIR, 'static')
 STATICFILES_DIRS = [STATIC_DIR]
-# STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic пишет хэшированные имена и готовые .gz/.br рядом с ними
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'api.storage.CompressedManifestStaticFilesStorage',
+    },
+    # Выгрузки фоновых задач: вне MEDIA_ROOT, поэтому ни nginx, ни serve_media их не отдают.
+    # Скачиваются только владельцем задачи через /api/jobs/<id>/file
+    'exports': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {'location': BASE_DIR / 'private'},
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Отдача медиа: "debug" — только при DEBUG, "direct" — воркером с поддержкой Range,
+# "x-accel" — через X-Accel-Redirect в internal location nginx:
+#   location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MEDIA_SERVING = os.environ.get('MEDIA_SERVING', 'debug')
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
 CKEDITOR_UPLOAD_PATH = "uploads/"
 
+# Уменьшенные копии загруженных изображений (WebP), размеры — максимальные ширина и высота
+IMAGE_VARIANTS = {
+    'thumbnail': (160, 160),
+    'card': (640, 640),
+}
+IMAGE_VARIANT_DIR = 'variants'
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_WORKERS = 2
+# 'thread' — пул потоков веб-процесса, 'jobs' — фоновые задачи manage.py runworker
+IMAGE_VARIANT_QUEUE = os.environ.get('IMAGE_VARIANT_QUEUE', 'thread')
+
+# Подготовка HTML из ckeditor при сохранении: очищенная разметка, анонс и время чтения
+RICH_TEXT_EXCERPT_WORDS = 40
+RICH_TEXT_WORDS_PER_MINUTE = 200
+RICH_TEXT_IMAGE_VARIANT = 'card'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
+
+
+# Pagination
+# Списки отдаются страницами по курсору; ?all=true возвращает весь список без пагинации
+
+API_MAX_PAGE_SIZE = 200
+
+# Пакетные эндпоинты /bulk: лимиты тела и строк в запросе, размер пачки для проверки и записи,
+# число потоков для хеширования паролей
+API_BULK_MAX_BODY_SIZE = 64 * 1024 * 1024
+API_BULK_MAX_ROWS = 100000
+API_BULK_BATCH_SIZE = 1000
+API_BULK_HASH_WORKERS = os.cpu_count() or 4
+
+# Потоковые выгрузки /api/export и manage.py export_data: строк на пачку курсора, уровень gzip
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_GZIP_LEVEL = 6
+
+# /api/results/analytics: число интервалов гистограммы по умолчанию и максимум
+RESULT_HISTOGRAM_BINS = 10
+RESULT_HISTOGRAM_MAX_BINS = 100
+
+# Outbox уведомлений о сообщениях и записях к менторам (manage.py process_outbox).
+# Канал -> класс отправителя; для тестов подходит {'test': 'api.notifications.LocMemNotifier'}
+OUTBOX_NOTIFIERS = {
+    'email': 'api.notifications.EmailNotifier',
+}
+CONTACT_NOTIFY_EMAILS = [email for email in os.environ.get('CONTACT_NOTIFY_EMAILS', '').split(',') if email]
+
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
+TELEGRAM_TIMEOUT = 10
+if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+    OUTBOX_NOTIFIERS['telegram'] = 'api.notifications.TelegramNotifier'
+
+OUTBOX_WORKERS = 4
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_POLL_INTERVAL = 1.0
+OUTBOX_LEASE_SECONDS = 300
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE_SECONDS = 10
+OUTBOX_BACKOFF_MAX_SECONDS = 3600
+
+# Фоновые задачи (manage.py runworker). Имя задачи -> функция; процессы и потоки воркера,
+# аренда задачи, повторы с экспоненциальной задержкой, сколько дней хранить выполненные
+JOB_TASKS = {
+    'image_variants': 'api.tasks.image_variants',
+    'export': 'api.tasks.export',
+    'search_index': 'api.tasks.rebuild_search_index',
+}
+JOB_PROCESSES = 1
+JOB_THREADS = 4
+JOB_POLL_INTERVAL = 1.0
+JOB_LEASE_SECONDS = 1800
+JOB_MAX_ATTEMPTS = 3
+JOB_BACKOFF_BASE_SECONDS = 30
+JOB_BACKOFF_MAX_SECONDS = 3600
+JOB_KEEP_DAYS = 7
+JOB_EXPORT_DIR = 'exports'
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.TokenAuthentication',
+    ],
+    # Число обратных прокси перед приложением. IP для троттлинга берётся из X-Forwarded-For
+    # на столько адресов справа; при 0 — только REMOTE_ADDR, иначе заголовок подделывается клиентом
+    'NUM_PROXIES': int(os.environ.get('API_NUM_PROXIES', 0)),
+}
+
+
+# Tokens
+# Подписанные токены (Authorization: Bearer <access>) проверяются без обращения к базе,
+# поэтому для путей API сессии и AuthenticationMiddleware отключены
+
+STATELESS_API_PREFIX = '/api/'
+
+API_ACCESS_TOKEN_LIFETIME = 60 * 15
+API_REFRESH_TOKEN_LIFETIME = 60 * 60 * 24 * 14
+
+
+# Throttling
+# Token bucket по IP и по логину/почте для открытых POST: (ёмкость корзины, период в секундах).
+# "memory" — в памяти воркера, "cache" — в общем кэше для нескольких воркеров
+
+API_THROTTLE_RATES = {
+    'sign_in': (10, 60),
+    'sign_up': (5, 60 * 10),
+    'contact': (5, 60 * 10),
+    'appointment': (5, 60 * 10),
+}
+API_THROTTLE_BACKEND = os.environ.get('API_THROTTLE_BACKEND', 'cache' if os.environ.get('REDIS_URL') else 'memory')
+API_THROTTLE_MAX_KEYS = 100000
@@ -1,7 +1,9 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from api.media import serve_media
 from . import yasg
 
 
@@ -9,4 +11,14 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path('ckeditor/', include('ckeditor_uploader.urls')),
     path("api/", include('api.urls')),
-] + yasg.urlpatterns + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+] + yasg.urlpatterns
+
+# В режиме "debug" медиа отдаются только при DEBUG, как раньше; "direct" и "x-accel" работают всегда
+if settings.DEBUG or settings.MEDIA_SERVING != 'debug':
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+            serve_media,
+            {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]